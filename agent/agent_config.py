@@ -21,6 +21,7 @@ class AgentConfig:
         'screen_fps': 30,           # 스트리밍 FPS
         'thumbnail_quality': 50,    # 썸네일 품질
         'thumbnail_width': 480,     # 썸네일 최대 너비
+        'thumbnail_keepalive': 10,  # 화면 변화 없을 때 썸네일 재전송 주기 (초)
         'heartbeat_interval': 30,   # 하트비트 간격 (초)
         'ws_port': 21350,            # WS 서버 리스닝 포트 (P2P)
         'ws_max_connections': 5,     # 최대 동시 매니저 연결 수
@@ -142,6 +143,10 @@ class AgentConfig:
     def thumbnail_width(self) -> int:
         return self._data.get('thumbnail_width', 480)
 
+    @property
+    def thumbnail_keepalive(self) -> float:
+        return self._data.get('thumbnail_keepalive', 10)
+
     @property
     def api_url(self) -> str:
         return self._data.get('api_url', '')
@@ -47,6 +47,9 @@ except ImportError:
 
 from agent_config import AgentConfig
 from screen_capture import ScreenCapture
+from capture_hub import CaptureHub
+from encode_pool import EncodePool
+from damage_tracker import TileDamageTracker, KIND_FULL
 from input_handler import InputHandler
 from clipboard_monitor import ClipboardMonitor
 from file_receiver import FileReceiver
@@ -341,6 +344,7 @@ HEADER_THUMBNAIL = 0x01
 HEADER_STREAM = 0x02
 HEADER_H264_KEYFRAME = 0x03
 HEADER_H264_DELTA = 0x04
+HEADER_STREAM_PATCH = 0x06   # MJPEG 변경 영역 패치 (0x05 = 오디오)
 
 
 def _get_public_ip() -> str:
@@ -585,10 +589,10 @@ class _UdpSendAdapter:
             # JSON 텍스트 → 제어 메시지
             msg = json.loads(data)
             await self._ch.send_control(msg)
-        elif isinstance(data, bytes):
+        elif isinstance(data, (bytes, bytearray, memoryview)):
             if len(data) < 1:
                 return
-            # [1B header] + [payload] → send_video
+            # [1B header] + [payload] → send_video (FrameBuffer 뷰도 복사 없이 슬라이스)
             self._ch.send_video(data[0], data[1:])
 
     async def close(self):
@@ -607,6 +611,8 @@ class WellcomAgent:
     def __init__(self):
         self.config = AgentConfig()
         self.screen_capture = ScreenCapture()
+        self.encode_pool = EncodePool()  # 캡처/인코딩 워커 (이벤트 루프 비차단)
+        self.capture_hub = CaptureHub(self.screen_capture, self.encode_pool)  # 1회 캡처 → 전 매니저 분배
         self.input_handler = InputHandler()
         self.clipboard = ClipboardMonitor()
         self.file_receiver = FileReceiver(self.config.save_dir)
@@ -643,6 +649,7 @@ class WellcomAgent:
         self._thumbnail_tasks: Dict[str, asyncio.Task] = {}
         self._stream_settings: Dict[str, dict] = {}  # manager_id → {fps, quality}
         self._h264_encoders: Dict[str, object] = {}  # manager_id → H264Encoder
+        self._damage_trackers: Dict[str, TileDamageTracker] = {}  # manager_id → MJPEG 패치 추적
 
         # UDP P2P (NAT 홀펀칭)
         self._udp_channel = None       # UdpChannel 인스턴스
@@ -1314,6 +1321,8 @@ class WellcomAgent:
             self._cleanup_upnp()
             self._cleanup_natpmp()
             self.clipboard.stop_monitoring()
+            self.capture_hub.close()
+            self.encode_pool.close()
             self.screen_capture.close()
 
     async def _run_server(self):
@@ -1421,10 +1430,7 @@ class WellcomAgent:
                 # H.264 인코더 정리
                 enc = self._h264_encoders.pop(manager_id, None)
                 if enc:
-                    try:
-                        enc.close()
-                    except Exception:
-                        pass
+                    self.encode_pool.release(enc.close)
                 logger.info(f"매니저 해제: {manager_id}")
 
     async def _handle_text(self, websocket, raw: str, manager_id: str):
@@ -1447,6 +1453,7 @@ class WellcomAgent:
             quality = msg.get('quality', self.config.screen_quality)
             codec = msg.get('codec', 'mjpeg')
             keyframe_interval = msg.get('keyframe_interval', 60)
+            patches = bool(msg.get('patches', False))  # 매니저가 MJPEG 패치 합성 지원
             # 기존 스트림 태스크 취소
             old_task = self._stream_tasks.get(manager_id)
             if old_task:
@@ -1454,17 +1461,15 @@ class WellcomAgent:
             # 기존 H.264 인코더 정리
             old_enc = self._h264_encoders.pop(manager_id, None)
             if old_enc:
-                try:
-                    old_enc.close()
-                except Exception:
-                    pass
+                self.encode_pool.release(old_enc.close)
             self._stream_settings[manager_id] = {
                 'fps': fps, 'quality': quality,
                 'codec': codec, 'keyframe_interval': keyframe_interval,
             }
             task = asyncio.create_task(
                 self._start_streaming(websocket, fps, quality, manager_id,
-                                      codec=codec, keyframe_interval=keyframe_interval))
+                                      codec=codec, keyframe_interval=keyframe_interval,
+                                      patches=patches))
             self._stream_tasks[manager_id] = task
 
         elif msg_type == 'update_stream':
@@ -1492,16 +1497,16 @@ class WellcomAgent:
             # H.264 인코더 정리
             enc = self._h264_encoders.pop(manager_id, None)
             if enc:
-                try:
-                    enc.close()
-                except Exception:
-                    pass
+                self.encode_pool.release(enc.close)
 
         elif msg_type == 'request_keyframe':
             encoder = self._h264_encoders.get(manager_id)
             if encoder:
                 encoder.force_keyframe()
                 logger.debug(f"[{manager_id}] 키프레임 강제 요청")
+            tracker = self._damage_trackers.get(manager_id)
+            if tracker:
+                tracker.reset()  # MJPEG 패치 모드: 다음 프레임 전체 전송
 
         elif msg_type == 'start_thumbnail_push':
             interval = msg.get('interval', 1.0)
@@ -1588,6 +1593,8 @@ class WellcomAgent:
                     'cpu': round(cpu, 1),
                     'ram': round(ram, 1),
                     'disk': round(disk, 1),
+                    'encode_pool': self.encode_pool.stats(),
+                    'frame_buffers': self.capture_hub.buffer_stats(),
                 }))
             except Exception as e:
                 logger.debug(f"[Performance] 수집 실패: {e}")
@@ -1839,30 +1846,70 @@ class WellcomAgent:
             }))
 
     async def _send_thumbnail(self, websocket):
-        """썸네일 캡처 및 전송"""
+        """썸네일 캡처 및 전송 (캡처 허브의 최근 프레임이 있으면 재사용)"""
         try:
-            jpeg_data = self.screen_capture.capture_thumbnail(
-                max_width=self.config.thumbnail_width,
-                quality=self.config.thumbnail_quality,
-            )
+            frame = self.capture_hub.snapshot(max_age=1.0)
+            if frame is not None:
+                jpeg_data = await self.encode_pool.encode(
+                    self.capture_hub.thumbnail, frame,
+                    self.config.thumbnail_width, self.config.thumbnail_quality)
+            else:
+                jpeg_data = await self.encode_pool.capture(
+                    self.screen_capture.capture_thumbnail,
+                    self.config.thumbnail_width, self.config.thumbnail_quality)
+            if not jpeg_data:
+                return
             await websocket.send(bytes([HEADER_THUMBNAIL]) + jpeg_data)
         except Exception as e:
             logger.debug(f"썸네일 전송 실패: {e}")
 
     async def _start_thumbnail_push(self, websocket, interval: float, manager_id: str):
-        """썸네일 push 모드 — 주기적으로 자동 전송"""
+        """썸네일 push 모드 — 주기적으로 자동 전송
+
+        캡처 허브 구독: 스트리밍/다른 매니저와 같은 캡처 프레임을 공유하고,
+        같은 프레임의 썸네일 인코딩 결과도 매니저 간 재사용.
+        화면 지문이 직전 전송과 같으면 인코딩/전송 생략 (keepalive 주기마다 재전송).
+        """
         interval = max(0.2, min(interval, 5.0))
-        logger.info(f"[{manager_id}] 썸네일 push 시작: {interval}초")
+        keepalive = max(interval, float(self.config.thumbnail_keepalive))
+        logger.info(f"[{manager_id}] 썸네일 push 시작: {interval}초 (keepalive {keepalive:.0f}초)")
         consecutive_errors = 0
+        sub = self.capture_hub.subscribe(f'{manager_id}/thumbnail', 1.0 / interval)
+        last_fp = None            # 직전 전송 썸네일의 화면 지문
+        last_jpeg = b''
+        last_sent = 0.0
+        sent_count = 0
+        unchanged_count = 0
 
         try:
             while self._running:
                 try:
-                    jpeg_data = self.screen_capture.capture_thumbnail(
-                        max_width=self.config.thumbnail_width,
-                        quality=self.config.thumbnail_quality,
-                    )
+                    frame = await sub.next_frame(timeout=max(2.0, interval * 3))
+                    now = time.monotonic()
+                    if frame is not None:
+                        fp = self.capture_hub.fingerprint(frame, self.config.thumbnail_width)
+                        if fp == last_fp and last_jpeg:
+                            if now - last_sent < keepalive:
+                                unchanged_count += 1
+                                continue  # 화면 변화 없음 — 전송 생략
+                            jpeg_data = last_jpeg  # keepalive: 재인코딩 없이 재전송
+                        else:
+                            jpeg_data = await self.encode_pool.encode(
+                                self.capture_hub.thumbnail, frame,
+                                self.config.thumbnail_width,
+                                self.config.thumbnail_quality)
+                            if jpeg_data is None:
+                                continue  # 인코딩 큐 포화 — 다음 주기에 전송
+                    else:
+                        # 허브 캡처 실패 지속 → 직접 캡처 (플레이스홀더 포함)
+                        fp = None
+                        jpeg_data = await self.encode_pool.capture(
+                            self.screen_capture.capture_thumbnail,
+                            self.config.thumbnail_width,
+                            self.config.thumbnail_quality)
                     await websocket.send(bytes([HEADER_THUMBNAIL]) + jpeg_data)
+                    last_fp, last_jpeg, last_sent = fp, jpeg_data, now
+                    sent_count += 1
                     consecutive_errors = 0
                 except websockets.exceptions.ConnectionClosed:
                     logger.info(f"[{manager_id}] 썸네일 push: WS 연결 종료")
@@ -1874,11 +1921,12 @@ class WellcomAgent:
                     if consecutive_errors >= 10:
                         logger.warning(f"[{manager_id}] push 썸네일 연속 실패 10회 — 중단")
                         break
-                await asyncio.sleep(interval)
         except asyncio.CancelledError:
             pass
         finally:
-            logger.info(f"[{manager_id}] 썸네일 push 중지")
+            self.capture_hub.unsubscribe(sub)
+            logger.info(f"[{manager_id}] 썸네일 push 중지 "
+                        f"(전송 {sent_count}, 변화 없음 생략 {unchanged_count})")
 
     @staticmethod
     def _adaptive_settings(bandwidth_kbps: float, is_relay: bool,
@@ -1937,15 +1985,18 @@ class WellcomAgent:
         return q, f, s
 
     async def _start_streaming(self, websocket, fps: int, quality: int, manager_id: str,
-                               codec: str = 'mjpeg', keyframe_interval: int = 60):
+                               codec: str = 'mjpeg', keyframe_interval: int = 60,
+                               patches: bool = False):
         """화면 스트리밍 시작 (매니저별 독립, MJPEG/H.264 코덱 지원)
 
         릴레이 모드 자동 감지: 품질/스케일 자동 조절 + 프레임 스킵
+        MJPEG + patches: 변경 타일만 패치 전송 (정지 화면은 전송 생략)
         """
         interval = 1.0 / max(1, fps)
         actual_codec = codec
         encoder = None
         encoder_name = ''
+        budget = None             # H.264 대역폭 예산 (BitrateBudget)
 
         # 릴레이 모드 감지 (manager_id가 'relay'이면 릴레이)
         is_relay = (manager_id == 'relay')
@@ -1953,11 +2004,16 @@ class WellcomAgent:
         # H.264 인코더 초기화 시도
         if codec == 'h264':
             try:
-                from h264_encoder import H264Encoder
+                from h264_encoder import H264Encoder, BitrateBudget, RC_BITRATE
                 screen_w, screen_h = self.screen_capture.screen_size
+                # 목표 비트레이트 모드 — 적응형 화질 변경을 재생성(IDR) 없이 반영
                 encoder = H264Encoder(screen_w, screen_h, fps=fps,
-                                      quality=quality, gop_size=keyframe_interval)
+                                      quality=quality, gop_size=keyframe_interval,
+                                      rate_control=RC_BITRATE)
                 encoder_name = encoder.encoder_name
+                # 릴레이는 보수적으로 시작 (측정 후 증가)
+                budget = BitrateBudget(encoder.bitrate_kbps * (0.6 if is_relay else 1.0))
+                encoder.set_bitrate_budget(budget.kbps)
                 self._h264_encoders[manager_id] = encoder
                 logger.info(f"[{manager_id}] H.264 인코더 활성화: {encoder_name}")
             except ImportError as e:
@@ -1976,6 +2032,14 @@ class WellcomAgent:
                 actual_codec = 'mjpeg'
                 encoder = None
 
+        # MJPEG 변경 영역 추적 (매니저가 패치 합성을 지원할 때만)
+        tracker = None
+        if actual_codec == 'mjpeg' and patches and TileDamageTracker.is_available():
+            # UDP는 손실 가능 → 전체 프레임 갱신 주기를 짧게
+            refresh = 3.0 if manager_id == 'udp_p2p' else 30.0
+            tracker = TileDamageTracker(refresh_interval=refresh)
+            self._damage_trackers[manager_id] = tracker
+
         # stream_started 응답 전송 (매니저에 실제 코덱 알림)
         screen_w, screen_h = self.screen_capture.screen_size
         try:
@@ -1988,6 +2052,7 @@ class WellcomAgent:
                 'fps': fps,
                 'quality': quality,
                 'relay_mode': is_relay,
+                'patches': tracker is not None,
             }))
         except Exception:
             pass
@@ -2014,6 +2079,9 @@ class WellcomAgent:
             adaptive_quality = max(10, int(quality * 0.6))
             adaptive_scale = 0.75
 
+        # 캡처 허브 구독 (프레임 간격은 구독 FPS로 조절)
+        sub = self.capture_hub.subscribe(f'{manager_id}/stream', fps)
+
         try:
             while self._running:
                 settings = self._stream_settings.get(manager_id, {})
@@ -2025,31 +2093,63 @@ class WellcomAgent:
                 cur_fps = min(base_fps, adaptive_fps)
                 cur_scale = adaptive_scale
                 cur_interval = 1.0 / max(1, cur_fps)
+                sub.fps = cur_fps
 
+                frame = await sub.next_frame()
                 frame_count += 1
                 frame_size = 0
 
                 if actual_codec == 'h264' and encoder:
-                    # H.264 경로: raw 캡처 → 인코딩 → NAL 전송
-                    raw_img = self.screen_capture.capture_raw()
-                    if raw_img:
-                        packets = encoder.encode_frame(raw_img)
+                    # H.264 경로: 허브 프레임 → 인코딩 → NAL 전송
+                    # 화질은 사용자 설정 그대로, 대역폭 적응은 kbps 예산으로 (아래 2초 주기)
+                    # 적응형 스케일은 단계별 해상도(720p/540p 등)로 — 전환 시 키프레임
+                    encoder.update_quality(base_quality)
+                    encoder.set_scale(cur_scale)
+                    packets = await self.encode_pool.encode(
+                        encoder.encode_frame, frame.source)
+                    if packets is None:
+                        # 인코딩 큐 포화 — 이번 프레임 드롭
+                        skip_count += 1
+                        total_skips += 1
+                        continue
+                    if packets:
                         t0 = time.monotonic()
-                        for is_key, nal_bytes in packets:
+                        for is_key, nal_buf in packets:
                             header = HEADER_H264_KEYFRAME if is_key else HEADER_H264_DELTA
-                            await websocket.send(bytes([header]) + nal_bytes)
-                            frame_size += len(nal_bytes) + 1
+                            await websocket.send(nal_buf.frame(header))
+                            frame_size += len(nal_buf) + 1
                         elapsed = time.monotonic() - t0
                         send_times.append(elapsed)
                         frame_sizes.append(frame_size)
+                        # 델타 프레임은 건너뛸 수 없음 — 혼잡 신호로만 집계 (예산 감소)
+                        if elapsed > cur_interval * 1.5:
+                            skip_count += 1
                 else:
-                    # MJPEG 경로
-                    jpeg_data = self.screen_capture.capture_jpeg(
-                        quality=cur_quality, scale=cur_scale)
+                    # MJPEG 경로 (같은 프레임·설정이면 다른 매니저의 인코딩 재사용)
+                    header = HEADER_STREAM
+                    if tracker is not None:
+                        result = await self.encode_pool.encode(
+                            tracker.encode, frame.image, cur_quality, cur_scale)
+                        if result is not None:
+                            kind, jpeg_data = result
+                            if kind is None:
+                                continue  # 변경 없음 — 전송 생략
+                            if kind != KIND_FULL:
+                                header = HEADER_STREAM_PATCH
+                        else:
+                            jpeg_data = None
+                    else:
+                        jpeg_data = await self.encode_pool.encode(
+                            self.capture_hub.jpeg, frame, cur_quality, cur_scale)
+                    if jpeg_data is None:
+                        # 인코딩 큐 포화 — 이번 프레임 드롭
+                        skip_count += 1
+                        total_skips += 1
+                        continue
                     if jpeg_data:
                         frame_size = len(jpeg_data) + 1
                         t0 = time.monotonic()
-                        await websocket.send(bytes([HEADER_STREAM]) + jpeg_data)
+                        await websocket.send(jpeg_data.frame(header))
                         elapsed = time.monotonic() - t0
                         send_times.append(elapsed)
                         frame_sizes.append(frame_size)
@@ -2079,6 +2179,10 @@ class WellcomAgent:
                         self._adaptive_settings(bandwidth_kbps, is_relay,
                                                 base_quality, base_fps, skip_count)
                     last_adapt_time = now
+
+                    # H.264: 측정 대역폭 → 매니저별 kbps 예산 (화질 단계 진동 대신)
+                    if encoder and budget is not None:
+                        encoder.set_bitrate_budget(budget.update(bandwidth_kbps, skip_count))
                     skip_count = 0
 
                     # 변경 시 로그
@@ -2096,6 +2200,7 @@ class WellcomAgent:
                             'scale': adaptive_scale,
                             'fps': adaptive_fps,
                             'bandwidth_kbps': round(bandwidth_kbps),
+                            'bitrate_kbps': encoder.bitrate_kbps if encoder else None,
                             'relay_mode': is_relay,
                             'skipped_frames': total_skips,
                         }))
@@ -2108,10 +2213,9 @@ class WellcomAgent:
                     logger.debug(f"[{manager_id}] stream: frames={frame_count}, "
                                  f"skipped={total_skips}, avg_send={avg_send*1000:.0f}ms, "
                                  f"Q={cur_quality}, scale={cur_scale:.2f}, "
-                                 f"mode={mode_str}")
+                                 f"mode={mode_str}, pool={self.encode_pool.stats()}"
+                                 + (f", h264={encoder.stats()}" if encoder else ''))
                     last_log_time = now
-
-                await asyncio.sleep(cur_interval)
         except asyncio.CancelledError:
             pass
         except websockets.exceptions.ConnectionClosed:
@@ -2119,13 +2223,17 @@ class WellcomAgent:
         except Exception as e:
             logger.debug(f"[{manager_id}] 스트리밍 오류: {e}")
         finally:
+            self.capture_hub.unsubscribe(sub)
+            if tracker is not None:
+                if self._damage_trackers.get(manager_id) is tracker:
+                    self._damage_trackers.pop(manager_id, None)
+                logger.info(f"[{manager_id}] MJPEG 패치 통계: full={tracker.full_frames}, "
+                            f"patch={tracker.patch_frames}, "
+                            f"unchanged={tracker.unchanged_frames}")
             # H.264 인코더 정리
             enc = self._h264_encoders.pop(manager_id, None)
             if enc:
-                try:
-                    enc.close()
-                except Exception:
-                    pass
+                self.encode_pool.release(enc.close)
             self._stream_tasks.pop(manager_id, None)
             self._stream_settings.pop(manager_id, None)
             logger.info(f"[{manager_id}] 스트리밍 중지 (codec={actual_codec}, "
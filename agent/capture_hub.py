@@ -0,0 +1,297 @@
+"""공유 캡처 허브 — 화면 1회 캡처를 모든 매니저 스트림/썸네일에 분배
+
+기존에는 매니저(직접 P2P / 릴레이 / UDP)마다 스트리밍·썸네일 태스크가
+각자 mss 캡처를 수행하여 시청자 수만큼 캡처·인코딩이 중복되었다.
+
+- 캡처 루프 1개가 구독자 중 최고 FPS로 화면을 캡처
+- 구독자는 최신 프레임만 받아 자신의 FPS/화질로 인코딩 (latest-wins)
+- 같은 프레임·같은 설정의 인코딩 결과는 프레임 단위로 캐시 (썸네일 등)
+- 구독자가 없으면 캡처 루프 자동 종료
+- EncodePool 지정 시 캡처는 캡처 스레드에서 실행 (이벤트 루프 비차단)
+- 스트리밍 JPEG는 재사용 버퍼(FrameBuffer)에 인코딩 → 헤더 포함 memoryview로 전송
+- 프레임은 mss BGRA 버퍼 뷰로 보관 — H.264는 그대로 인코더에 전달,
+  PIL Image(RGB)는 JPEG/썸네일 구독자가 처음 요청할 때 1회만 변환
+
+사용:
+    hub = CaptureHub(screen_capture, pool)
+    sub = hub.subscribe('manager-1/stream', fps=15)
+    frame = await sub.next_frame()
+    jpeg = await pool.encode(hub.jpeg, frame, 60, 1.0)
+    await websocket.send(jpeg.frame(HEADER_STREAM))
+    hub.unsubscribe(sub)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from frame_buffers import BufferPool
+
+logger = logging.getLogger('WellcomAgent.CaptureHub')
+
+
+class CapturedFrame:
+    """캡처된 1프레임 + 인코딩 결과 캐시
+
+    Args:
+        seq: 프레임 번호
+        image: PIL.Image (RGB) — capture_raw 폴백 경로
+        bgra: np.ndarray (H×W×4) — capture_bgra 경로 (mss 버퍼 뷰)
+        to_image: BGRA → PIL Image 변환 함수 (image 지연 생성용)
+    """
+
+    def __init__(self, seq: int, image=None, bgra=None,
+                 to_image: Optional[Callable] = None):
+        self.seq = seq
+        self.bgra = bgra
+        self._image = image
+        self._to_image = to_image
+        self.timestamp = time.monotonic()
+        self._cache: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+
+    @property
+    def image(self):
+        """PIL.Image (RGB) — BGRA 프레임은 첫 접근 시 1회 변환 후 재사용"""
+        if self._image is None and self.bgra is not None:
+            self._image = self.cached(('image',), lambda: self._to_image(self.bgra))
+        return self._image
+
+    @property
+    def source(self):
+        """인코더/지문 입력 — BGRA 배열 우선, 없으면 PIL Image"""
+        return self.bgra if self.bgra is not None else self.image
+
+    @property
+    def age(self) -> float:
+        """캡처 후 경과 시간 (초)"""
+        return time.monotonic() - self.timestamp
+
+    def cached(self, key: tuple, factory: Callable[[], object]):
+        """같은 프레임·같은 설정의 인코딩 결과 재사용
+
+        인코딩 워커 여러 개가 동시에 같은 키를 요청하면 1개만 인코딩하고
+        나머지는 그 결과를 기다린다.
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._cache:
+                self._cache[key] = factory()
+            return self._cache[key]
+
+
+class FrameSubscription:
+    """허브 구독자 (매니저별 스트림 또는 썸네일 push)
+
+    fps는 구독 중에도 변경 가능 (적응형 스트리밍).
+    """
+
+    def __init__(self, hub: 'CaptureHub', name: str, fps: float):
+        self.name = name
+        self._hub = hub
+        self._fps = max(0.1, float(fps))
+        self._event = asyncio.Event()
+        self._last_seq = 0
+        self._last_time = 0.0
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    @fps.setter
+    def fps(self, value: float):
+        value = max(0.1, float(value))
+        if value != self._fps:
+            self._fps = value
+            self._hub._wake()
+
+    async def next_frame(self, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
+        """구독 FPS에 맞춰 대기 후 아직 받지 않은 최신 프레임 반환
+
+        Args:
+            timeout: 새 프레임 대기 최대 시간 (None = 무제한)
+
+        Returns:
+            CapturedFrame 또는 None (타임아웃 — 캡처 실패 지속 등)
+        """
+        wait = self._last_time + 1.0 / self._fps - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        frame = self._hub.latest
+        while frame is None or frame.seq <= self._last_seq:
+            self._event.clear()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            frame = self._hub.latest
+
+        self._last_seq = frame.seq
+        self._last_time = time.monotonic()
+        return frame
+
+
+class CaptureHub:
+    """단일 캡처 루프 + 다중 구독자 분배
+
+    Args:
+        screen_capture: ScreenCapture 인스턴스 (capture_bgra / encode_* 사용)
+        pool: EncodePool (None이면 이벤트 루프에서 직접 캡처)
+    """
+
+    def __init__(self, screen_capture, pool=None):
+        self._capture = screen_capture
+        self._pool = pool
+        self._use_bgra = screen_capture.supports_bgra()
+        self._subscribers: List[FrameSubscription] = []
+        self._latest: Optional[CapturedFrame] = None
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._jpeg_buffers = BufferPool('hub-jpeg')
+
+        # 통계
+        self.frames_captured = 0
+        self.capture_failures = 0
+
+    @property
+    def latest(self) -> Optional[CapturedFrame]:
+        return self._latest
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def target_fps(self) -> float:
+        """구독자 중 최고 FPS (캡처 루프 속도)"""
+        if not self._subscribers:
+            return 0.0
+        return max(s.fps for s in self._subscribers)
+
+    def subscribe(self, name: str, fps: float) -> FrameSubscription:
+        """구독 등록 — 캡처 루프가 없으면 시작 (이벤트 루프 내에서 호출)"""
+        sub = FrameSubscription(self, name, fps)
+        self._subscribers.append(sub)
+        logger.debug(f"[CaptureHub] 구독: {name} ({sub.fps:.1f}fps), "
+                     f"구독자 {len(self._subscribers)}명")
+        if self._task is None or self._task.done():
+            self._wake_event = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        else:
+            self._wake()
+        return sub
+
+    def unsubscribe(self, sub: FrameSubscription):
+        """구독 해제 — 마지막 구독자면 캡처 루프 종료"""
+        try:
+            self._subscribers.remove(sub)
+        except ValueError:
+            return
+        logger.debug(f"[CaptureHub] 구독 해제: {sub.name}, "
+                     f"구독자 {len(self._subscribers)}명")
+        self._wake()
+
+    def snapshot(self, max_age: float = 1.0) -> Optional[CapturedFrame]:
+        """최근 프레임 반환 (max_age 이내), 없으면 None — 1회성 썸네일 요청용"""
+        frame = self._latest
+        if frame is not None and frame.age <= max_age:
+            return frame
+        return None
+
+    def jpeg(self, frame: CapturedFrame, quality: int, scale: float = 1.0):
+        """프레임 → 스트리밍 JPEG FrameBuffer (같은 설정은 캐시 재사용)"""
+        return frame.cached(
+            ('jpeg', quality, round(scale, 3)),
+            lambda: self._capture.encode_jpeg(frame.image, quality, scale,
+                                              out=self._jpeg_buffers.acquire()))
+
+    def fingerprint(self, frame: CapturedFrame, sample_width: int) -> int:
+        """프레임 지문 (썸네일 변경 감지용, 캐시 재사용)"""
+        return frame.cached(
+            ('fingerprint', sample_width),
+            lambda: self._capture.fingerprint(frame.source, sample_width))
+
+    def thumbnail(self, frame: CapturedFrame, max_width: int, quality: int) -> bytes:
+        """프레임 → 썸네일 JPEG (같은 설정은 캐시 재사용)"""
+        return frame.cached(
+            ('thumbnail', max_width, quality),
+            lambda: self._capture.encode_thumbnail(frame.image, max_width, quality))
+
+    def buffer_stats(self) -> dict:
+        """스트리밍 JPEG 버퍼 풀 통계"""
+        return self._jpeg_buffers.stats()
+
+    def _wake(self):
+        """캡처 루프 대기 해제 (구독/FPS 변경 즉시 반영)"""
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    def _grab(self) -> Optional[CapturedFrame]:
+        """캡처 스레드에서 실행 — BGRA 뷰 우선, numpy 없으면 PIL 폴백"""
+        if self._use_bgra:
+            bgra = self._capture.capture_bgra()
+            if bgra is None:
+                return None
+            return CapturedFrame(self._seq + 1, bgra=bgra,
+                                 to_image=self._capture.bgra_to_image)
+        image = self._capture.capture_raw()
+        if image is not None:
+            return CapturedFrame(self._seq + 1, image=image)
+        return None
+
+    def _publish(self, frame: CapturedFrame):
+        self._seq = frame.seq
+        self._latest = frame
+        self.frames_captured += 1
+        for sub in self._subscribers:
+            sub._event.set()
+
+    async def _run(self):
+        """캡처 루프 — 구독자 최고 FPS로 캡처, 구독자 없으면 종료"""
+        logger.info(f"[CaptureHub] 캡처 루프 시작 ({self.target_fps:.1f}fps)")
+        try:
+            while self._subscribers:
+                t0 = time.monotonic()
+                if self._pool is not None:
+                    frame = await self._pool.capture(self._grab)
+                else:
+                    frame = self._grab()
+                if frame is not None:
+                    self._publish(frame)
+                else:
+                    self.capture_failures += 1
+
+                interval = 1.0 / max(0.1, self.target_fps or 0.1)
+                wait = interval - (time.monotonic() - t0)
+                self._wake_event.clear()
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._wake_event.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"[CaptureHub] 캡처 루프 오류: {type(e).__name__}: {e}")
+        finally:
+            self._latest = None
+            logger.info(f"[CaptureHub] 캡처 루프 중지 (총 {self.frames_captured}프레임)")
+
+    def close(self):
+        """캡처 루프 중지 및 구독자 정리"""
+        self._subscribers.clear()
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
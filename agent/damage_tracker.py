@@ -0,0 +1,191 @@
+"""타일 기반 변경 영역(damage) 검출 — MJPEG 부분 갱신 스트리밍
+
+사무용 PC는 대부분 화면이 정지 상태인데 MJPEG 경로는 매 틱마다 전체 화면을
+JPEG 인코딩·전송했다. 이전 전송 프레임과 64×64 타일 단위로 비교(NumPy)하여:
+
+- 변경 없음 → 인코딩/전송 생략
+- 일부 변경 → 변경 타일을 사각형으로 병합하여 JPEG 패치로 전송 (HEADER_STREAM_PATCH)
+- 대부분 변경 / 설정 변경 / 주기적 갱신 → 전체 프레임 (HEADER_STREAM)
+
+패치 와이어 포맷 (1B 헤더 뒤, big-endian):
+    [2B frame_w][2B frame_h][2B rect_count]
+    + rect_count × ([2B x][2B y][4B jpeg_len][jpeg])
+
+매니저의 RemoteScreenWidget이 마지막 전체 프레임 위에 패치를 합성한다.
+결과는 재사용 버퍼(FrameBuffer)에 직접 기록 — 패치 조립 시 join 복사 없음.
+"""
+
+import logging
+import struct
+import time
+from typing import List, Optional, Tuple
+
+from frame_buffers import BufferPool, FrameBuffer
+
+logger = logging.getLogger('WellcomAgent.DamageTracker')
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+TILE_SIZE = 64
+FULL_FRAME_RATIO = 0.5      # 변경 타일 비율이 이 이상이면 전체 프레임 전송
+REFRESH_INTERVAL = 30.0     # 주기적 전체 프레임 (초)
+
+# encode() 결과 종류
+KIND_FULL = 'full'
+KIND_PATCH = 'patch'
+
+PATCH_HEADER = struct.Struct('>HHH')
+PATCH_RECT = struct.Struct('>HHI')
+
+
+class TileDamageTracker:
+    """매니저 스트림별 변경 영역 추적기 (인코딩 워커 스레드에서 호출)
+
+    Args:
+        tile_size: 비교 타일 크기 (px)
+        full_ratio: 전체 프레임 전환 기준 (변경 타일 비율)
+        refresh_interval: 주기적 전체 프레임 간격 (초, 손실 가능한 UDP는 짧게)
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        return NUMPY_AVAILABLE and PIL_AVAILABLE
+
+    def __init__(self, tile_size: int = TILE_SIZE,
+                 full_ratio: float = FULL_FRAME_RATIO,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        self._tile = tile_size
+        self._full_ratio = full_ratio
+        self._refresh_interval = refresh_interval
+        self._prev = None               # 마지막 전송 프레임 (np.ndarray H×W×3)
+        self._quality = None
+        self._last_full = 0.0
+        self._force_full = False
+        self._buffers = BufferPool('damage')
+
+        # 통계
+        self.full_frames = 0
+        self.patch_frames = 0
+        self.unchanged_frames = 0
+
+    def reset(self):
+        """다음 프레임을 전체 프레임으로 강제 (매니저 request_keyframe 등)"""
+        self._force_full = True
+
+    def encode(self, image, quality: int,
+               scale: float = 1.0) -> Tuple[Optional[str], Optional[FrameBuffer]]:
+        """프레임 → (종류, 페이로드 버퍼)
+
+        Returns:
+            (KIND_FULL, jpeg) / (KIND_PATCH, patch_payload) / (None, None) — 변경 없음
+        """
+        if scale < 1.0:
+            image = image.resize((int(image.width * scale), int(image.height * scale)),
+                                 Image.BILINEAR)
+        arr = np.asarray(image)
+        now = time.monotonic()
+
+        if (self._force_full or self._prev is None
+                or self._prev.shape != arr.shape
+                or self._quality != quality
+                or now - self._last_full >= self._refresh_interval):
+            return self._full(image, arr, quality, now)
+
+        dirty = self._dirty_tiles(arr)
+        count = int(dirty.sum())
+        if count == 0:
+            self.unchanged_frames += 1
+            return None, None
+        if count >= dirty.size * self._full_ratio:
+            return self._full(image, arr, quality, now)
+
+        h, w = arr.shape[:2]
+        rects = self._merge_rects(dirty, w, h)
+        out = self._buffers.acquire()
+        out.write(PATCH_HEADER.pack(w, h, len(rects)))
+        for x, y, rw, rh in rects:
+            # 길이 필드는 JPEG 기록 후 채움
+            rect_pos = out.tell()
+            out.write(PATCH_RECT.pack(x, y, 0))
+            start = out.tell()
+            self._jpeg(image.crop((x, y, x + rw, y + rh)), quality, out)
+            out.pack_into(PATCH_RECT, rect_pos, x, y, out.tell() - start)
+
+        self._prev = arr
+        self.patch_frames += 1
+        return KIND_PATCH, out
+
+    def _full(self, image, arr, quality: int, now: float) -> Tuple[str, FrameBuffer]:
+        self._prev = arr
+        self._quality = quality
+        self._last_full = now
+        self._force_full = False
+        self.full_frames += 1
+        return KIND_FULL, self._jpeg(image, quality, self._buffers.acquire())
+
+    @staticmethod
+    def _jpeg(image, quality: int, out: FrameBuffer) -> FrameBuffer:
+        # ScreenCapture.encode_jpeg와 동일 설정 (4:4:4 — 텍스트 선명도)
+        image.save(out, format='JPEG', quality=quality, subsampling=0)
+        return out
+
+    def _dirty_tiles(self, arr) -> 'np.ndarray':
+        """이전 프레임 대비 변경 타일 맵 (ty × tx bool)"""
+        t = self._tile
+        h, w = arr.shape[:2]
+        ty, tx = -(-h // t), -(-w // t)
+        # 채널 축 any() 대신 (H, W*3)로 펼쳐 비교 — 1080p 기준 ~20배 빠름
+        changed = (arr != self._prev).reshape(h, w * 3)
+        if h % t or w % t:
+            padded = np.zeros((ty * t, tx * t * 3), dtype=bool)
+            padded[:h, :w * 3] = changed
+            changed = padded
+        return changed.reshape(ty, t, tx, t * 3).any(axis=(1, 3))
+
+    def _merge_rects(self, dirty, width: int, height: int) -> List[Tuple[int, int, int, int]]:
+        """변경 타일 → 사각형 목록 (행 내 연속 타일 병합 + 같은 열 범위의 행 병합)
+
+        JPEG 헤더 오버헤드(~600B/개)를 줄이기 위해 타일을 최대한 묶는다.
+        """
+        t = self._tile
+        rects = []
+        open_spans = {}     # (x0, x1) → [y0, y1] (타일 단위, 직전 행까지 이어진 사각형)
+        for ty in range(dirty.shape[0]):
+            row_spans = []
+            row = dirty[ty]
+            tx = 0
+            while tx < row.shape[0]:
+                if row[tx]:
+                    start = tx
+                    while tx < row.shape[0] and row[tx]:
+                        tx += 1
+                    row_spans.append((start, tx))
+                else:
+                    tx += 1
+
+            next_open = {}
+            for span in row_spans:
+                if span in open_spans:
+                    y0, _ = open_spans.pop(span)
+                    next_open[span] = [y0, ty + 1]
+                else:
+                    next_open[span] = [ty, ty + 1]
+            rects.extend((span, ys) for span, ys in open_spans.items())
+            open_spans = next_open
+        rects.extend((span, ys) for span, ys in open_spans.items())
+
+        result = []
+        for (x0, x1), (y0, y1) in rects:
+            px, py = x0 * t, y0 * t
+            result.append((px, py, min(x1 * t, width) - px, min(y1 * t, height) - py))
+        return result
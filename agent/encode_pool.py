@@ -0,0 +1,178 @@
+"""캡처/인코딩 워커 풀 — asyncio 이벤트 루프 밖에서 mss 캡처·JPEG/H.264 인코딩 실행
+
+스트리밍 코루틴이 캡처·인코딩을 동기 호출하면 프레임마다 수십 ms 동안
+같은 루프의 입력 이벤트(_handle_text), ping, 릴레이 수신이 멈춘다.
+mss/PIL/PyAV는 작업 중 GIL을 해제하므로 스레드 풀로 충분.
+
+- 캡처: 전용 단일 스레드 (mss 핸들을 한 스레드에서만 사용)
+- 인코딩: N개 워커 스레드 + 대기 작업 수 제한 (초과 시 프레임 드롭)
+- 통계: 종류별 작업 수 / 대기(큐) 시간 / 실행 시간 / 드롭 수
+
+사용:
+    pool = EncodePool()
+    image = await pool.capture(screen_capture.capture_raw)
+    jpeg_data = await pool.encode(screen_capture.encode_jpeg, image, 60)
+    if jpeg_data is None:
+        ...  # 큐 포화 — 이번 프레임 스킵
+    pool.close()
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger('WellcomAgent.EncodePool')
+
+
+def _default_workers() -> int:
+    """인코딩 워커 수: 코어 절반 (2~4개)"""
+    return max(2, min(4, (os.cpu_count() or 2) // 2))
+
+
+class _KindStats:
+    """작업 종류별 누적 통계 (워커 스레드에서 갱신 → lock 보호)"""
+
+    __slots__ = ('jobs', 'dropped', 'wait_time', 'busy_time', 'max_pending')
+
+    def __init__(self):
+        self.jobs = 0
+        self.dropped = 0
+        self.wait_time = 0.0    # 제출 → 워커 시작 (큐 대기)
+        self.busy_time = 0.0    # 워커 실행 시간 (캡처/인코딩)
+        self.max_pending = 0
+
+    def to_dict(self) -> dict:
+        jobs = max(1, self.jobs)
+        return {
+            'jobs': self.jobs,
+            'dropped': self.dropped,
+            'wait_ms_total': round(self.wait_time * 1000),
+            'busy_ms_total': round(self.busy_time * 1000),
+            'wait_ms_avg': round(self.wait_time * 1000 / jobs, 1),
+            'busy_ms_avg': round(self.busy_time * 1000 / jobs, 1),
+            'max_pending': self.max_pending,
+        }
+
+
+def _log_release_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.debug(f"[EncodePool] 정리 작업 오류: {future.exception()}")
+
+
+class EncodePool:
+    """캡처/인코딩 전용 스레드 풀 (대기 작업 수 제한)
+
+    Args:
+        max_workers: 인코딩 워커 스레드 수 (None = 코어 수 기반)
+        max_pending: 인코딩 대기+실행 작업 최대 수 (초과 시 드롭, None = 워커 수 × 2)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        self.max_workers = max_workers or _default_workers()
+        self.max_pending = max_pending or self.max_workers * 2
+        self._capture_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='Capture')
+        self._encode_executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix='Encode')
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _KindStats] = {
+            'capture': _KindStats(),
+            'encode': _KindStats(),
+        }
+        self._closed = False
+        logger.info(f"[EncodePool] 워커 {self.max_workers}개, "
+                    f"최대 대기 {self.max_pending}개")
+
+    def _timed(self, kind: str, submitted: float, fn: Callable, args: tuple):
+        """워커 스레드에서 실행 — 대기/실행 시간 측정"""
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                st = self._stats[kind]
+                st.jobs += 1
+                st.wait_time += started - submitted
+                st.busy_time += finished - started
+
+    async def capture(self, fn: Callable, *args):
+        """캡처 스레드에서 fn 실행 (항상 실행, 드롭 없음)"""
+        if self._closed:
+            return None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._capture_executor, self._timed,
+            'capture', time.perf_counter(), fn, args)
+
+    async def encode(self, fn: Callable, *args):
+        """인코딩 워커에서 fn 실행
+
+        Returns:
+            fn 반환값, 또는 None (대기 작업 수 초과로 드롭 / 풀 종료)
+        """
+        if self._closed:
+            return None
+        with self._lock:
+            st = self._stats['encode']
+            if self._pending >= self.max_pending:
+                st.dropped += 1
+                return None
+            self._pending += 1
+            st.max_pending = max(st.max_pending, self._pending)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._encode_executor, self._timed,
+                'encode', time.perf_counter(), fn, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def release(self, fn: Callable, *args):
+        """인코딩 워커에서 fn 실행, 완료를 기다리지 않음 (인코더 close 등 정리 작업 — 드롭 없음)
+
+        인코더 close()는 encode_frame과 같은 락을 잡으므로 이벤트 루프에서 직접 호출하면
+        진행 중인 인코딩이 끝날 때까지 루프 전체가 멈춘다. 풀 종료 후에는 호출 스레드에서 실행.
+        """
+        if not self._closed:
+            try:
+                future = self._encode_executor.submit(fn, *args)
+                future.add_done_callback(_log_release_error)
+                return
+            except RuntimeError:
+                pass    # 종료 경합 — 아래에서 직접 실행
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.debug(f"[EncodePool] 정리 작업 오류: {e}")
+
+    @property
+    def pending(self) -> int:
+        """현재 대기+실행 중인 인코딩 작업 수"""
+        return self._pending
+
+    def stats(self) -> dict:
+        """통계 스냅샷 (get_performance 응답 등에 사용)"""
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                **{kind: st.to_dict() for kind, st in self._stats.items()},
+            }
+
+    def close(self):
+        """풀 종료 (대기 작업 취소)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._capture_executor.shutdown(wait=False, cancel_futures=True)
+        self._encode_executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("[EncodePool] 종료")
@@ -0,0 +1,143 @@
+"""재사용 출력 버퍼 풀 — 스트리밍 프레임 인코딩 결과를 복사 없이 전송
+
+기존 스트리밍 경로는 프레임마다 BytesIO → getvalue() 복사 →
+`bytes([header]) + payload` 연결 복사로 수백 KB 객체를 2~3개씩 새로 만들어
+장시간 세션에서 RSS/GC 부담이 컸다.
+
+- 출력 버퍼는 bytearray를 풀에서 빌려 재사용 (용량은 유지, 필요 시에만 확장)
+- 맨 앞 1바이트를 프레임 헤더 자리로 예약 → 헤더+페이로드를
+  memoryview 1개로 전송 (연결 복사 없음)
+- PIL Image.save()의 파일 객체로 직접 사용 가능 (write만 필요)
+- FrameBuffer가 소멸하고 전송 중인 memoryview도 모두 해제된 버퍼만 재사용
+
+사용:
+    pool = BufferPool('stream')
+    buf = pool.acquire()
+    image.save(buf, format='JPEG', quality=60)
+    await websocket.send(buf.frame(HEADER_STREAM))
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger('WellcomAgent.FrameBuffers')
+
+DEFAULT_CAPACITY = 256 * 1024   # 1080p JPEG(Q60)/H.264 키프레임이 대부분 들어가는 크기
+DEFAULT_MAX_FREE = 8            # 풀에 보관하는 유휴 버퍼 최대 수
+
+
+def _exported(buf: bytearray) -> bool:
+    """memoryview 등으로 노출 중인지 (전송 대기 중이면 크기 변경 불가 → BufferError)"""
+    try:
+        buf.append(0)
+    except BufferError:
+        return True
+    buf.pop()
+    return False
+
+
+class FrameBuffer:
+    """헤더 1바이트 예약 출력 버퍼 (파일 객체 호환: write/tell/flush)
+
+    len()은 헤더를 제외한 페이로드 길이.
+    """
+
+    __slots__ = ('_pool', '_buf', '_len')
+
+    def __init__(self, pool: Optional['BufferPool'], buf: bytearray):
+        self._pool = pool
+        self._buf = buf
+        self._len = 1       # [0] = 헤더 자리
+
+    def __len__(self) -> int:
+        return self._len - 1
+
+    def __del__(self):
+        if self._pool is not None:
+            self._pool._release(self._buf)
+
+    def write(self, data) -> int:
+        n = len(data) if isinstance(data, (bytes, bytearray)) else memoryview(data).nbytes
+        end = self._len + n
+        if end > len(self._buf):
+            # 2배씩 확장 — 풀에 반환된 뒤에도 용량 유지
+            self._buf.extend(bytes(max(end, len(self._buf) * 2) - len(self._buf)))
+        self._buf[self._len:end] = data
+        self._len = end
+        return n
+
+    def tell(self) -> int:
+        return self._len - 1
+
+    def flush(self):
+        pass
+
+    def pack_into(self, fmt, offset: int, *values):
+        """이미 쓴 영역에 struct 값 덮어쓰기 (offset = 페이로드 기준, 길이 필드 후기록용)"""
+        fmt.pack_into(self._buf, offset + 1, *values)
+
+    def payload(self) -> memoryview:
+        """헤더를 제외한 페이로드 뷰"""
+        return memoryview(self._buf)[1:self._len]
+
+    def frame(self, header: int) -> memoryview:
+        """[1B header] + payload 뷰 — websocket.send()에 그대로 전달"""
+        self._buf[0] = header
+        return memoryview(self._buf)[:self._len]
+
+    def tobytes(self) -> bytes:
+        """페이로드 복사본 (장기 보관이 필요할 때만 사용)"""
+        return bytes(self._buf[1:self._len])
+
+
+class BufferPool:
+    """FrameBuffer 풀 (인코딩 워커 스레드에서 동시 사용 가능)
+
+    Args:
+        name: 통계/로그용 이름
+        capacity: 새 버퍼 초기 용량 (bytes)
+        max_free: 보관할 유휴 버퍼 최대 수 (초과분은 해제 → 메모리 상한)
+    """
+
+    def __init__(self, name: str, capacity: int = DEFAULT_CAPACITY,
+                 max_free: int = DEFAULT_MAX_FREE):
+        self.name = name
+        self._capacity = capacity
+        self._max_free = max_free
+        self._free: deque = deque()
+        # RLock: FrameBuffer.__del__이 같은 스레드에서 재진입할 수 있음
+        self._lock = threading.RLock()
+
+        # 통계
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self) -> FrameBuffer:
+        """유휴 버퍼 대여 (없으면 새로 할당)"""
+        with self._lock:
+            for _ in range(len(self._free)):
+                buf = self._free.popleft()
+                if _exported(buf):
+                    # 아직 전송 중인 뷰가 남아 있음 — 뒤로 미룸
+                    self._free.append(buf)
+                    continue
+                self.reused += 1
+                return FrameBuffer(self, buf)
+            self.allocated += 1
+        return FrameBuffer(self, bytearray(self._capacity))
+
+    def _release(self, buf: bytearray):
+        with self._lock:
+            if len(self._free) < self._max_free:
+                self._free.append(buf)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'allocated': self.allocated,
+                'reused': self.reused,
+                'free': len(self._free),
+                'free_bytes': sum(len(b) for b in self._free),
+            }
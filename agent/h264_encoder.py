@@ -3,17 +3,34 @@
 하드웨어 인코더 우선순위: h264_nvenc → h264_qsv → h264_amf → libx264
 MJPEG 대비 ~1/10 대역폭으로 동일 화질 스트리밍 가능.
 
+레이트 컨트롤:
+- RC_QUALITY: 고정 화질 (CRF/CQP) — 화질 변경 시 인코더 재생성 (IDR 발생)
+- RC_BITRATE: 목표 비트레이트 (CBR + VBV) — 화질/비트레이트 변경을
+  다음 프레임부터 실시간 반영 (libx264/NVENC/QSV는 재생성·IDR 없음)
+- pts는 밀리초 타임스탬프 → FPS 변경에 재생성 불필요 (가변 프레임레이트)
+- 출력 해상도: set_scale()로 단계별 축소 (1.0/0.75/0.667/0.5 — 1080p 기준
+  810p/720p/540p), 입력→출력 축소는 인코더의 swscale 변환 단계에서 함께 처리.
+  해상도 변경은 다음 프레임에서 인코더 재생성 → 새 SPS/PPS + 키프레임
+- 대역폭 예산: BitrateBudget이 측정 대역폭으로 매니저별 kbps 상한을 산출,
+  set_bitrate_budget()으로 적용 (목표 = min(화질 환산, 예산))
+
 사용:
-    encoder = H264Encoder(1920, 1080, fps=15, quality=60)
-    packets = encoder.encode_frame(pil_image)  # → list[(is_keyframe, nal_bytes)]
+    encoder = H264Encoder(1920, 1080, fps=15, quality=60, rate_control=RC_BITRATE)
+    packets = encoder.encode_frame(bgra_array)  # → list[(is_keyframe, FrameBuffer)]
+    encoder.update_quality(40)                  # 실시간 비트레이트 조정
+    encoder.set_bitrate_budget(budget.update(bandwidth_kBps, skipped))
     encoder.force_keyframe()
     encoder.close()
 """
 
 import logging
 import struct
+import threading
+import time
 from typing import List, Tuple, Optional
 
+from frame_buffers import BufferPool, FrameBuffer
+
 logger = logging.getLogger('WellcomAgent.H264Encoder')
 
 try:
@@ -33,6 +50,24 @@ except ImportError:
 _HW_ENCODERS = ['h264_nvenc', 'h264_qsv', 'h264_amf']
 _SW_ENCODER = 'libx264'
 
+_SEQ = struct.Struct('>I')
+
+# 레이트 컨트롤 모드
+RC_QUALITY = 'quality'
+RC_BITRATE = 'bitrate'
+
+# 열린 컨텍스트의 bit_rate 변경을 프레임 단위로 반영하는 인코더
+# (FFmpeg libx264/nvenc/qsv reconfig — AMF는 재생성 필요)
+_LIVE_BITRATE_ENCODERS = ('libx264', 'h264_nvenc', 'h264_qsv')
+
+_PTS_TIME_BASE = 1000   # pts 단위: ms
+
+# 출력 해상도 단계 (입력 대비 배율) — 잦은 해상도 전환(키프레임) 방지
+_SCALE_STEPS = (1.0, 0.75, 2 / 3, 0.5)
+
+# 재생성이 필요한 인코더는 예산 변화가 이 비율 이상일 때만 적용 (IDR 폭주 방지)
+_RECREATE_MIN_CHANGE = 0.25
+
 
 def _quality_to_crf(quality: int) -> int:
     """quality (1-100) → CRF (0-51) 변환
@@ -46,6 +81,85 @@ def _quality_to_crf(quality: int) -> int:
     return max(0, min(51, crf))
 
 
+def _quality_to_bitrate(quality: int, width: int, height: int, fps: int) -> int:
+    """quality (1-100) → 목표 비트레이트 (kbps)
+
+    화면 콘텐츠 기준 픽셀당 0.02~0.12 bit
+    (1080p 15fps: quality=60 → ~2.7Mbps, quality=10 → ~0.9Mbps)
+    """
+    quality = max(1, min(100, quality))
+    bpp = 0.02 + 0.10 * quality / 100.0
+    return max(100, int(width * height * max(1, fps) * bpp / 1000))
+
+
+def _scale_step(scale: float) -> float:
+    """요청 배율 이하의 가장 큰 단계 (최소 0.5)"""
+    for step in _SCALE_STEPS:
+        if scale >= step - 1e-3:
+            return step
+    return _SCALE_STEPS[-1]
+
+
+class BitrateBudget:
+    """측정 대역폭 → 매니저별 안정적인 목표 비트레이트 (kbps)
+
+    화질 단계를 오르내리는 대신 kbps 예산 하나를 유지한다.
+    - 측정값은 EWMA로 평활, 링크 용량의 headroom 비율만 사용
+    - 프레임 스킵(혼잡) 시 즉시 30% 감소, 여유 시 주기당 최대 15% 증가 (AIMD)
+    - hysteresis 미만의 변화는 무시 (불필요한 재설정 방지)
+
+    Args:
+        initial_kbps: 초기 예산
+        min_kbps: 예산 하한
+        headroom: 측정 용량 대비 사용 비율
+    """
+
+    def __init__(self, initial_kbps: int, min_kbps: int = 300,
+                 headroom: float = 0.75, alpha: float = 0.3,
+                 hysteresis: float = 0.1):
+        self._kbps = max(min_kbps, int(initial_kbps))
+        self._min_kbps = min_kbps
+        self._headroom = headroom
+        self._alpha = alpha
+        self._hysteresis = hysteresis
+        self._capacity: Optional[float] = None  # 평활된 링크 용량 (kbps)
+
+    @property
+    def kbps(self) -> int:
+        return self._kbps
+
+    @property
+    def capacity_kbps(self) -> Optional[int]:
+        return None if self._capacity is None else int(self._capacity)
+
+    def update(self, bandwidth_kBps: float, skipped: int = 0) -> int:
+        """측정 주기마다 호출
+
+        Args:
+            bandwidth_kBps: 실효 전송 대역폭 (KB/s — _start_streaming의 bandwidth_kbps)
+            skipped: 이번 주기 스킵/드롭 프레임 수
+
+        Returns:
+            새 예산 (kbps)
+        """
+        capacity = bandwidth_kBps * 8     # KB/s → kbps
+        if self._capacity is None:
+            self._capacity = capacity
+        else:
+            self._capacity += self._alpha * (capacity - self._capacity)
+
+        target = self._capacity * self._headroom
+        if skipped:
+            target = min(target, self._kbps * 0.7)
+        elif target > self._kbps:
+            target = min(target, self._kbps * 1.15)
+        target = max(self._min_kbps, int(target))
+
+        if skipped or abs(target - self._kbps) >= self._kbps * self._hysteresis:
+            self._kbps = target
+        return self._kbps
+
+
 class H264Encoder:
     """H.264 인코더 (PyAV 기반, 하드웨어 가속 폴백)
 
@@ -55,6 +169,7 @@ class H264Encoder:
         fps: 목표 프레임레이트
         quality: 화질 (1-100, MJPEG quality와 동일 스케일)
         gop_size: GOP 크기 (키프레임 간격, 기본 60)
+        rate_control: RC_QUALITY (고정 화질) 또는 RC_BITRATE (목표 비트레이트)
     """
 
     @classmethod
@@ -81,19 +196,41 @@ class H264Encoder:
         return False, "지원되는 H.264 인코더 없음 (hw: nvenc/qsv/amf, sw: libx264)"
 
     def __init__(self, width: int, height: int, fps: int = 15,
-                 quality: int = 60, gop_size: int = 60):
+                 quality: int = 60, gop_size: int = 60,
+                 rate_control: str = RC_QUALITY):
         if not AV_AVAILABLE:
             raise RuntimeError("PyAV(av) 미설치 — pip install av")
 
         self._width = width
         self._height = height
+        self._out_width = width       # 인코딩 해상도 (set_scale)
+        self._out_height = height
+        self._scale = 1.0
+        self._pending_scale: Optional[float] = None
         self._fps = fps
         self._quality = quality
         self._gop_size = gop_size
+        self._rate_control = rate_control
+        self._bitrate_kbps = _quality_to_bitrate(quality, width, height, fps)
+        self._max_bitrate_kbps = _quality_to_bitrate(100, width, height, fps)  # VBV 상한
+        self._budget_kbps: Optional[int] = None        # 대역폭 예산 (None = 제한 없음)
+        self._pending_bitrate: Optional[int] = None    # 다음 프레임에 반영할 bit_rate (kbps)
+        self._pending_recreate: Optional[str] = None   # 다음 프레임 전 인코더 재생성 (사유)
+        self._closed = False
+        self._pts_origin: Optional[float] = None
+        self._last_pts = -1
         self._frame_seq = 0
         self._force_keyframe = False
         self._codec_ctx: Optional[av.CodecContext] = None
         self._encoder_name: str = ''
+        self._input_frame = None    # 재사용 BGRA 입력 프레임 (av.VideoFrame)
+        self._buffers = BufferPool('h264')
+        # encode_frame은 인코딩 워커 스레드, 설정 변경/종료는 이벤트 루프에서 호출
+        self._lock = threading.RLock()
+
+        # 통계
+        self.live_updates = 0   # 재생성 없이 반영한 설정 변경
+        self.recreations = 0    # 인코더 재생성 (IDR 발생)
 
         self._init_encoder()
 
@@ -110,6 +247,30 @@ class H264Encoder:
     def height(self) -> int:
         return self._height
 
+    @property
+    def output_size(self) -> Tuple[int, int]:
+        """인코딩(전송) 해상도"""
+        return self._out_width, self._out_height
+
+    @property
+    def scale(self) -> float:
+        return self._scale
+
+    @property
+    def rate_control(self) -> str:
+        return self._rate_control
+
+    @property
+    def bitrate_kbps(self) -> int:
+        """현재 목표 비트레이트 (RC_BITRATE 모드)"""
+        return self._bitrate_kbps
+
+    @property
+    def supports_live_bitrate(self) -> bool:
+        """비트레이트 실시간 변경 가능 여부 (재생성·IDR 없음, 상한은 quality=100 환산값)"""
+        return (self._rate_control == RC_BITRATE
+                and self._encoder_name in _LIVE_BITRATE_ENCODERS)
+
     def _init_encoder(self):
         """인코더 초기화 — 하드웨어 가속 시도 후 소프트웨어 폴백"""
         # 하드웨어 인코더 먼저 시도
@@ -137,14 +298,20 @@ class H264Encoder:
         codec = av.codec.Codec(encoder_name, 'w')
         ctx = av.CodecContext.create(codec, 'w')
 
-        ctx.width = self._width
-        ctx.height = self._height
+        ctx.width = self._out_width
+        ctx.height = self._out_height
         ctx.pix_fmt = 'yuv420p'
-        ctx.time_base = av.Fraction(1, self._fps)
+        # pts = ms 타임스탬프 (FPS 변경 시 재생성 불필요), framerate는 명목값
+        ctx.time_base = av.Fraction(1, _PTS_TIME_BASE)
         ctx.framerate = av.Fraction(self._fps, 1)
         ctx.gop_size = self._gop_size
         ctx.max_b_frames = 0  # 저지연
 
+        if self._rate_control == RC_BITRATE:
+            self._apply_bitrate_options(ctx, encoder_name)
+            ctx.open()
+            return ctx
+
         crf = _quality_to_crf(self._quality)
 
         if encoder_name == _SW_ENCODER:
@@ -182,30 +349,97 @@ class H264Encoder:
         ctx.open()
         return ctx
 
-    def encode_frame(self, pil_image) -> List[Tuple[bool, bytes]]:
-        """PIL Image → H.264 NAL 패킷 인코딩
+    def _apply_bitrate_options(self, ctx, encoder_name: str):
+        """RC_BITRATE 모드 옵션 — CBR (bit_rate = maxrate) + VBV 버퍼
+
+        PyAV는 open 후 maxrate/bufsize 변경 불가, bit_rate만 변경 가능.
+        libx264는 ABR(bit_rate < maxrate)에서 bit_rate 변경이 장기 평균에 묻혀
+        거의 반영되지 않고, CBR에서는 다음 프레임부터 반영되지만 open 시
+        maxrate를 넘을 수 없다. 따라서 실시간 변경 가능한 인코더는 상한
+        (quality=100 환산)으로 CBR open 후 _encode_locked에서 목표로 낮춘다.
+        """
+        if encoder_name in _LIVE_BITRATE_ENCODERS:
+            open_kbps = self._max_bitrate_kbps
+            self._pending_bitrate = self._bitrate_kbps
+        else:
+            open_kbps = self._bitrate_kbps
+        ctx.bit_rate = open_kbps * 1000
+        vbv = {
+            'maxrate': f'{open_kbps}k',
+            # 버퍼 0.5초 — 장면 전환 시 버스트 제한 (저지연)
+            'bufsize': f'{max(1, open_kbps // 2)}k',
+        }
+
+        if encoder_name == _SW_ENCODER:
+            ctx.options = {
+                'preset': 'ultrafast',
+                'tune': 'zerolatency',
+                **vbv,
+            }
+        elif 'nvenc' in encoder_name:
+            ctx.options = {
+                'preset': 'p1',
+                'tune': 'ull',
+                'rc': 'cbr',
+                'zerolatency': '1',
+                **vbv,
+            }
+        elif 'qsv' in encoder_name:
+            ctx.options = {
+                'preset': 'veryfast',
+                **vbv,
+            }
+        elif 'amf' in encoder_name:
+            ctx.options = {
+                'usage': 'ultralowlatency',
+                'quality': 'speed',
+                'rc': 'cbr',
+                **vbv,
+            }
+
+    def encode_frame(self, image) -> List[Tuple[bool, bytes]]:
+        """프레임 → H.264 NAL 패킷 인코딩 (워커 스레드에서 호출 가능)
 
         Args:
-            pil_image: PIL.Image (RGB 모드)
+            image: np.ndarray (H×W×4, BGRA — ScreenCapture.capture_bgra)
+                   또는 PIL.Image (RGB 모드)
 
         Returns:
-            list of (is_keyframe, nal_bytes) — 보통 1개, 키프레임 시 SPS/PPS 포함
+            list of (is_keyframe, FrameBuffer) — 보통 1개, 키프레임 시 SPS/PPS 포함
+            FrameBuffer 페이로드 = [4B frame_seq] + NAL, frame(header)로 전송
         """
+        with self._lock:
+            return self._encode_locked(image)
+
+    def _encode_locked(self, image) -> List[Tuple[bool, FrameBuffer]]:
         if not self._codec_ctx:
             return []
 
         try:
-            # PIL Image → numpy → av.VideoFrame
             if not NUMPY_AVAILABLE:
                 logger.error("[H264Encoder] numpy 미설치 — 인코딩 불가")
                 return []
 
-            # RGB PIL Image → numpy array
-            rgb_array = np.array(pil_image)
-
-            # numpy → VideoFrame (RGB → YUV 자동 변환)
-            frame = av.VideoFrame.from_ndarray(rgb_array, format='rgb24')
-            frame.pts = self._frame_seq
+            # 해상도 변경은 프레임 경계에서 인코더 재생성 (첫 프레임 = 키프레임)
+            if self._pending_scale is not None:
+                self._apply_scale_locked()
+            # 화질/비트레이트 변경 재생성도 워커에서 (avcodec_open이 이벤트 루프를 막지 않도록)
+            if self._pending_recreate is not None:
+                self._recreate_locked()
+
+            if isinstance(image, np.ndarray):
+                # mss BGRA 버퍼 → AVFrame 1회 복사, yuv420p 변환은 swscale이 1패스로 처리
+                # (기존: bytes 복사 → PIL BGRX 변환 → np.array 복사 → rgb24 AVFrame)
+                frame = self._bgra_frame(image)
+            else:
+                # PIL Image (RGB) 폴백
+                frame = av.VideoFrame.from_ndarray(np.asarray(image), format='rgb24')
+            # 대기 중인 비트레이트 변경 반영 (인코더가 다음 프레임에서 reconfig)
+            if self._pending_bitrate is not None:
+                self._codec_ctx.bit_rate = self._pending_bitrate * 1000
+                self._pending_bitrate = None
+
+            frame.pts = self._next_pts()
             frame.time_base = self._codec_ctx.time_base
 
             # 강제 키프레임 요청
@@ -218,12 +452,11 @@ class H264Encoder:
 
             result = []
             for packet in packets:
-                is_key = bool(packet.is_keyframe)
-                nal_bytes = bytes(packet)
-
-                # 와이어 포맷: [4B frame_seq (big-endian)] + NAL
-                seq_bytes = struct.pack('>I', self._frame_seq & 0xFFFFFFFF)
-                result.append((is_key, seq_bytes + nal_bytes))
+                # 와이어 포맷: [4B frame_seq (big-endian)] + NAL — 재사용 버퍼에 직접 기록
+                out = self._buffers.acquire()
+                out.write(_SEQ.pack(self._frame_seq & 0xFFFFFFFF))
+                out.write(packet)
+                result.append((bool(packet.is_keyframe), out))
 
             self._frame_seq += 1
             return result
@@ -232,54 +465,196 @@ class H264Encoder:
             logger.error(f"[H264Encoder] 인코딩 오류: {type(e).__name__}: {e}")
             return []
 
+    def set_scale(self, scale: float):
+        """출력 해상도 배율 변경 (이벤트 루프에서 호출 가능, 다음 프레임에 반영)
+
+        배율은 _SCALE_STEPS 단계로 내림 — 720p/540p 등 고정 단계만 사용.
+        """
+        step = _scale_step(scale)
+        if step == self._scale:
+            self._pending_scale = None
+            return
+        self._pending_scale = step
+
+    def _apply_scale_locked(self):
+        """대기 중인 배율로 인코더 재생성 (실패 시 기존 해상도 유지)"""
+        step, self._pending_scale = self._pending_scale, None
+        prev = (self._out_width, self._out_height, self._scale, self._bitrate_kbps)
+        # yuv420p는 짝수 크기 필요
+        self._out_width = max(2, int(self._width * step) & ~1)
+        self._out_height = max(2, int(self._height * step) & ~1)
+        self._scale = step
+        if self._rate_control == RC_BITRATE:
+            self._bitrate_kbps = self._target_kbps()
+        try:
+            new_ctx = self._create_encoder(self._encoder_name)
+        except Exception as e:
+            self._out_width, self._out_height, self._scale, self._bitrate_kbps = prev
+            logger.error(f"[H264Encoder] 해상도 변경 실패 (기존 설정 유지): {e}")
+            return
+        old_ctx, self._codec_ctx = self._codec_ctx, new_ctx
+        try:
+            old_ctx.close()
+        except Exception:
+            pass
+        self._pending_recreate = None   # 새 인코더가 현재 설정을 이미 반영
+        self.recreations += 1
+        logger.info(f"[H264Encoder] 해상도 변경: {self._out_width}x{self._out_height} "
+                    f"(x{step:.2f}, {self._bitrate_kbps}kbps)")
+
+    def _next_pts(self) -> int:
+        """경과 시간 기반 pts (ms, 단조 증가)"""
+        now = time.monotonic()
+        if self._pts_origin is None:
+            self._pts_origin = now
+        pts = max(self._last_pts + 1, int((now - self._pts_origin) * _PTS_TIME_BASE))
+        self._last_pts = pts
+        return pts
+
+    def _bgra_frame(self, bgra) -> 'av.VideoFrame':
+        """BGRA 배열 → 재사용 입력 프레임에 복사 (프레임마다 AVFrame 할당 방지)
+
+        인코더가 이전 프레임 버퍼를 아직 참조 중이면 make_writable()이
+        새 버퍼를 할당하므로 덮어쓰기 안전.
+        """
+        h, w = bgra.shape[:2]
+        frame = self._input_frame
+        if frame is None or frame.width != w or frame.height != h:
+            if not hasattr(av.VideoFrame, 'make_writable'):
+                return av.VideoFrame.from_ndarray(bgra, format='bgra')
+            frame = av.VideoFrame(w, h, 'bgra')
+            self._input_frame = frame
+        else:
+            frame.make_writable()
+            frame.pict_type = av.video.frame.PictureType.NONE
+
+        plane = frame.planes[0]
+        dst = np.frombuffer(plane, dtype=np.uint8).reshape(h, plane.line_size)
+        dst[:, :w * 4] = bgra.reshape(h, w * 4)
+        return frame
+
     def force_keyframe(self):
         """다음 프레임을 키프레임으로 강제"""
         self._force_keyframe = True
         logger.debug("[H264Encoder] 키프레임 강제 요청")
 
     def update_quality(self, quality: int):
-        """인코딩 화질 변경 (인코더 재초기화)
+        """인코딩 화질 변경
 
-        참고: 실시간 변경은 인코더 재초기화가 필요하므로
-        빈번한 호출은 피해야 함.
+        RC_BITRATE: 화질 → 목표 비트레이트로 환산하여 실시간 반영 (set_bitrate)
+        RC_QUALITY: CRF/QP는 open 후 변경 불가 → 인코더 재생성 (IDR 발생,
+        빈번한 호출은 피해야 함)
         """
         quality = max(1, min(100, quality))
         if quality == self._quality:
             return
 
         self._quality = quality
-        logger.info(f"[H264Encoder] 화질 변경: {quality}")
+        if self._rate_control == RC_BITRATE:
+            self.set_bitrate(self._target_kbps())
+            return
 
-        # 인코더 재초기화 (실패 시 기존 컨텍스트 유지)
-        try:
-            new_ctx = self._create_encoder(self._encoder_name)
-            old_ctx = self._codec_ctx
-            self._codec_ctx = new_ctx
-            if old_ctx:
-                old_ctx.close()
-        except Exception as e:
-            logger.error(f"[H264Encoder] 화질 변경 실패 (기존 설정 유지): {e}")
+        logger.info(f"[H264Encoder] 화질 변경: {quality} (인코더 재생성)")
+        self._recreate('화질 변경')
+
+    def set_bitrate(self, kbps: int):
+        """목표 비트레이트 변경 (RC_BITRATE 모드, 이벤트 루프에서 호출 가능)
+
+        libx264/NVENC/QSV는 인코딩 중인 워커를 기다리지 않고 다음 프레임에 반영,
+        그 외 인코더는 재생성으로 폴백.
+        """
+        kbps = max(100, min(self._max_bitrate_kbps, int(kbps)))
+        if kbps == self._bitrate_kbps:
+            return
+
+        self._bitrate_kbps = kbps
+        if self.supports_live_bitrate:
+            self._pending_bitrate = kbps
+            self.live_updates += 1
+            logger.debug(f"[H264Encoder] 비트레이트 변경: {kbps}kbps (실시간)")
+        else:
+            logger.info(f"[H264Encoder] 비트레이트 변경: {kbps}kbps (인코더 재생성)")
+            self._recreate('비트레이트 변경')
 
     def update_fps(self, fps: int):
-        """FPS 변경 (인코더 재초기화)"""
+        """FPS 변경 — pts가 타임스탬프 기반이므로 인코더 재생성 없음
+
+        RC_BITRATE 모드에서는 프레임당 비트 배분 유지를 위해 비트레이트도 환산.
+        """
         fps = max(1, min(60, fps))
         if fps == self._fps:
             return
 
         self._fps = fps
+        self.live_updates += 1
         logger.info(f"[H264Encoder] FPS 변경: {fps}")
+        if self._rate_control == RC_BITRATE:
+            self.set_bitrate(self._target_kbps())
+
+    def set_bitrate_budget(self, kbps: Optional[int]):
+        """대역폭 예산 설정 (RC_BITRATE 모드) — 목표 = min(화질 환산, 예산)
+
+        Args:
+            kbps: 예산 (None = 제한 해제)
+        """
+        if self._rate_control != RC_BITRATE:
+            return
+        self._budget_kbps = None if kbps is None else int(kbps)
+        target = self._target_kbps()
+        if (not self.supports_live_bitrate
+                and abs(target - self._bitrate_kbps) < self._bitrate_kbps * _RECREATE_MIN_CHANGE):
+            return
+        self.set_bitrate(target)
 
+    def _target_kbps(self) -> int:
+        kbps = _quality_to_bitrate(self._quality, self._out_width, self._out_height, self._fps)
+        if self._budget_kbps is not None:
+            kbps = min(kbps, self._budget_kbps)
+        return kbps
+
+    def _recreate(self, reason: str):
+        """인코더 재생성 예약 (이벤트 루프에서 호출 가능, 다음 프레임 전에 워커가 수행)"""
+        if self._closed:
+            return
+        self._pending_recreate = reason
+
+    def _recreate_locked(self):
+        """대기 중인 재생성 수행 (실패 시 기존 컨텍스트 유지)"""
+        reason, self._pending_recreate = self._pending_recreate, None
         try:
             new_ctx = self._create_encoder(self._encoder_name)
-            old_ctx = self._codec_ctx
-            self._codec_ctx = new_ctx
-            if old_ctx:
-                old_ctx.close()
         except Exception as e:
-            logger.error(f"[H264Encoder] FPS 변경 실패 (기존 설정 유지): {e}")
+            logger.error(f"[H264Encoder] {reason} 실패 (기존 설정 유지): {e}")
+            return
+        old_ctx, self._codec_ctx = self._codec_ctx, new_ctx
+        try:
+            old_ctx.close()
+        except Exception:
+            pass
+        self.recreations += 1
+
+    def stats(self) -> dict:
+        """레이트 컨트롤 상태/통계"""
+        return {
+            'encoder': self._encoder_name,
+            'rate_control': self._rate_control,
+            'bitrate_kbps': self._bitrate_kbps if self._rate_control == RC_BITRATE else None,
+            'budget_kbps': self._budget_kbps,
+            'quality': self._quality,
+            'fps': self._fps,
+            'resolution': f'{self._out_width}x{self._out_height}',
+            'live_updates': self.live_updates,
+            'recreations': self.recreations,
+        }
 
     def close(self):
-        """인코더 리소스 해제"""
+        """인코더 리소스 해제 (진행 중인 인코딩 완료 대기)"""
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self):
+        self._closed = True
+        self._pending_recreate = None
         if self._codec_ctx:
             try:
                 # 버퍼 플러시
@@ -291,7 +666,9 @@ class H264Encoder:
             except Exception:
                 pass
             self._codec_ctx = None
+            self._input_frame = None
             logger.info(f"[H264Encoder] 인코더 종료: {self._encoder_name}")
 
     def __del__(self):
-        self.close()
+        if hasattr(self, '_lock'):
+            self.close()
@@ -9,6 +9,7 @@
 
 import io
 import logging
+import zlib
 from typing import Tuple, Optional
 
 logger = logging.getLogger('WellcomAgent.ScreenCapture')
@@ -27,6 +28,12 @@ except ImportError:
     PIL_AVAILABLE = False
     logger.error("Pillow 패키지 미설치: pip install Pillow")
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 class ScreenCapture:
     """고성능 화면 캡처 (mss 기반, 에러 복구 내장)"""
@@ -160,10 +167,10 @@ class ScreenCapture:
             return b''
 
     def capture_raw(self):
-        """화면 캡처 → PIL Image (RGB) 반환 (H.264 인코더용)
+        """화면 캡처 → PIL Image (RGB) 반환
 
         JPEG 인코딩을 거치지 않고 PIL Image를 직접 반환.
-        H.264 인코더가 numpy 변환 후 인코딩에 사용.
+        (numpy 미설치 시 CaptureHub 폴백 — 기본 경로는 capture_bgra)
 
         Returns:
             PIL.Image (RGB) 또는 None (캡처 실패)
@@ -177,13 +184,116 @@ class ScreenCapture:
 
         try:
             screenshot = self._sct.grab(self._monitor)
-            img = Image.frombytes('RGB', screenshot.size, screenshot.bgra, 'raw', 'BGRX')
+            img = Image.frombytes('RGB', screenshot.size, screenshot.raw, 'raw', 'BGRX')
             return img
         except Exception as e:
             logger.error(f"[ScreenCapture] capture_raw 실패: {type(e).__name__}: {e}")
             self._init_mss()
             return None
 
+    @staticmethod
+    def supports_bgra() -> bool:
+        """capture_bgra 사용 가능 여부 (numpy + Pillow)"""
+        return NUMPY_AVAILABLE and PIL_AVAILABLE
+
+    def capture_bgra(self):
+        """화면 캡처 → BGRA NumPy 배열 (H×W×4, uint8) 반환 (H.264 인코더용)
+
+        mss 캡처 버퍼(screenshot.raw)를 복사 없이 감싼 뷰.
+        screenshot.bgra는 접근할 때마다 bytes 복사본을 만들므로 사용하지 않는다.
+        grab()마다 새 버퍼가 할당되므로 다음 캡처 후에도 뷰는 유효.
+
+        Returns:
+            np.ndarray (H, W, 4) 또는 None (캡처 실패 / numpy 미설치)
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+
+        if not self._sct or not self._monitor:
+            if not self._init_mss():
+                return None
+
+        try:
+            screenshot = self._sct.grab(self._monitor)
+            w, h = screenshot.size
+            return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(h, w, 4)
+        except Exception as e:
+            logger.error(f"[ScreenCapture] capture_bgra 실패: {type(e).__name__}: {e}")
+            self._init_mss()
+            return None
+
+    @staticmethod
+    def bgra_to_image(bgra):
+        """BGRA 배열 → PIL Image (RGB) — JPEG/썸네일 경로에서 필요할 때만 변환"""
+        h, w = bgra.shape[:2]
+        return Image.frombuffer('RGB', (w, h), bgra, 'raw', 'BGRX', 0, 1)
+
+    @staticmethod
+    def encode_jpeg(img, quality: int = 60, scale: float = 1.0, out=None):
+        """PIL Image (RGB) → 스트리밍용 JPEG 바이트
+
+        캡처와 인코딩을 분리하여 CaptureHub가 1회 캡처한 프레임을
+        매니저별 화질/스케일로 인코딩할 수 있도록 함.
+
+        Args:
+            out: FrameBuffer — 지정 시 재사용 버퍼에 직접 쓰고 out 반환 (bytes 복사 없음)
+        """
+        if scale < 1.0:
+            new_w = int(img.width * scale)
+            new_h = int(img.height * scale)
+            # v2.1.1: BILINEAR (LANCZOS 대비 2-3배 빠름, 스트리밍에 충분)
+            img = img.resize((new_w, new_h), Image.BILINEAR)
+
+        buf = out if out is not None else io.BytesIO()
+        # v2.1.1: optimize=False (CPU 절감, 스트리밍 속도 우선)
+        # v3.2.1: subsampling=0 (4:4:4) — 텍스트/UI 선명도 대폭 개선
+        img.save(buf, format='JPEG', quality=quality, subsampling=0)
+        return out if out is not None else buf.getvalue()
+
+    @staticmethod
+    def downscale(img, max_width: int):
+        """썸네일용 고속 축소 — 정수배 box 축소(reduce) 후 작은 이미지만 BILINEAR
+
+        원본 전체에 LANCZOS를 거는 방식 대비 캡처~JPEG 전체 기준
+        1080p ~9배, 4K ~4배 빠름 (tools/bench_thumbnail.py).
+        strided 샘플링보다 느리지만 box 평균이라 텍스트 앨리어싱이 적음.
+        """
+        ratio = max_width / img.width
+        new_h = max(1, int(img.height * ratio))
+        factor = img.width // max_width
+        if factor >= 2:
+            img = img.reduce(factor)
+        if img.size != (max_width, new_h):
+            img = img.resize((max_width, new_h), Image.BILINEAR)
+        return img
+
+    @staticmethod
+    def encode_thumbnail(img, max_width: int = 320, quality: int = 30) -> bytes:
+        """PIL Image (RGB) → 썸네일 JPEG 바이트"""
+        img = ScreenCapture.downscale(img, max_width)
+        new_h = img.height
+
+        buf = io.BytesIO()
+        img.save(buf, format='JPEG', quality=quality)
+        result = buf.getvalue()
+        logger.debug(f"[ScreenCapture] 썸네일 인코딩: {max_width}x{new_h}, {len(result)}B")
+        return result
+
+    @staticmethod
+    def fingerprint(img, sample_width: int = 320) -> int:
+        """프레임 지문 — 저해상도 샘플 CRC32 (리사이즈/인코딩 전 변경 감지용)
+
+        NEAREST 샘플링은 1080p 기준 ~1ms. 썸네일 너비로 샘플링하므로
+        썸네일에 보이지 않는 미세 변화는 무시된다.
+        BGRA 배열이면 PIL 변환 없이 stride 샘플링.
+        """
+        if NUMPY_AVAILABLE and isinstance(img, np.ndarray):
+            step = max(1, img.shape[1] // sample_width)
+            return zlib.crc32(np.ascontiguousarray(img[::step, ::step, :3]))
+        ratio = sample_width / img.width
+        sample = img.resize((sample_width, max(1, int(img.height * ratio))), Image.NEAREST)
+        return zlib.crc32(sample.tobytes())
+
     def capture_jpeg(self, quality: int = 60, scale: float = 1.0) -> bytes:
         """화면 캡처 → JPEG 바이트
 
@@ -201,19 +311,8 @@ class ScreenCapture:
 
         try:
             screenshot = self._sct.grab(self._monitor)
-            img = Image.frombytes('RGB', screenshot.size, screenshot.bgra, 'raw', 'BGRX')
-
-            if scale < 1.0:
-                new_w = int(img.width * scale)
-                new_h = int(img.height * scale)
-                # v2.1.1: BILINEAR (LANCZOS 대비 2-3배 빠름, 스트리밍에 충분)
-                img = img.resize((new_w, new_h), Image.BILINEAR)
-
-            buf = io.BytesIO()
-            # v2.1.1: optimize=False (CPU 절감, 스트리밍 속도 우선)
-            # v3.2.1: subsampling=0 (4:4:4) — 텍스트/UI 선명도 대폭 개선
-            img.save(buf, format='JPEG', quality=quality, subsampling=0)
-            return buf.getvalue()
+            img = Image.frombytes('RGB', screenshot.size, screenshot.raw, 'raw', 'BGRX')
+            return self.encode_jpeg(img, quality, scale)
 
         except Exception as e:
             logger.error(f"[ScreenCapture] capture_jpeg 실패: {type(e).__name__}: {e}")
@@ -234,17 +333,8 @@ class ScreenCapture:
 
         try:
             screenshot = self._sct.grab(self._monitor)
-            img = Image.frombytes('RGB', screenshot.size, screenshot.bgra, 'raw', 'BGRX')
-
-            ratio = max_width / img.width
-            new_h = int(img.height * ratio)
-            img = img.resize((max_width, new_h), Image.LANCZOS)
-
-            buf = io.BytesIO()
-            img.save(buf, format='JPEG', quality=quality)
-            result = buf.getvalue()
-            logger.debug(f"[ScreenCapture] 썸네일 캡처 성공: {max_width}x{new_h}, {len(result)}B")
-            return result
+            img = Image.frombytes('RGB', screenshot.size, screenshot.raw, 'raw', 'BGRX')
+            return self.encode_thumbnail(img, max_width, quality)
 
         except Exception as e:
             logger.error(f"[ScreenCapture] capture_thumbnail 실패: {type(e).__name__}: {e}")
@@ -262,7 +352,7 @@ class ScreenCapture:
         try:
             region = {"left": x, "top": y, "width": w, "height": h}
             screenshot = self._sct.grab(region)
-            img = Image.frombytes('RGB', screenshot.size, screenshot.bgra, 'raw', 'BGRX')
+            img = Image.frombytes('RGB', screenshot.size, screenshot.raw, 'raw', 'BGRX')
             buf = io.BytesIO()
             img.save(buf, format='JPEG', quality=quality)
             return buf.getvalue()
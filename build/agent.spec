@@ -48,6 +48,10 @@ a = Analysis(
         (str(project_path / 'agent' / 'version.py'), 'app'),
         (str(project_path / 'agent' / 'h264_encoder.py'), 'app'),
         (str(project_path / 'agent' / 'upnp_helper.py'), 'app'),
+        (str(project_path / 'agent' / 'capture_hub.py'), 'app'),
+        (str(project_path / 'agent' / 'encode_pool.py'), 'app'),
+        (str(project_path / 'agent' / 'damage_tracker.py'), 'app'),
+        (str(project_path / 'agent' / 'frame_buffers.py'), 'app'),
         # core 모듈 (UDP P2P 홀펀칭용)
         (str(project_path / 'core' / '__init__.py'), 'app/core'),
         (str(project_path / 'core' / 'stun_client.py'), 'app/core'),
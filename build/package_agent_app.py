@@ -31,6 +31,10 @@ AGENT_APP_FILES = [
     'agent/file_receiver.py',
     'agent/version.py',
     'agent/h264_encoder.py',
+    'agent/capture_hub.py',
+    'agent/encode_pool.py',
+    'agent/damage_tracker.py',
+    'agent/frame_buffers.py',
     # core 모듈 (UDP P2P 홀펀칭용)
     'core/__init__.py',
     'core/stun_client.py',
@@ -43,6 +43,7 @@ APP_FILES = [
     'core/key_mapper.py',
     'core/recorder.py',
     'core/h264_decoder.py',
+    'core/thumbnail_decoder.py',
     'ui/__init__.py',
     'ui/main_window.py',
     'ui/grid_view.py',
@@ -93,6 +93,7 @@ class Settings:
             'stream_quality': 90,         # 스트리밍 품질 (1-100, 높을수록 선명)
             'stream_codec': 'h264',       # 코덱 (h264=고화질 저대역폭, mjpeg=호환성)
             'keyframe_interval': 60,      # H.264 키프레임 간격 (프레임 수)
+            'render_scaling': 'fast',     # 뷰어 스케일 (fast=그릴 때 스케일+정지 시 부드럽게, smooth=매 프레임 부드럽게)
             'thumbnail_quality': 50,      # 썸네일 JPEG 품질
             'thumbnail_width': 480,       # 썸네일 최대 너비
         },
@@ -41,6 +41,25 @@ def _unpad_agent_id(data: bytes) -> str:
     return data[:AGENT_ID_LEN].rstrip(b'\x00').decode('utf-8', errors='replace')
 
 
+# 서버 릴레이 텍스트 envelope: "@<agent_id>\t<type>\n<JSON>"
+# 라우팅 정보를 JSON 밖에 두어 서버가 파싱/재직렬화 없이 원문 전달 (server/relay_hub.py)
+RELAY_ENVELOPE_MARK = '@'
+
+
+def _pack_relay_envelope(agent_id: str, msg_type: str, payload: str) -> str:
+    return f"{RELAY_ENVELOPE_MARK}{agent_id}\t{msg_type}\n{payload}"
+
+
+def _unpack_relay_envelope(raw: str):
+    """envelope → (agent_id, payload), envelope가 아니면 None"""
+    if not raw.startswith(RELAY_ENVELOPE_MARK):
+        return None
+    head, sep, payload = raw.partition('\n')
+    if not sep:
+        return None
+    return head[1:].partition('\t')[0], payload
+
+
 class ConnectionMode(Enum):
     LAN = "lan"               # ip2(사설IP) 직접 연결
     UDP_P2P = "udp_p2p"       # UDP 홀펀칭 P2P (포트포워딩 불필요)
@@ -66,6 +85,51 @@ class AgentConnection:
     _last_upgrade_fail: float = field(default=0.0, repr=False)  # 마지막 업그레이드 실패 시각
 
 
+class AgentFrameSignals(QObject):
+    """에이전트 1개의 프레임 시그널 (AgentServer.agent_frames)
+
+    전역 시그널은 모든 에이전트 프레임이 모든 소비자 슬롯으로 전달되어
+    각 슬롯이 agent_id로 걸러야 한다. 해당 에이전트 소비자(뷰어 창, 그리드 셀)만
+    이 객체에 연결하면 다른 에이전트 프레임의 슬롯 호출/큐 전달이 발생하지 않는다.
+
+    MJPEG 화면(전체 프레임 + 변경 영역 패치)은 시그널 대신 최신 프레임 우선 우편함:
+      - 네트워크 스레드가 post_screen()으로 넣고, 비어 있던 우편함에 들어갈 때만
+        screen_ready emit → GUI가 밀려도 큐에 프레임이 쌓이지 않음
+      - 새 전체 프레임은 대기 중인 이전 프레임/패치를 모두 대체 (GUI는 최신만 디코딩)
+      - 패치는 기준 프레임 순서대로 누적 (다음 전체 프레임이 오면 함께 폐기)
+      - GUI는 take_screen()으로 대기분 + 그동안 건너뛴 수를 가져감
+    """
+
+    thumbnail_received = pyqtSignal(bytes)        # jpeg_data
+    screen_ready = pyqtSignal()                   # take_screen()으로 가져갈 화면 있음
+    h264_frame_received = pyqtSignal(int, bytes)  # header, raw_data
+    audio_received = pyqtSignal(bytes)            # pcm_data
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._screen_lock = threading.Lock()
+        self._screen_pending: list = []     # [(is_patch, data)] — 순서대로 적용
+        self._screen_dropped = 0            # 마지막 take_screen() 이후 건너뛴 수
+
+    def post_screen(self, data: bytes, is_patch: bool = False):
+        """MJPEG 전체 프레임/패치 넣기 (네트워크 스레드)"""
+        with self._screen_lock:
+            if not is_patch and self._screen_pending:
+                self._screen_dropped += len(self._screen_pending)
+                self._screen_pending.clear()
+            notify = not self._screen_pending
+            self._screen_pending.append((is_patch, data))
+        if notify:
+            self.screen_ready.emit()
+
+    def take_screen(self):
+        """대기 중인 화면 가져오기 (GUI 스레드) → ([(is_patch, data)], 건너뛴 수)"""
+        with self._screen_lock:
+            pending, self._screen_pending = self._screen_pending, []
+            dropped, self._screen_dropped = self._screen_dropped, 0
+        return pending, dropped
+
+
 class AgentServer(QObject):
     """P2P 연결 매니저 — 각 에이전트에 직접 WS 접속
 
@@ -80,6 +144,7 @@ class AgentServer(QObject):
     agent_disconnected = pyqtSignal(str)               # agent_id
     thumbnail_received = pyqtSignal(str, bytes)        # agent_id, jpeg_data
     screen_frame_received = pyqtSignal(str, bytes)     # agent_id, jpeg_data
+    screen_patch_received = pyqtSignal(str, bytes)     # agent_id, patch_payload (MJPEG 변경 영역)
     h264_frame_received = pyqtSignal(str, int, bytes)  # agent_id, header, raw_data
     stream_started = pyqtSignal(str, dict)             # agent_id, info_dict
     clipboard_received = pyqtSignal(str, str, object)  # agent_id, format, data
@@ -103,11 +168,13 @@ class AgentServer(QObject):
     HEADER_H264_KEYFRAME = 0x03
     HEADER_H264_DELTA = 0x04
     HEADER_AUDIO = 0x05
+    HEADER_STREAM_PATCH = 0x06
 
     def __init__(self):
         super().__init__()
         self._connections: Dict[str, AgentConnection] = {}
         self._relay_ws: Optional[object] = None  # 서버 릴레이 WS (폴백용)
+        self._relay_envelope = False  # 서버가 텍스트 envelope 지원 (relay_ok로 협상)
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
@@ -120,6 +187,8 @@ class AgentServer(QObject):
         self._reconnect_interval: int = 10
         # 핑 타임스탬프 (agent_id → send_time)
         self._ping_times: Dict[str, float] = {}
+        # 에이전트별 프레임 시그널 (GUI 스레드에서 생성, 수신 스레드는 조회만)
+        self._frame_signals: Dict[str, AgentFrameSignals] = {}
 
     @property
     def connected_count(self) -> int:
@@ -147,6 +216,17 @@ class AgentServer(QObject):
         conn = self._connections.get(agent_id)
         return conn.mode.value if conn else "disconnected"
 
+    def agent_frames(self, agent_id: str) -> AgentFrameSignals:
+        """에이전트별 프레임 시그널 — 해당 에이전트 프레임만 수신 (GUI 스레드에서 호출)
+
+        전역 시그널(thumbnail_received 등)도 계속 발생 (전체 에이전트 소비자용).
+        """
+        signals = self._frame_signals.get(agent_id)
+        if signals is None:
+            signals = AgentFrameSignals(self)
+            self._frame_signals[agent_id] = signals
+        return signals
+
     # ==================== 연결 수명주기 ====================
 
     def start_connection(self, server_url: str, token: str):
@@ -280,6 +360,7 @@ class AgentServer(QObject):
         self._send_to_agent(agent_id, {
             'type': 'start_stream', 'fps': fps, 'quality': quality,
             'codec': codec, 'keyframe_interval': keyframe_interval,
+            'patches': True,  # MJPEG 변경 영역 패치 합성 지원 (구버전 에이전트는 무시)
         })
 
     def stop_streaming(self, agent_id: str):
@@ -445,9 +526,8 @@ class AgentServer(QObject):
             if not self._relay_ws or conn.ws != self._relay_ws:
                 logger.debug(f"[P2P] {agent_id} 릴레이 WS 만료 — 전송 스킵")
                 return
-            msg_dict['target_agent'] = agent_id
 
-        msg = json.dumps(msg_dict)
+        msg = self._encode_text(conn, agent_id, msg_dict)
         try:
             future = asyncio.run_coroutine_threadsafe(conn.ws.send(msg), self._loop)
             future.add_done_callback(
@@ -457,6 +537,15 @@ class AgentServer(QObject):
         except Exception as e:
             logger.warning(f"[P2P] {agent_id} 전송 예약 실패: {e}")
 
+    def _encode_text(self, conn: 'AgentConnection', agent_id: str, msg_dict: dict) -> str:
+        """제어 메시지 직렬화 — 릴레이는 envelope(지원 서버) 또는 target_agent 필드"""
+        if conn.mode != ConnectionMode.RELAY:
+            return json.dumps(msg_dict)
+        if self._relay_envelope:
+            return _pack_relay_envelope(agent_id, msg_dict.get('type', ''), json.dumps(msg_dict))
+        msg_dict['target_agent'] = agent_id
+        return json.dumps(msg_dict)
+
     def _send_binary_to_agent(self, agent_id: str, data: bytes):
         """에이전트에 바이너리 전송 (UDP P2P / P2P 직접 / 릴레이)"""
         conn = self._connections.get(agent_id)
@@ -504,9 +593,7 @@ class AgentServer(QObject):
 
         # file_start
         start_msg = {'type': 'file_start', 'name': filename, 'size': filesize}
-        if conn.mode == ConnectionMode.RELAY:
-            start_msg['target_agent'] = agent_id
-        await conn.ws.send(json.dumps(start_msg))
+        await conn.ws.send(self._encode_text(conn, agent_id, start_msg))
 
         # 파일 청크 전송
         sent = 0
@@ -524,9 +611,7 @@ class AgentServer(QObject):
 
         # file_end
         end_msg = {'type': 'file_end', 'name': filename}
-        if conn.mode == ConnectionMode.RELAY:
-            end_msg['target_agent'] = agent_id
-        await conn.ws.send(json.dumps(end_msg))
+        await conn.ws.send(self._encode_text(conn, agent_id, end_msg))
 
     # ==================== 내부 구현 — 연결 ====================
 
@@ -942,16 +1027,31 @@ class AgentServer(QObject):
         if len(data) < 2:
             return
 
-        header = data[0]
-        frame_data = data[1:]
+        self._dispatch_frame(agent_id, data[0], data[1:])
+
+    def _dispatch_frame(self, agent_id: str, header: int, frame_data: bytes):
+        """바이너리 프레임 → 에이전트별 시그널 + 전역 시그널 (P2P/릴레이/UDP 공통)"""
+        signals = self._frame_signals.get(agent_id)
 
         if header == self.HEADER_THUMBNAIL:
+            if signals:
+                signals.thumbnail_received.emit(frame_data)
             self.thumbnail_received.emit(agent_id, frame_data)
         elif header == self.HEADER_STREAM:
+            if signals:
+                signals.post_screen(frame_data)
             self.screen_frame_received.emit(agent_id, frame_data)
+        elif header == self.HEADER_STREAM_PATCH:
+            if signals:
+                signals.post_screen(frame_data, is_patch=True)
+            self.screen_patch_received.emit(agent_id, frame_data)
         elif header in (self.HEADER_H264_KEYFRAME, self.HEADER_H264_DELTA):
+            if signals:
+                signals.h264_frame_received.emit(header, frame_data)
             self.h264_frame_received.emit(agent_id, header, frame_data)
         elif header == self.HEADER_AUDIO:
+            if signals:
+                signals.audio_received.emit(frame_data)
             self.audio_received.emit(agent_id, frame_data)
 
     # ==================== 서버 릴레이 (폴백) ====================
@@ -968,7 +1068,7 @@ class AgentServer(QObject):
             base = 'ws://' + base[7:]
         elif not base.startswith(('ws://', 'wss://')):
             base = 'ws://' + base
-        ws_url = f"{base}/ws/manager?token={self._token}"
+        ws_url = f"{base}/ws/manager?token={self._token}&envelope=1"
 
         retry_delay = 1  # 초기 1초, 최대 60초까지 지수 백오프
         MAX_RETRY_DELAY = 60
@@ -984,6 +1084,7 @@ class AgentServer(QObject):
                     close_timeout=10,
                 ) as ws:
                     self._relay_ws = ws
+                    self._relay_envelope = False  # relay_ok 수신 시 결정
                     logger.info("[P2P/Relay] 서버 릴레이 접속 성공 (폴백 대기)")
                     retry_delay = 1  # 연결 성공 시 백오프 리셋
 
@@ -1020,15 +1121,24 @@ class AgentServer(QObject):
                 retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
 
     def _handle_relay_text(self, raw: str):
-        """서버 릴레이 JSON 처리 (기존 v2.x 프로토콜)"""
+        """서버 릴레이 JSON 처리 (기존 v2.x 프로토콜 + envelope)"""
+        envelope = _unpack_relay_envelope(raw)
+        if envelope:
+            source_agent, raw = envelope
         try:
             msg = json.loads(raw)
         except json.JSONDecodeError:
             return
+        if envelope:
+            msg['source_agent'] = source_agent
 
         msg_type = msg.get('type', '')
         source_agent = msg.get('source_agent', '')
 
+        if msg_type == 'relay_ok':
+            self._relay_envelope = bool(msg.get('envelope'))
+            return
+
         # 에이전트 연결/해제 (서버가 전달)
         if msg_type == 'auth':
             agent_id = msg.get('agent_id', source_agent)
@@ -1189,19 +1299,7 @@ class AgentServer(QObject):
             return
 
         agent_id = _unpad_agent_id(data[:AGENT_ID_LEN])
-        payload = data[AGENT_ID_LEN:]
-
-        header = payload[0]
-        frame_data = payload[1:]
-
-        if header == self.HEADER_THUMBNAIL:
-            self.thumbnail_received.emit(agent_id, frame_data)
-        elif header == self.HEADER_STREAM:
-            self.screen_frame_received.emit(agent_id, frame_data)
-        elif header in (self.HEADER_H264_KEYFRAME, self.HEADER_H264_DELTA):
-            self.h264_frame_received.emit(agent_id, header, frame_data)
-        elif header == self.HEADER_AUDIO:
-            self.audio_received.emit(agent_id, frame_data)
+        self._dispatch_frame(agent_id, data[AGENT_ID_LEN], data[AGENT_ID_LEN + 1:])
 
     # ==================== UDP 홀펀칭 P2P ====================
 
@@ -1265,13 +1363,16 @@ class AgentServer(QObject):
 
     def _on_udp_video(self, agent_id: str, frame_type: int, data: bytes):
         """UDP 채널로 수신된 비디오 프레임 처리"""
-        from .udp_channel import TYPE_THUMBNAIL, TYPE_STREAM, TYPE_H264_KEY, TYPE_H264_DELTA
-
-        if frame_type == TYPE_THUMBNAIL:
-            self.thumbnail_received.emit(agent_id, data)
-        elif frame_type == TYPE_STREAM:
-            self.screen_frame_received.emit(agent_id, data)
-        elif frame_type == TYPE_H264_KEY:
-            self.h264_frame_received.emit(agent_id, self.HEADER_H264_KEYFRAME, data)
-        elif frame_type == TYPE_H264_DELTA:
-            self.h264_frame_received.emit(agent_id, self.HEADER_H264_DELTA, data)
+        from .udp_channel import (
+            TYPE_THUMBNAIL, TYPE_STREAM, TYPE_STREAM_PATCH, TYPE_H264_KEY, TYPE_H264_DELTA,
+        )
+
+        header = {
+            TYPE_THUMBNAIL: self.HEADER_THUMBNAIL,
+            TYPE_STREAM: self.HEADER_STREAM,
+            TYPE_STREAM_PATCH: self.HEADER_STREAM_PATCH,
+            TYPE_H264_KEY: self.HEADER_H264_KEYFRAME,
+            TYPE_H264_DELTA: self.HEADER_H264_DELTA,
+        }.get(frame_type)
+        if header is not None:
+            self._dispatch_frame(agent_id, header, data)
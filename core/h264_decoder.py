@@ -9,10 +9,19 @@
     if qimage:
         widget.update_frame_qimage(qimage)
     decoder.close()
+
+뷰어 창에서는 H264DecodeWorker로 디코딩/RGB 변환을 GUI 스레드 밖에서 수행:
+    worker = H264DecodeWorker(name)
+    worker.frame_ready.connect(on_ready)      # on_ready: worker.take() → QImage
+    worker.submit(header_byte, raw_data)      # GUI 스레드 — enqueue만
+    worker.close()
 """
 
 import logging
 import struct
+import threading
+import time
+from collections import deque
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -31,6 +40,7 @@ except ImportError:
     NUMPY_AVAILABLE = False
 
 try:
+    from PyQt6.QtCore import QObject, pyqtSignal
     from PyQt6.QtGui import QImage
     PYQT_AVAILABLE = True
 except ImportError:
@@ -112,6 +122,31 @@ class H264Decoder:
         Returns:
             QImage (RGB888) 또는 None (디코딩 실패/스킵)
         """
+        frame = self.decode_video_frame(header, data)
+        if frame is None:
+            return None
+        return self.frame_to_qimage(frame)
+
+    @staticmethod
+    def frame_to_qimage(frame) -> 'QImage':
+        """av.VideoFrame → QImage (RGB888, numpy 메모리에서 분리된 사본)"""
+        rgb_frame = frame.to_ndarray(format='rgb24')
+        h, w, ch = rgb_frame.shape
+        bytes_per_line = ch * w
+        return QImage(
+            rgb_frame.data, w, h, bytes_per_line,
+            QImage.Format.Format_RGB888
+        ).copy()  # .copy()로 numpy 메모리에서 분리
+
+    def decode_video_frame(self, header: int, data: bytes):
+        """H.264 프레임 디코딩 (RGB 변환 없음)
+
+        모든 패킷은 참조 체인 유지를 위해 디코딩해야 하지만 화면에 보이지 않을
+        프레임은 변환을 생략할 수 있도록 분리 (H264DecodeWorker).
+
+        Returns:
+            av.VideoFrame 또는 None (디코딩 실패/스킵/버퍼링)
+        """
         if not self._codec_ctx or not PYQT_AVAILABLE or not NUMPY_AVAILABLE:
             return None
 
@@ -151,7 +186,7 @@ class H264Decoder:
 
         self._last_seq = frame_seq
 
-        # NAL → av.Packet → decode → VideoFrame → numpy → QImage
+        # NAL → av.Packet → decode → VideoFrame
         try:
             packet = av.Packet(nal_data)
             packet.pts = frame_seq
@@ -160,20 +195,9 @@ class H264Decoder:
             frames = self._codec_ctx.decode(packet)
 
             for frame in frames:
-                # VideoFrame → numpy (RGB)
-                rgb_frame = frame.to_ndarray(format='rgb24')
-                h, w, ch = rgb_frame.shape
-                bytes_per_line = ch * w
-
-                # numpy → QImage
-                qimage = QImage(
-                    rgb_frame.data, w, h, bytes_per_line,
-                    QImage.Format.Format_RGB888
-                ).copy()  # .copy()로 numpy 메모리에서 분리
-
                 self._frames_decoded += 1
                 self._decode_errors = 0
-                return qimage
+                return frame
 
             return None  # 디코더가 아직 출력 안 함 (버퍼링 중)
 
@@ -235,3 +259,138 @@ class H264Decoder:
 
     def __del__(self):
         self.close()
+
+
+if PYQT_AVAILABLE:
+
+    class H264DecodeWorker(QObject):
+        """스트림별 H.264 디코딩 스레드 — GUI 스레드는 완성된 QImage만 그림
+
+        - submit(): GUI 스레드에서 패킷 enqueue만 (디코딩/변환/복사 없음)
+        - 워커 스레드: 모든 패킷 디코딩 (참조 체인 유지), RGB 변환 + QImage 생성
+        - UI가 밀리면 프레임 드롭:
+            출력 — 최신 1장만 보관 (GUI가 가져가기 전 새 프레임이 오면 교체)
+            변환 — 뒤에 대기 패킷이 있으면 변환 생략 (최소 표시 간격은 보장)
+            입력 — 대기 패킷이 MAX_BACKLOG 초과 시 비우고 다음 키프레임부터 재개
+        - frame_ready / keyframe_needed 시그널은 워커 스레드에서 emit
+          → GUI 스레드 슬롯으로 큐 연결 (AgentServer 호출은 GUI 스레드에서)
+        """
+
+        frame_ready = pyqtSignal()          # take()로 가져갈 프레임 있음
+        keyframe_needed = pyqtSignal()      # 키프레임 대기 (1초 쓰로틀)
+
+        MAX_BACKLOG = 30                # 대기 패킷 상한 (초과 시 키프레임까지 스킵)
+        MIN_SHOW_INTERVAL = 0.1         # 밀려 있어도 이 간격마다 1장은 변환 (초)
+        KEYFRAME_REQUEST_INTERVAL = 1.0
+
+        def __init__(self, name: str = ''):
+            super().__init__()
+            self._decoder = H264Decoder()
+            self._cond = threading.Condition()
+            self._packets: deque = deque()
+            self._latest: Optional[QImage] = None
+            self._running = True
+            self._skip_to_keyframe = False
+            self._last_shown = 0.0
+            self._last_keyframe_request = 0.0
+
+            # 통계
+            self.dropped_input = 0      # 백로그 초과로 버린 패킷
+            self.dropped_output = 0     # 변환 생략/교체된 디코딩 프레임
+
+            self._thread = threading.Thread(
+                target=self._run, name=f"h264-decode-{name}", daemon=True,
+            )
+            self._thread.start()
+
+        @property
+        def is_available(self) -> bool:
+            return self._decoder.is_available
+
+        @property
+        def frames_decoded(self) -> int:
+            return self._decoder.frames_decoded
+
+        def submit(self, header: int, data: bytes):
+            """패킷 enqueue (GUI 스레드)"""
+            with self._cond:
+                if len(self._packets) >= self.MAX_BACKLOG:
+                    self.dropped_input += len(self._packets)
+                    self._packets.clear()
+                    self._skip_to_keyframe = True
+                    logger.warning(
+                        f"[H264DecodeWorker] 디코딩 지연 — 대기 패킷 {self.MAX_BACKLOG}개 초과, "
+                        f"키프레임부터 재개"
+                    )
+                if self._skip_to_keyframe:
+                    if header != HEADER_H264_KEYFRAME:
+                        self.dropped_input += 1
+                        self._request_keyframe()
+                        return
+                    self._skip_to_keyframe = False
+                self._packets.append((header, data))
+                self._cond.notify()
+
+        def take(self) -> Optional['QImage']:
+            """최신 디코딩 프레임 가져오기 (GUI 스레드, 없으면 None)"""
+            with self._cond:
+                image, self._latest = self._latest, None
+            return image
+
+        def close(self):
+            """워커 종료 요청 — 디코더는 워커 스레드가 빠져나가며 해제
+            (join 타임아웃 시 디코딩 중인 코덱 컨텍스트를 다른 스레드에서 해제하지 않도록)"""
+            with self._cond:
+                self._running = False
+                self._packets.clear()
+                self._cond.notify()
+            self._thread.join(timeout=2.0)
+
+        def _request_keyframe(self):
+            now = time.monotonic()
+            if now - self._last_keyframe_request >= self.KEYFRAME_REQUEST_INTERVAL:
+                self._last_keyframe_request = now
+                self.keyframe_needed.emit()
+
+        def _run(self):
+            try:
+                self._decode_loop()
+            finally:
+                self._decoder.close()
+
+        def _decode_loop(self):
+            while True:
+                with self._cond:
+                    while self._running and not self._packets:
+                        self._cond.wait()
+                    if not self._running:
+                        return
+                    header, data = self._packets.popleft()
+                    behind = bool(self._packets)
+
+                frame = self._decoder.decode_video_frame(header, data)
+                if frame is None:
+                    if self._decoder.waiting_for_keyframe:
+                        self._request_keyframe()
+                    continue
+
+                now = time.monotonic()
+                if behind and now - self._last_shown < self.MIN_SHOW_INTERVAL:
+                    # 더 새로운 패킷이 대기 중 — 보이지 않을 프레임 변환 생략
+                    self.dropped_output += 1
+                    continue
+                self._last_shown = now
+
+                try:
+                    image = H264Decoder.frame_to_qimage(frame)
+                except Exception as e:
+                    logger.error(f"[H264DecodeWorker] 변환 오류: {type(e).__name__}: {e}")
+                    continue
+
+                with self._cond:
+                    notify = self._latest is None
+                    if not notify:
+                        self.dropped_output += 1    # GUI가 이전 프레임을 아직 안 가져감
+                    self._latest = image
+                if notify:
+                    self.frame_ready.emit()
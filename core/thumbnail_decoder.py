@@ -0,0 +1,146 @@
+"""그리드 썸네일 디코더 — 스레드 풀에서 JPEG 디코딩 + 셀 크기 스케일
+
+기존에는 PCThumbnailWidget.update_thumbnail이 GUI 스레드에서
+QPixmap.loadFromData + SmoothTransformation scaled()를 PC마다 매 수신 주기 실행해
+PC 수가 많으면 그리드 스크롤/클릭이 끊겼다.
+
+- request(): GUI 스레드 — 작업 등록만 (디코딩/스케일은 풀 스레드, QImage는 스레드 안전)
+- PC별 병합: 진행 중인 디코딩이 있으면 최신 요청 1개만 대기 (밀린 썸네일은 건너뜀)
+- 결과는 셀 크기로 미리 스케일한 QImage — decoded 시그널로 GUI 스레드에 전달
+- PC별 캐시 (원본 JPEG + 목표 크기 일치 시 재사용) — 그리드 재구성/리사이즈 시
+  같은 크기면 다시 디코딩하지 않음
+
+사용:
+    decoder = ThumbnailDecoder()
+    decoder.decoded.connect(on_decoded)         # on_decoded(key, QImage)
+    image = decoder.cached(key, jpeg, size)     # 캐시 적중 시 QImage, 아니면 None
+    decoder.request(key, jpeg, size)
+    decoder.close()                             # 소유 위젯 삭제 전 (풀 종료, 이후 emit 없음)
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailDecoder(QObject):
+    """썸네일 JPEG → 셀 크기 QImage (스레드 풀, PC별 최신 요청 우선 + 캐시)"""
+
+    decoded = pyqtSignal(str, QImage)   # key, 셀 크기로 스케일된 이미지 (풀 스레드에서 emit)
+
+    MAX_WORKERS = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = ThreadPoolExecutor(
+            max_workers=min(self.MAX_WORKERS, os.cpu_count() or 1),
+            thread_name_prefix='thumb-decode',
+        )
+        self._lock = threading.Lock()
+        self._inflight: set = set()     # 디코딩 중인 key
+        self._pending: dict = {}        # key → (jpeg, (w, h)) — 진행 중 디코딩 뒤 최신 요청
+        self._cache: dict = {}          # key → (jpeg, (w, h), QImage)
+        self._closed = False
+
+        # 통계
+        self.decodes = 0
+        self.dropped = 0                # 더 새 썸네일로 대체되어 건너뛴 요청
+        self.cache_hits = 0
+
+    def cached(self, key: str, jpeg: bytes, size: QSize) -> Optional[QImage]:
+        """같은 원본 + 같은 크기로 디코딩된 이미지 (없으면 None)"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] == jpeg and entry[1] == (size.width(), size.height()):
+                self.cache_hits += 1
+                return entry[2]
+        return None
+
+    def request(self, key: str, jpeg: bytes, size: QSize):
+        """디코딩 요청 (GUI 스레드) — 같은 key가 디코딩 중이면 최신 요청만 대기"""
+        if size.width() <= 0 or size.height() <= 0:
+            return
+        job = (jpeg, (size.width(), size.height()))
+        with self._lock:
+            if self._closed:
+                return
+            if key in self._inflight:
+                if key in self._pending:
+                    self.dropped += 1
+                self._pending[key] = job
+                return
+            self._inflight.add(key)
+        try:
+            self._pool.submit(self._run, key, job)
+        except RuntimeError:
+            # close()와 경합 — 풀 종료됨
+            with self._lock:
+                self._inflight.discard(key)
+
+    def retain(self, keys):
+        """그리드에 남은 key만 캐시 유지 (그리드 재구성 시)"""
+        keys = set(keys)
+        with self._lock:
+            for key in list(self._cache):
+                if key not in keys:
+                    del self._cache[key]
+
+    def close(self):
+        """풀 종료 (GUI 스레드, 소유 위젯 deleteLater 전에 호출)
+
+        대기 작업은 취소하고 진행 중인 디코딩은 결과를 버린다. emit은 락 안에서만
+        하므로 close() 반환 후에는 삭제된 QObject로 시그널이 나가지 않는다.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.clear()
+            self._inflight.clear()
+            self._cache.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "decodes": self.decodes,
+                "dropped": self.dropped,
+                "cache_hits": self.cache_hits,
+                "cached": len(self._cache),
+            }
+
+    def _run(self, key: str, job):
+        while job is not None:
+            jpeg, (w, h) = job
+            image = None
+            try:
+                source = QImage.fromData(jpeg)
+                if not source.isNull():
+                    image = source.scaled(
+                        w, h,
+                        Qt.AspectRatioMode.KeepAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation,
+                    )
+            except Exception as e:
+                logger.error(f"[ThumbnailDecoder] 디코딩 오류 ({key}): {type(e).__name__}: {e}")
+
+            with self._lock:
+                self.decodes += 1
+                if image is not None:
+                    self._cache[key] = (jpeg, (w, h), image)
+                if self._closed:
+                    return
+                job = self._pending.pop(key, None)
+                if job is None:
+                    self._inflight.discard(key)
+                if image is not None and job is None:
+                    # 대기 요청이 있으면 곧 교체될 이미지 — 전달 생략
+                    # (큐 연결이라 emit은 즉시 반환 — close()와의 경합 방지를 위해 락 안에서)
+                    self.decoded.emit(key, image)
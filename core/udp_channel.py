@@ -24,6 +24,7 @@ TYPE_THUMBNAIL = 0x01
 TYPE_STREAM = 0x02      # MJPEG
 TYPE_H264_KEY = 0x03
 TYPE_H264_DELTA = 0x04
+TYPE_STREAM_PATCH = 0x06  # MJPEG 변경 영역 패치
 TYPE_CONTROL = 0x10     # JSON 제어 메시지 (ACK 필요)
 TYPE_CONTROL_ACK = 0x11
 TYPE_PING = 0xFE
@@ -265,7 +266,8 @@ class UdpChannel:
         elif ptype == TYPE_CONTROL:
             self._send_ack(seq)
             self._dispatch_control(payload)
-        elif ptype in (TYPE_THUMBNAIL, TYPE_STREAM, TYPE_H264_KEY, TYPE_H264_DELTA):
+        elif ptype in (TYPE_THUMBNAIL, TYPE_STREAM, TYPE_H264_KEY, TYPE_H264_DELTA,
+                       TYPE_STREAM_PATCH):
             self._dispatch_video(ptype, payload)
 
     def _handle_chunk(self, seq: int, ptype: int, idx: int, total: int, data: bytes):
@@ -294,7 +296,8 @@ class UdpChannel:
             if ptype == TYPE_CONTROL:
                 self._send_ack(seq)
                 self._dispatch_control(full)
-            elif ptype in (TYPE_THUMBNAIL, TYPE_STREAM, TYPE_H264_KEY, TYPE_H264_DELTA):
+            elif ptype in (TYPE_THUMBNAIL, TYPE_STREAM, TYPE_H264_KEY, TYPE_H264_DELTA,
+                           TYPE_STREAM_PATCH):
                 self._dispatch_video(ptype, full)
 
         # 오래된 재조립 버퍼 정리
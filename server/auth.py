@@ -1,4 +1,14 @@
-"""JWT 인증 모듈"""
+"""JWT 인증 모듈
+
+토큰 검증/사용자 조회 캐시 — 에이전트 heartbeat 등 매 요청마다 JWT 디코드 +
+users SELECT가 반복되지 않도록:
+    decode_token: 토큰 문자열 → 페이로드 LRU (서명 검증 1회, 만료는 매번 확인)
+    get_current_user: user_id → 사용자 행 TTL 캐시 (update_user/delete_user 시 무효화)
+다중 워커에서는 무효화가 해당 워커에만 적용되므로 다른 워커는 TTL 이내로 반영된다.
+"""
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 import jwt
@@ -6,11 +16,19 @@ import bcrypt
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from config import JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRE_HOURS
+from config import (
+    JWT_SECRET, JWT_ALGORITHM, JWT_EXPIRE_HOURS,
+    AUTH_TOKEN_CACHE_SIZE, AUTH_USER_CACHE_TTL,
+)
 from database import get_db
 
 security = HTTPBearer()
 
+# 동기 엔드포인트는 스레드풀에서 실행 → 캐시 접근은 잠금
+_cache_lock = threading.Lock()
+_token_cache: OrderedDict = OrderedDict()   # token → payload (LRU)
+_user_cache: dict = {}                      # user_id → (user, 만료 monotonic)
+
 
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
@@ -32,26 +50,66 @@ def create_token(user_id: int, username: str, role: str) -> str:
 
 
 def decode_token(token: str) -> dict:
+    with _cache_lock:
+        payload = _token_cache.get(token)
+        if payload is not None:
+            _token_cache.move_to_end(token)
+    if payload is not None:
+        # 캐시된 토큰도 만료 시각은 매번 확인
+        if payload["exp"] <= time.time():
+            with _cache_lock:
+                _token_cache.pop(token, None)
+            raise HTTPException(status_code=401, detail="토큰이 만료되었습니다")
+        return payload
+
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="토큰이 만료되었습니다")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다")
+    if "exp" in payload:
+        with _cache_lock:
+            _token_cache[token] = payload
+            if len(_token_cache) > AUTH_TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return payload
+
+
+def invalidate_user(user_id: int):
+    """사용자 변경/삭제 시 캐시 제거 (다음 요청에서 DB 재조회)"""
+    with _cache_lock:
+        _user_cache.pop(user_id, None)
 
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    payload = decode_token(credentials.credentials)
-    with get_db() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT id, username, role, display_name, is_active FROM users WHERE id = %s",
-                (payload["sub"],),
-            )
-            user = cur.fetchone()
+    return get_user_by_token(credentials.credentials)
+
+
+def get_user_by_token(token: str) -> dict:
+    """토큰 검증 + 사용자 행 조회 (캐시) — 권한은 토큰 클레임이 아닌 DB role 기준
+    (WebSocket 등 Depends 밖에서 사용, DB 접근 가능성이 있으므로 async에서는 executor로)"""
+    payload = decode_token(token)
+    user_id = payload["sub"]
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _user_cache.get(user_id)
+    if cached is not None and cached[1] > now:
+        user = cached[0]
+    else:
+        with get_db() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id, username, role, display_name, is_active FROM users WHERE id = %s",
+                    (user_id,),
+                )
+                user = cur.fetchone()
+        if user:
+            with _cache_lock:
+                _user_cache[user_id] = (user, now + AUTH_USER_CACHE_TTL)
     if not user or not user["is_active"]:
         raise HTTPException(status_code=401, detail="비활성화된 계정입니다")
-    return user
+    return dict(user)
 
 
 def require_admin(user: dict = Depends(get_current_user)) -> dict:
@@ -16,15 +16,32 @@ DB_PORT = int(os.getenv("DB_PORT", "3306"))
 DB_USER = os.getenv("DB_USER", "wellcom_api")
 DB_PASS = os.getenv("DB_PASS", "Wellcom@API2026!")
 DB_NAME = os.getenv("DB_NAME", "wellcomland")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))                       # 워커당 최대 연결 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))               # 풀 포화 시 대기 (초)
+DB_POOL_RECYCLE = float(os.getenv("DB_POOL_RECYCLE", "3600"))             # 연결 최대 수명 (초)
+DB_POOL_PING_INTERVAL = float(os.getenv("DB_POOL_PING_INTERVAL", "30"))   # 유휴 후 대여 전 ping (초)
 
 # JWT
 JWT_SECRET = os.getenv("JWT_SECRET", "wellcomsoft-jwt-secret-key-2026-change-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_HOURS = 24
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))  # 검증된 토큰 LRU 크기
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "30"))       # 사용자 행 캐시 (초)
 
 # Server
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "4797"))
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+
+# Relay (다중 워커/노드) — 비어 있으면 단일 프로세스 릴레이
+# memory://name | unix:///run/wellcom-relay.sock | redis://host:6379/0
+RELAY_BUS_URL = os.getenv("RELAY_BUS_URL", "")
+RELAY_NODE_ID = os.getenv("RELAY_NODE_ID", "")   # 비어 있으면 호스트명-PID (최대 32바이트)
+
+# Heartbeat (write-behind)
+HEARTBEAT_FLUSH_INTERVAL = float(os.getenv("HEARTBEAT_FLUSH_INTERVAL", "5"))       # 일괄 반영 주기 (초)
+HEARTBEAT_PERSIST_INTERVAL = float(os.getenv("HEARTBEAT_PERSIST_INTERVAL", "60"))  # 변경 없을 때 last_seen 기록 주기
+HEARTBEAT_STALE_SECONDS = 180                                                     # 이 시간 미수신 시 오프라인
 
 # File Storage
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/opt/wellcomsoft/uploads")
@@ -1,7 +1,30 @@
-"""MySQL 데이터베이스 연결 관리"""
-import pymysql
+"""MySQL 데이터베이스 연결 관리
+
+요청마다 새 연결(TCP + 인증 핸드셰이크)을 열던 방식 대신 제한된 연결 풀 사용.
+동기 라우트는 스레드풀에서 실행되므로 풀은 스레드 안전 (잠금 + 대기자 FIFO 인계).
+
+- 최대 DB_POOL_SIZE개, 초과 요청은 DB_POOL_TIMEOUT초까지 대기 후 503
+  (반납 연결은 먼저 기다린 요청에 직접 인계 — 새로 온 요청의 새치기로 인한 꼬리 지연 방지)
+- 반납된 연결은 LIFO 재사용 (최근 연결 우선 → 대부분 ping 없이 바로 대여)
+- 헬스 체크: 유휴가 DB_POOL_PING_INTERVAL초를 넘은 연결은 대여 전 ping,
+  생성 후 DB_POOL_RECYCLE초가 지난 연결은 폐기 (MySQL wait_timeout 대비)
+- 사용 중 연결 오류(OperationalError/InterfaceError)가 난 연결은 반납하지 않고 폐기
+- 통계: 대여 수/대기 수/대기 시간/타임아웃/생성/폐기 (pool_stats)
+
+동기 함수이므로 async 핸들러에서는 run_in_executor로 호출 (이벤트 루프 차단 방지).
+"""
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from config import DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME
+
+import pymysql
+from fastapi import HTTPException
+
+from config import (
+    DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME,
+    DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PING_INTERVAL,
+)
 
 
 def get_connection():
@@ -17,10 +40,211 @@ def get_connection():
     )
 
 
+class _Waiter:
+    """풀 포화 시 대기자 — 반납된 연결을 순서대로 직접 인계받음 (FIFO, 새치기 방지)"""
+    __slots__ = ("event", "item", "granted")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.item = None        # 인계된 유휴 연결 (None이면 새 연결 생성 권한)
+        self.granted = False
+
+
+class ConnectionPool:
+    """스레드 안전 MySQL 연결 풀
+
+    Args:
+        size: 최대 연결 수 (사용 중 + 유휴)
+        timeout: 풀 포화 시 대기 상한 (초)
+        recycle: 연결 최대 수명 (초)
+        ping_interval: 이 시간 이상 유휴였던 연결은 대여 전 ping (초)
+    """
+
+    def __init__(self, size: int, timeout: float, recycle: float, ping_interval: float):
+        self._size = size
+        self._timeout = timeout
+        self._recycle = recycle
+        self._ping_interval = ping_interval
+        self._lock = threading.Lock()
+        self._idle: list = []           # [(conn, 생성 시각, 반납 시각)] — 끝이 최근
+        self._waiters: deque = deque()  # _Waiter (먼저 온 순)
+        self._created_at: dict = {}     # id(conn) → 생성 시각 (사용 중 연결 포함)
+        self._in_use = 0
+
+        # 통계
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.ping_failures = 0
+
+    def acquire(self):
+        """연결 대여 — 유휴 재사용 → 신규 생성 → 반납 대기 (FIFO)"""
+        waiter = None
+        with self._lock:
+            self.checkouts += 1
+            if self._idle:
+                item = self._idle.pop()
+                self._in_use += 1
+            elif self._in_use + len(self._idle) < self._size:
+                item = None
+                self._in_use += 1
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+
+        if waiter is not None:
+            start = time.monotonic()
+            waiter.event.wait(self._timeout)
+            wait = time.monotonic() - start
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    self.timeouts += 1
+                    raise HTTPException(status_code=503, detail="DB 연결 대기 시간 초과")
+                self.waits += 1
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+            item = waiter.item
+
+        # 연결 생성/ping은 잠금 밖에서 (네트워크 I/O)
+        try:
+            if item is not None:
+                conn = self._check(*item)
+                if conn is not None:
+                    return conn
+            conn = get_connection()
+            with self._lock:
+                self.created += 1
+                self._created_at[id(conn)] = time.monotonic()
+            return conn
+        except Exception:
+            self._hand_off(None)
+            raise
+
+    def _check(self, conn, created: float, released: float):
+        """유휴 연결 헬스 체크 → 사용 가능하면 conn, 아니면 폐기 후 None"""
+        now = time.monotonic()
+        if now - created > self._recycle:
+            self._discard(conn)
+            return None
+        if now - released > self._ping_interval:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                with self._lock:
+                    self.ping_failures += 1
+                self._discard(conn)
+                return None
+        return conn
+
+    def release(self, conn, broken: bool = False):
+        """연결 반납 (broken이면 폐기) — 대기자가 있으면 바로 인계"""
+        if broken or not conn.open:
+            self._discard(conn)
+            self._hand_off(None)
+            return
+        with self._lock:
+            created = self._created_at.get(id(conn), time.monotonic())
+        self._hand_off((conn, created, time.monotonic()))
+
+    def _hand_off(self, item):
+        """사용 중 슬롯 1개 반환: 첫 대기자에게 인계 (item None = 새 연결 생성 권한)"""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.item = item
+                waiter.granted = True
+                waiter.event.set()
+                return
+            self._in_use -= 1
+            if item is not None:
+                self._idle.append(item)
+
+    def _discard(self, conn):
+        with self._lock:
+            self.discarded += 1
+            self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close_idle(self):
+        """유휴 연결 모두 종료 (서버 종료 시)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": len(self._waiters),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_avg_ms": round(self.wait_total / self.waits * 1000, 2) if self.waits else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+                "timeouts": self.timeouts,
+                "created": self.created,
+                "discarded": self.discarded,
+                "ping_failures": self.ping_failures,
+            }
+
+
+_pool = ConnectionPool(DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PING_INTERVAL)
+
+
 @contextmanager
 def get_db():
-    conn = get_connection()
+    conn = _pool.acquire()
+    broken = False
     try:
         yield conn
+    except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+        broken = True
+        raise
     finally:
-        conn.close()
+        _pool.release(conn, broken)
+
+
+UPDATE_MANY_CHUNK = 500     # update_many 1문장당 최대 행 수
+
+
+def update_many(cur, table: str, keys: tuple, columns: tuple, rows: list, extra: str = "") -> int:
+    """여러 행을 UPDATE 1문장(청크당)으로 갱신 — 값 행들을 파생 테이블로 JOIN
+
+    Args:
+        keys: 행 식별 컬럼 (JOIN 조건), columns: 갱신 컬럼
+        rows: [(keys 값..., columns 값...)] — 테이블에 없는 키는 무시 (INSERT 없음)
+        extra: 추가 SET 절 (대상 테이블 별칭 t, 예: "t.is_online = TRUE")
+    Returns:
+        갱신된 행 수
+    """
+    select = "SELECT " + ", ".join(f"%s AS {c}" for c in keys + columns)
+    on = " AND ".join(f"t.{k} = v.{k}" for k in keys)
+    sets = ", ".join(([extra] if extra else []) + [f"t.{c} = v.{c}" for c in columns])
+    updated = 0
+    for i in range(0, len(rows), UPDATE_MANY_CHUNK):
+        chunk = rows[i:i + UPDATE_MANY_CHUNK]
+        cur.execute(
+            f"UPDATE {table} t JOIN ({' UNION ALL '.join([select] * len(chunk))}) v "
+            f"ON {on} SET {sets}",
+            [value for row in chunk for value in row],
+        )
+        updated += cur.rowcount
+    return updated
+
+
+def pool_stats() -> dict:
+    return _pool.stats()
+
+
+def close_pool():
+    _pool.close_idle()
@@ -0,0 +1,135 @@
+"""에이전트 하트비트 write-behind 버퍼
+
+기존에는 /api/agents/heartbeat 요청마다 UPDATE 1건을 실행해
+에이전트 수 / 하트비트 주기만큼 DB 쓰기가 발생했다.
+
+- 하트비트는 메모리에 (agent_id, owner_id)별로 병합 (마지막 값만 유지)
+- flush()가 주기적으로 변경분을 다중 행 UPDATE 1문장(청크당, database.update_many)으로 반영
+    상태 변경 (오프라인 → 온라인, IP/포트/해상도/버전 변경) → 다음 flush에 기록
+    변경 없음 → last_seen만 HEARTBEAT_PERSIST_INTERVAL마다 기록
+        (DB 기반 오프라인 정리가 HEARTBEAT_STALE_SECONDS 기준이므로 그보다 짧게)
+- 온라인 여부/마지막 하트비트는 메모리에서 응답 (is_online / last_seen)
+- 등록되지 않은 에이전트는 기존 UPDATE와 같이 무시 (INSERT 없음)
+
+다중 워커에서는 워커마다 자기 요청분만 보유 — 조회 시 메모리에 없으면 DB 값 사용.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+from database import get_db, update_many
+
+_FIELDS = ("ip", "ip_public", "ws_port", "screen_width", "screen_height", "agent_version")
+
+
+class HeartbeatBuffer:
+    """하트비트 병합 + 주기적 일괄 반영 (스레드 안전 — 동기 라우트는 스레드풀)"""
+
+    def __init__(self, persist_interval: float, stale_seconds: float):
+        self._persist_interval = persist_interval
+        self._stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # (agent_id, owner_id) → {"fields": tuple, "last_seen": datetime, "seen": monotonic,
+        #                         "written": tuple | None, "written_at": monotonic}
+        self._agents: dict = {}
+
+        # 통계
+        self.received = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.errors = 0
+
+    def record(self, agent_id: str, owner_id: int, values: dict):
+        """하트비트 1건 병합 (DB 접근 없음)"""
+        fields = tuple(values[f] for f in _FIELDS)
+        with self._lock:
+            self.received += 1
+            entry = self._agents.get((agent_id, owner_id))
+            if entry is None:
+                entry = {"written": None, "written_at": 0.0}
+                self._agents[(agent_id, owner_id)] = entry
+            entry["fields"] = fields
+            # DB DATETIME 컬럼이 돌려주는 형식과 동일하게 (naive UTC, 초 단위)
+            entry["last_seen"] = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+            entry["seen"] = time.monotonic()
+
+    def forget(self, agent_id: str, owner_id: int):
+        """오프라인 보고 — 진행 중인 flush가 끝난 뒤 제거 (오프라인 기록을 덮어쓰지 않도록)
+        다음 하트비트는 상태 변경으로 즉시 기록"""
+        with self._flush_lock, self._lock:
+            self._agents.pop((agent_id, owner_id), None)
+
+    def is_online(self, agent_id: str, owner_id: int):
+        """메모리 기준 온라인 여부 (True/False, 이 워커가 모르는 에이전트는 None)"""
+        with self._lock:
+            entry = self._agents.get((agent_id, owner_id))
+            if entry is None:
+                return None
+            return time.monotonic() - entry["seen"] < self._stale_seconds
+
+    def apply(self, agent: dict) -> dict:
+        """DB 행에 메모리 상태 반영 (조회 응답용, 모르는 에이전트는 그대로)"""
+        with self._lock:
+            entry = self._agents.get((agent.get("agent_id"), agent.get("owner_id")))
+            if entry is None:
+                return agent
+            online = time.monotonic() - entry["seen"] < self._stale_seconds
+            agent = dict(agent)
+            agent["is_online"] = online
+            agent["last_seen"] = entry["last_seen"]
+            if online:
+                agent.update(zip(_FIELDS, entry["fields"]))
+        return agent
+
+    def flush(self) -> int:
+        """변경분 일괄 반영 → 기록한 행 수 (이벤트 루프 밖에서 호출)"""
+        with self._flush_lock:
+            now = time.monotonic()
+            rows = []
+            with self._lock:
+                for key, entry in list(self._agents.items()):
+                    if now - entry["seen"] >= self._stale_seconds:
+                        # 오프라인 전환은 DB 정리 태스크가 처리 — 메모리에서만 제거
+                        del self._agents[key]
+                        continue
+                    if entry["seen"] <= entry["written_at"]:
+                        continue    # 마지막 기록 이후 하트비트 없음
+                    if (entry["fields"] == entry["written"]
+                            and now - entry["written_at"] < self._persist_interval):
+                        continue
+                    rows.append((key, entry["fields"], entry["last_seen"]))
+            if not rows:
+                return 0
+
+            try:
+                with get_db() as conn:
+                    with conn.cursor() as cur:
+                        update_many(
+                            cur, "agents", ("agent_id", "owner_id"), ("last_seen",) + _FIELDS,
+                            [key + (last_seen,) + fields for key, fields, last_seen in rows],
+                            extra="t.is_online = TRUE",
+                        )
+            except Exception:
+                self.errors += 1
+                raise
+
+            with self._lock:
+                for key, fields, _ in rows:
+                    entry = self._agents.get(key)
+                    if entry is not None:
+                        entry["written"] = fields
+                        entry["written_at"] = now
+                self.flushes += 1
+                self.rows_written += len(rows)
+            return len(rows)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "agents": len(self._agents),
+                "received": self.received,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+                "errors": self.errors,
+            }
@@ -14,6 +14,7 @@ import asyncio
 import json
 import os
 import secrets
+import socket
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
@@ -24,23 +25,50 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from auth import (
     hash_password, verify_password, create_token,
-    get_current_user, require_admin, decode_token,
+    get_current_user, get_user_by_token, require_admin, decode_token, invalidate_user,
 )
-from database import get_db
+from config import (
+    RELAY_BUS_URL, RELAY_NODE_ID,
+    HEARTBEAT_FLUSH_INTERVAL, HEARTBEAT_PERSIST_INTERVAL, HEARTBEAT_STALE_SECONDS,
+)
+from database import get_db, pool_stats, close_pool, update_many
+from heartbeat_buffer import HeartbeatBuffer
 from models import (
     LoginRequest, LoginResponse, UserInfo,
     UserCreate, UserUpdate, UserResponse,
     AgentRegister, AgentHeartbeat, AgentResponse,
     GroupCreate, GroupResponse,
 )
+from relay_bus import create_bus
+from relay_cluster import RelayCluster
+from relay_hub import (
+    HEADER_KINDS, RelaySubscriptions, RelayTenants, STOP_MESSAGE, token_owner,
+    pack_envelope, unpack_envelope,
+)
+from relay_queue import SendQueue
 
 # ===========================================================
-# 서버 릴레이 상태 (메모리, 단일 프로세스)
+# 서버 릴레이 상태 (메모리, 프로세스별)
 # 에이전트가 아웃바운드로 연결 → 포트 개방 불필요 폴백
+# RELAY_BUS_URL 설정 시 다중 워커/노드: 다른 노드의 에이전트는 _relay_cluster가
+# 디렉터리(테넌트/접속 정보)만 이 상태에 등록하고 트래픽은 버스로 중계
 # ===========================================================
-_relay_agents: dict = {}   # agent_id → WebSocket (에이전트 측)
+# 연결은 SendQueue(송신 큐 + writer 태스크)로 보관 — 팬아웃은 enqueue만 (await 없음)
+_relay_agents: dict = {}   # agent_id → SendQueue (에이전트 측)
 _relay_agent_info: dict = {}  # agent_id → {"real_ip": str, "ws_port": int}
-_relay_managers: set = set()  # 연결된 매니저 WebSocket 목록 (set: O(1) 추가/삭제)
+_relay_managers: set = set()  # 연결된 매니저 SendQueue 목록 (set: O(1) 추가/삭제)
+_relay_subs = RelaySubscriptions()  # (agent_id, 스트림 종류) → 구독 매니저
+_relay_tenants = RelayTenants()     # 소유자(JWT sub) → {에이전트, 매니저}
+_relay_keyframe_at: dict = {}       # agent_id → 마지막 키프레임 요청 시각 (monotonic)
+RELAY_KEYFRAME_INTERVAL = 1.0       # 델타 드롭 후 키프레임 재요청 최소 간격 (초)
+_relay_ip_pending: dict = {}        # (agent_id, owner_id) → 접속 공인 IP (DB 반영 대기)
+_relay_ip_task: Optional[asyncio.Task] = None
+_relay_cluster: Optional[RelayCluster] = None  # 다중 노드 라우팅 (RELAY_BUS_URL 미설정 시 None)
+
+# ===========================================================
+# 에이전트 하트비트 write-behind (메모리 병합 → 주기적 일괄 UPDATE)
+# ===========================================================
+_heartbeats = HeartbeatBuffer(HEARTBEAT_PERSIST_INTERVAL, HEARTBEAT_STALE_SECONDS)
 
 # ===========================================================
 # 로그인 속도 제한 (브루트포스 방지)
@@ -59,6 +87,163 @@ def _relay_pad(agent_id: str) -> bytes:
 def _relay_unpad(data: bytes) -> str:
     return data[:RELAY_AGENT_ID_LEN].rstrip(b"\x00").decode("utf-8", errors="replace")
 
+
+def _relay_tag_source(text: str, agent_id: str) -> Optional[str]:
+    """구버전 매니저용 — JSON에 source_agent 삽입 후 재직렬화 (실패 시 None)"""
+    try:
+        msg = json.loads(text)
+        msg["source_agent"] = agent_id
+        return json.dumps(msg)
+    except Exception:
+        return None
+
+
+def _relay_request_keyframe(agent_id: str):
+    """매니저 큐에서 델타 프레임이 드롭됨 → 에이전트에 키프레임 요청 (간격 제한)
+
+    릴레이 에이전트는 스트림을 에이전트당 1개 공유하므로 느린 매니저 1개의
+    요청이 다른 시청자에게도 키프레임을 유발한다 → 최소 간격으로 제한.
+    """
+    now = time.monotonic()
+    if now - _relay_keyframe_at.get(agent_id, 0.0) < RELAY_KEYFRAME_INTERVAL:
+        return
+    if _relay_send_to_agent(agent_id, json.dumps({"type": "request_keyframe"}), "request_keyframe"):
+        _relay_keyframe_at[agent_id] = now
+
+
+def _relay_send_to_agent(agent_id: str, text: str, msg_type: str = "") -> bool:
+    """에이전트에 제어 메시지 — 로컬 연결 또는 에이전트 보유 노드로 전달"""
+    agent_conn = _relay_agents.get(agent_id)
+    if agent_conn:
+        agent_conn.send_text(text)
+        return True
+    if _relay_cluster is not None:
+        return _relay_cluster.send_to_agent(agent_id, msg_type, text)
+    return False
+
+
+def _relay_fanout_text(agent_id: str, text: str):
+    """에이전트 JSON → 같은 소유자 매니저
+
+    envelope 매니저는 원문 그대로 (파싱 없음), 구버전 매니저만 source_agent 삽입.
+    """
+    wrapped = legacy = None
+    for m_conn in _relay_tenants.managers_for_agent(agent_id):
+        if m_conn.envelope:
+            if wrapped is None:
+                wrapped = pack_envelope(agent_id, text)
+            m_conn.send_text(wrapped)
+        else:
+            if legacy is None:
+                legacy = _relay_tag_source(text, agent_id) or ""
+            if legacy:
+                m_conn.send_text(legacy)
+
+
+def _relay_frame_targets(agent_id: str, header: int) -> list:
+    """바이너리 수신 대상 — 스트림 종류는 구독 매니저(+구독 노드)만,
+    알 수 없는 헤더는 같은 소유자 매니저 전체"""
+    kind = HEADER_KINDS.get(header)
+    if kind:
+        return _relay_subs.targets(agent_id, kind)
+    return _relay_tenants.managers_for_agent(agent_id)
+
+
+def _relay_fanout_frame(agent_id: str, fwd: bytes):
+    """다른 노드 에이전트의 바이너리(fwd = 32B agent_id + 프레임) → 로컬 매니저"""
+    header = fwd[RELAY_AGENT_ID_LEN]
+    for m_conn in _relay_frame_targets(agent_id, header):
+        m_conn.send_frame(fwd, agent_id, header)
+
+
+def _relay_agent_joined(agent_id: str, owner: str, info: dict):
+    """에이전트 등록 (로컬/원격 공통) + 같은 소유자 매니저에게 접속 알림
+
+    real_ip + ws_port 포함 → 매니저가 P2P 직접 연결 시도에 사용.
+    """
+    real_ip = info.get("real_ip", "")
+    ws_port = info.get("ws_port", 21350)
+    _relay_tenants.add_agent(agent_id, owner)
+    _relay_agent_info[agent_id] = {"real_ip": real_ip, "ws_port": ws_port}
+    notify = json.dumps({
+        "type": "agent_connected",
+        "source_agent": agent_id,
+        "real_ip": real_ip,
+        "ws_port": ws_port,
+    })
+    for m_conn in _relay_tenants.managers_for_agent(agent_id):
+        m_conn.send_text(notify)
+
+
+def _relay_agent_left(agent_id: str):
+    """에이전트 해제 (로컬/원격 공통) + 같은 소유자 매니저에게 해제 알림"""
+    _relay_agent_info.pop(agent_id, None)
+    _relay_keyframe_at.pop(agent_id, None)
+    _relay_subs.drop_agent(agent_id)
+    notify = json.dumps({"type": "agent_disconnected", "source_agent": agent_id})
+    managers = _relay_tenants.managers_for_agent(agent_id)
+    _relay_tenants.remove_agent(agent_id)
+    for m_conn in managers:
+        m_conn.send_text(notify)
+
+
+def _relay_drop_manager(handle):
+    """매니저(또는 이탈한 노드) 구독 정리 — 마지막 시청자였던 스트림은 에이전트에 중지 요청"""
+    for aid, kind in _relay_subs.drop_manager(handle):
+        stop = STOP_MESSAGE[kind]
+        _relay_send_to_agent(aid, json.dumps({"type": stop}), stop)
+
+
+def _relay_update_ip(agent_id: str, owner_id, ip: str):
+    """에이전트 접속 공인 IP → DB (병합 후 스레드풀에서 일괄 UPDATE, 이벤트 루프 비차단)
+
+    재접속 폭주(서버 재시작 등) 시에도 접속마다 DB 왕복하지 않고
+    반영 중 쌓인 IP를 다음 1회에 모아 기록한다.
+    """
+    global _relay_ip_task
+    _relay_ip_pending[(agent_id, owner_id)] = ip
+    if _relay_ip_task is None or _relay_ip_task.done():
+        _relay_ip_task = asyncio.create_task(_relay_flush_ip())
+
+
+async def _relay_flush_ip():
+    loop = asyncio.get_running_loop()
+    while _relay_ip_pending:
+        rows = [key + (ip,) for key, ip in _relay_ip_pending.items()]
+        _relay_ip_pending.clear()
+        try:
+            updated = await loop.run_in_executor(None, _write_relay_ips, rows)
+            if updated:
+                print(f"[Relay] DB ip_public 업데이트: {updated}/{len(rows)}개 에이전트")
+        except Exception as e:
+            print(f"[Relay] DB ip_public 업데이트 실패: {e}")
+
+
+def _write_relay_ips(rows: list) -> int:
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            return update_many(cur, "agents", ("agent_id", "owner_id"), ("ip_public",), rows)
+
+
+def _relay_managers_changed():
+    """로컬 매니저 소유자 구성 변경 → 다른 노드에 방송 (해당 소유자 트래픽만 수신)"""
+    if _relay_cluster is not None:
+        _relay_cluster.managers_changed(*_relay_tenants.manager_scope())
+
+
+def _cluster_manager_text(peer, agent_id: str, msg_type: str, text: str):
+    """다른 노드 매니저 → 로컬 에이전트 (노드 프록시를 구독자로 등록)"""
+    if _relay_subs.apply_control(peer, agent_id, msg_type):
+        agent_conn = _relay_agents.get(agent_id)
+        if agent_conn:
+            agent_conn.send_text(text)
+
+
+def _cluster_manager_bytes(agent_id: str, data: bytes):
+    agent_conn = _relay_agents.get(agent_id)
+    if agent_conn:
+        agent_conn.send_bytes(data)
+
 app = FastAPI(title="WellcomSOFT API", version="1.0.0")
 
 app.add_middleware(
@@ -99,41 +284,23 @@ async def ws_agent_relay(websocket: WebSocket, token: str = Query(default="")):
         await websocket.close(code=4000, reason="No agent_id")
         return
 
-    _relay_agents[agent_id] = websocket
+    owner_id = token_owner(payload)
+    agent_conn = SendQueue(websocket, agent_id)
+    _relay_agents[agent_id] = agent_conn
     # 에이전트의 실제 접속 IP + WS 포트 저장 (NAT 뒤에서도 공인IP 알 수 있음)
     agent_real_ip = websocket.client.host if websocket.client else ''
-    agent_ws_port = init.get("ws_port", 21350)
-    _relay_agent_info[agent_id] = {"real_ip": agent_real_ip, "ws_port": agent_ws_port}
+    agent_info = {"real_ip": agent_real_ip, "ws_port": init.get("ws_port", 21350)}
     await websocket.send_text(json.dumps({"type": "relay_ok"}))
+    agent_conn.start()
 
-    # DB에 에이전트의 실제 공인IP 항상 업데이트 (릴레이 접속 시 최신 IP 반영)
-    if agent_real_ip:
-        try:
-            owner_id = payload.get("user_id") or payload.get("sub")
-            if owner_id:
-                with get_db() as conn:
-                    with conn.cursor() as cur:
-                        cur.execute("""
-                            UPDATE agents SET ip_public = %s
-                            WHERE agent_id = %s AND owner_id = %s
-                        """, (agent_real_ip, agent_id, owner_id))
-                        if cur.rowcount:
-                            print(f"[Relay] DB ip_public 업데이트: {agent_id} → {agent_real_ip}")
-        except Exception as e:
-            print(f"[Relay] DB ip_public 업데이트 실패: {e}")
+    # DB에 에이전트의 실제 공인IP 항상 업데이트 (릴레이 접속 시 최신 IP 반영, 비차단)
+    if agent_real_ip and owner_id:
+        _relay_update_ip(agent_id, owner_id, agent_real_ip)
 
-    # 매니저들에게 에이전트 접속 알림 (real_ip + ws_port 포함 → P2P 직접 연결용)
-    notify = json.dumps({
-        "type": "agent_connected",
-        "source_agent": agent_id,
-        "real_ip": agent_real_ip,
-        "ws_port": agent_ws_port,
-    })
-    for m_ws in list(_relay_managers):
-        try:
-            await m_ws.send_text(notify)
-        except Exception:
-            pass
+    # 같은 소유자 매니저들(다른 노드 포함)에게 에이전트 접속 알림
+    _relay_agent_joined(agent_id, owner_id, agent_info)
+    if _relay_cluster is not None:
+        _relay_cluster.agent_up(agent_id, owner_id, agent_info)
     print(f"[Relay] 에이전트 접속: {agent_id} (IP: {agent_real_ip})")
 
     try:
@@ -146,71 +313,74 @@ async def ws_agent_relay(websocket: WebSocket, token: str = Query(default="")):
             raw_bytes = data.get("bytes")
 
             if text:
-                # JSON: source_agent 추가 후 모든 매니저에게 브로드캐스트
-                try:
-                    msg = json.loads(text)
-                except Exception:
-                    continue
-                msg["source_agent"] = agent_id
-                fwd = json.dumps(msg)
-                for m_ws in list(_relay_managers):
-                    try:
-                        await m_ws.send_text(fwd)
-                    except Exception:
-                        pass
+                # JSON: 같은 소유자 매니저 + 해당 소유자 매니저가 있는 노드에 전달
+                _relay_fanout_text(agent_id, text)
+                if _relay_cluster is not None:
+                    _relay_cluster.forward_agent_text(agent_id, owner_id, text)
 
             elif raw_bytes:
-                # 바이너리: 32B agent_id 접두어 추가 후 브로드캐스트
+                # 바이너리: 32B agent_id 접두어 추가 후 구독 매니저(+구독 노드)에게만 전달
+                # 매니저 큐가 밀리면 종류별 드롭 (relay_queue 참조)
+                header = raw_bytes[0]
+                targets = _relay_frame_targets(agent_id, header)
+                remote = _relay_cluster is not None and header not in HEADER_KINDS
+                if not targets and not remote:
+                    continue
                 fwd = _relay_pad(agent_id) + raw_bytes
-                for m_ws in list(_relay_managers):
-                    try:
-                        await m_ws.send_bytes(fwd)
-                    except Exception:
-                        pass
+                for m_conn in targets:
+                    m_conn.send_frame(fwd, agent_id, header)
+                if remote:
+                    _relay_cluster.forward_agent_bytes(agent_id, owner_id, fwd)
 
     except (WebSocketDisconnect, Exception):
         pass
     finally:
         _relay_agents.pop(agent_id, None)
-        _relay_agent_info.pop(agent_id, None)
-        # 매니저들에게 에이전트 해제 알림
-        notify = json.dumps({"type": "agent_disconnected", "source_agent": agent_id})
-        for m_ws in list(_relay_managers):
-            try:
-                await m_ws.send_text(notify)
-            except Exception:
-                pass
+        await agent_conn.close()
+        if _relay_cluster is not None:
+            _relay_cluster.agent_down(agent_id)
+        # 같은 소유자 매니저들에게 에이전트 해제 알림
+        _relay_agent_left(agent_id)
         print(f"[Relay] 에이전트 해제: {agent_id}")
 
 
 @app.websocket("/ws/manager")
-async def ws_manager_relay(websocket: WebSocket, token: str = Query(default="")):
+async def ws_manager_relay(websocket: WebSocket, token: str = Query(default=""),
+                           envelope: int = Query(default=0)):
     """매니저 → 서버 릴레이 연결 (P2P 실패 시 폴백)"""
     await websocket.accept()
 
-    # JWT 검증
+    # JWT 검증 + 사용자 조회 (역할은 REST와 같이 DB 기준 — 강등된 관리자 토큰 차단)
     try:
-        decode_token(token)
+        payload = decode_token(token)
+        user = await asyncio.get_running_loop().run_in_executor(None, get_user_by_token, token)
     except Exception:
         await websocket.close(code=4001, reason="Unauthorized")
         return
 
-    _relay_managers.add(websocket)
-    await websocket.send_text(json.dumps({"type": "relay_ok"}))
-
-    # 현재 연결된 에이전트 목록 전달 (real_ip + ws_port 포함)
-    for aid in list(_relay_agents.keys()):
-        try:
-            info = _relay_agent_info.get(aid, {})
-            await websocket.send_text(json.dumps({
-                "type": "agent_connected",
-                "source_agent": aid,
-                "real_ip": info.get("real_ip", ""),
-                "ws_port": info.get("ws_port", 21350),
-            }))
-        except Exception:
-            pass
-    print(f"[Relay] 매니저 접속 (릴레이 에이전트: {len(_relay_agents)}개)")
+    # 소유자 인덱스 등록 (관리자는 전체 에이전트 열람 — REST /api/agents와 동일)
+    owner = token_owner(payload)
+    conn = SendQueue(websocket, f"manager:{owner}", on_gap=_relay_request_keyframe)
+    conn.envelope = bool(envelope)
+    # envelope 요청 매니저에게만 지원 응답 (구버전 서버는 필드 없음 → 매니저가 기존 방식 유지)
+    ok = {"type": "relay_ok", "envelope": True} if conn.envelope else {"type": "relay_ok"}
+    await websocket.send_text(json.dumps(ok))
+    conn.start()
+    _relay_managers.add(conn)
+    _relay_tenants.add_manager(conn, owner, is_admin=user["role"] == "admin")
+    _relay_managers_changed()
+
+    # 볼 수 있는 에이전트 목록 전달 (real_ip + ws_port 포함)
+    visible = _relay_tenants.agents_for_manager(conn)
+    for aid in visible:
+        info = _relay_agent_info.get(aid, {})
+        conn.send_text(json.dumps({
+            "type": "agent_connected",
+            "source_agent": aid,
+            "real_ip": info.get("real_ip", ""),
+            "ws_port": info.get("ws_port", 21350),
+        }))
+    print(f"[Relay] 매니저 접속 (릴레이 에이전트: {len(visible)}/{len(_relay_agent_info)}개)")
 
     try:
         while True:
@@ -222,38 +392,53 @@ async def ws_manager_relay(websocket: WebSocket, token: str = Query(default=""))
             raw_bytes = data.get("bytes")
 
             if text:
-                # JSON: target_agent 추출 → 해당 에이전트에 전달
-                try:
-                    msg = json.loads(text)
-                except Exception:
-                    continue
-                target = msg.pop("target_agent", None)
-                if target:
-                    agent_ws = _relay_agents.get(target)
-                    if agent_ws:
-                        try:
-                            await agent_ws.send_text(json.dumps(msg))
-                        except Exception:
-                            pass
+                # envelope: 접두어에서 target/type → JSON 원문 그대로 전달
+                # 기존 JSON: target_agent 추출 후 재직렬화
+                env = unpack_envelope(text)
+                if env:
+                    target, msg_type, fwd = env
+                else:
+                    try:
+                        msg = json.loads(text)
+                    except Exception:
+                        continue
+                    target = msg.pop("target_agent", None)
+                    msg_type = msg.get("type", "")
+                    fwd = None
+                if target and _relay_tenants.can_access(conn, target):
+                    # start_*/stop_* → 구독 갱신 (다른 매니저가 시청 중이면 stop 생략)
+                    if not _relay_subs.apply_control(conn, target, msg_type):
+                        continue
+                    _relay_send_to_agent(target, fwd if fwd is not None else json.dumps(msg),
+                                         msg_type)
 
             elif raw_bytes:
                 # 바이너리: 앞 32B = target agent_id
                 if len(raw_bytes) < RELAY_AGENT_ID_LEN + 1:
                     continue
                 target = _relay_unpad(raw_bytes[:RELAY_AGENT_ID_LEN])
-                payload = raw_bytes[RELAY_AGENT_ID_LEN:]
-                agent_ws = _relay_agents.get(target)
-                if agent_ws:
-                    try:
-                        await agent_ws.send_bytes(payload)
-                    except Exception:
-                        pass
+                if not _relay_tenants.can_access(conn, target):
+                    continue
+                # 파일 전송 등 대량 바이너리는 드롭 불가 → 에이전트(노드) 큐가 비워질 때까지
+                # 이 매니저의 수신만 대기 (다른 연결은 영향 없음)
+                agent_conn = _relay_agents.get(target)
+                if agent_conn:
+                    agent_conn.send_bytes(raw_bytes[RELAY_AGENT_ID_LEN:])
+                    await agent_conn.wait_writable()
+                elif _relay_cluster is not None:
+                    await _relay_cluster.send_bytes_to_agent(
+                        target, raw_bytes[RELAY_AGENT_ID_LEN:])
 
     except (WebSocketDisconnect, Exception):
         pass
     finally:
-        _relay_managers.discard(websocket)
-        print("[Relay] 매니저 해제")
+        _relay_managers.discard(conn)
+        _relay_tenants.remove_manager(conn)
+        _relay_managers_changed()
+        await conn.close()
+        # 이 매니저가 마지막 시청자였던 스트림은 에이전트에 중지 요청
+        _relay_drop_manager(conn)
+        print(f"[Relay] 매니저 해제 (드롭 프레임: {sum(conn.dropped.values())})")
 
 
 # ===========================================================
@@ -354,30 +539,83 @@ async def startup_init():
 
     # 백그라운드 태스크: 오래된 에이전트 오프라인 처리
     asyncio.create_task(_cleanup_stale_agents())
+    asyncio.create_task(_flush_heartbeats())
+
+
+@app.on_event("startup")
+async def startup_relay():
+    """다중 워커/노드 릴레이 (RELAY_BUS_URL 설정 시) — DB 초기화와 독립"""
+    global _relay_cluster
+    if RELAY_BUS_URL:
+        node_id = RELAY_NODE_ID or f"{socket.gethostname()[:20]}-{os.getpid()}"
+        _relay_cluster = RelayCluster(
+            create_bus(RELAY_BUS_URL), node_id,
+            on_agent_up=_relay_agent_joined,
+            on_agent_down=_relay_agent_left,
+            on_agent_text=_relay_fanout_text,
+            on_agent_frame=_relay_fanout_frame,
+            on_manager_text=_cluster_manager_text,
+            on_manager_bytes=_cluster_manager_bytes,
+            on_peer_down=_relay_drop_manager,
+            on_gap=_relay_request_keyframe,
+        )
+        await _relay_cluster.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_relay():
+    if _relay_cluster is not None:
+        await _relay_cluster.close()
+
+
+@app.on_event("shutdown")
+def shutdown_db():
+    try:
+        _heartbeats.flush()
+    except Exception as e:
+        print(f"[Heartbeat] 종료 시 반영 오류: {e}")
+    close_pool()
 
 
 # ===========================================================
 # Auth
 # ===========================================================
+async def _flush_heartbeats():
+    """버퍼된 하트비트 일괄 반영 (DB 작업은 스레드풀에서)"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(HEARTBEAT_FLUSH_INTERVAL)
+        try:
+            await loop.run_in_executor(None, _heartbeats.flush)
+        except Exception as e:
+            print(f"[Heartbeat] 반영 오류: {e}")
+
+
 async def _cleanup_stale_agents():
     """하트비트 미수신 에이전트 자동 오프라인 처리 (3분 이상 미응답)"""
-    STALE_MINUTES = 3
+    STALE_MINUTES = HEARTBEAT_STALE_SECONDS // 60
     while True:
         await asyncio.sleep(120)   # 2분마다 실행
         try:
-            with get_db() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        UPDATE agents SET is_online = FALSE
-                        WHERE is_online = TRUE
-                          AND last_seen < %s
-                    """, (datetime.now(timezone.utc) - timedelta(minutes=STALE_MINUTES),))
-                    if cur.rowcount:
-                        print(f"[Cleanup] 오프라인 처리: {cur.rowcount}개 에이전트 (마지막 하트비트 {STALE_MINUTES}분 초과)")
+            count = await asyncio.get_running_loop().run_in_executor(
+                None, _mark_stale_offline, STALE_MINUTES)
+            if count:
+                print(f"[Cleanup] 오프라인 처리: {count}개 에이전트 (마지막 하트비트 {STALE_MINUTES}분 초과)")
         except Exception as e:
             print(f"[Cleanup] 오류: {e}")
 
 
+def _mark_stale_offline(stale_minutes: int) -> int:
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE agents SET is_online = FALSE
+                WHERE is_online = TRUE
+                  AND last_seen < %s
+            """, (datetime.now(timezone.utc) - timedelta(minutes=stale_minutes),))
+            return cur.rowcount
+
+
 def _check_rate_limit(ip: str):
     """로그인 속도 제한 확인 (IP당 {RATE_LIMIT_MAX}회/{RATE_LIMIT_WINDOW}초)"""
     now = time.time()
@@ -514,29 +752,22 @@ def register_agent(req: AgentRegister, user: dict = Depends(get_current_user)):
 
 @app.post("/api/agents/heartbeat")
 def agent_heartbeat(req: AgentHeartbeat, user: dict = Depends(get_current_user)):
-    """에이전트 하트비트 (주기적 상태 보고)"""
-    with get_db() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                UPDATE agents SET
-                    is_online = TRUE, last_seen = %s, ip = %s,
-                    ip_public = %s, ws_port = %s,
-                    screen_width = %s, screen_height = %s,
-                    agent_version = %s
-                WHERE agent_id = %s AND owner_id = %s
-            """, (
-                datetime.now(timezone.utc), req.ip,
-                req.ip_public, req.ws_port,
-                req.screen_width, req.screen_height,
-                req.agent_version,
-                req.agent_id, user["id"],
-            ))
+    """에이전트 하트비트 (주기적 상태 보고) — 메모리 병합, DB는 _flush_heartbeats가 일괄 반영"""
+    _heartbeats.record(req.agent_id, user["id"], {
+        "ip": req.ip,
+        "ip_public": req.ip_public,
+        "ws_port": req.ws_port,
+        "screen_width": req.screen_width,
+        "screen_height": req.screen_height,
+        "agent_version": req.agent_version,
+    })
     return {"status": "ok"}
 
 
 @app.post("/api/agents/offline")
 def agent_offline(req: AgentHeartbeat, user: dict = Depends(get_current_user)):
     """에이전트 오프라인 보고 (정상 종료 시)"""
+    _heartbeats.forget(req.agent_id, user["id"])
     with get_db() as conn:
         with conn.cursor() as cur:
             cur.execute(
@@ -573,6 +804,7 @@ def get_my_agents(user: dict = Depends(get_current_user)):
 
     result = []
     for a in agents:
+        a = _heartbeats.apply(a)
         # relay로 접속 중인 에이전트의 공인IP가 비어있으면 relay real_ip로 채움
         aid = a.get("agent_id", "")
         if aid and not a.get("ip_public") and aid in _relay_agent_info:
@@ -599,7 +831,7 @@ def get_agent(agent_db_id: int, user: dict = Depends(get_current_user)):
     if user["role"] != "admin" and agent["owner_id"] != user["id"]:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
 
-    return _agent_to_response(agent)
+    return _agent_to_response(_heartbeats.apply(agent))
 
 
 @app.delete("/api/agents/{agent_db_id}")
@@ -725,6 +957,8 @@ def update_user(user_id: int, req: UserUpdate, admin: dict = Depends(require_adm
 
             cur.execute("SELECT * FROM users WHERE id = %s", (user_id,))
             user = cur.fetchone()
+    # 커밋 후 무효화 (그 사이 요청이 이전 행을 다시 캐시하지 않도록)
+    invalidate_user(user_id)
     if not user:
         raise HTTPException(status_code=404)
     return _user_to_response(user)
@@ -735,9 +969,34 @@ def delete_user(user_id: int, admin: dict = Depends(require_admin)):
     with get_db() as conn:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM users WHERE id = %s AND username != 'admin'", (user_id,))
+    invalidate_user(user_id)
     return {"status": "deleted"}
 
 
+# ===========================================================
+# DB 연결 풀 상태 (Admin)
+# ===========================================================
+@app.get("/api/admin/db/stats")
+def db_stats(admin: dict = Depends(require_admin)):
+    """DB 연결 풀 대여/대기 시간/헬스 체크 + 하트비트 버퍼 통계 (워커별)"""
+    return {"pool": pool_stats(), "heartbeats": _heartbeats.stats()}
+
+
+# ===========================================================
+# 릴레이 상태 (Admin)
+# ===========================================================
+@app.get("/api/admin/relay/stats")
+async def relay_stats(admin: dict = Depends(require_admin)):
+    """릴레이 연결별 송신 큐 깊이/드롭 통계 (이벤트 루프에서 읽어 일관성 유지)"""
+    return {
+        "agents": [c.stats() for c in _relay_agents.values()],
+        "managers": [c.stats() for c in _relay_managers],
+        **_relay_subs.stats(),
+        **_relay_tenants.stats(),
+        "cluster": _relay_cluster.stats() if _relay_cluster is not None else None,
+    }
+
+
 # ===========================================================
 # Helpers
 # ===========================================================
@@ -785,5 +1044,11 @@ def _user_to_response(user: dict) -> UserResponse:
 # ===========================================================
 if __name__ == "__main__":
     import uvicorn
-    from config import API_HOST, API_PORT
-    uvicorn.run(app, host=API_HOST, port=API_PORT)
+    from config import API_HOST, API_PORT, API_WORKERS
+    if API_WORKERS > 1 and RELAY_BUS_URL:
+        # 워커 = 릴레이 노드 (에이전트/매니저가 다른 워커에 접속해도 버스로 중계)
+        uvicorn.run("main:app", host=API_HOST, port=API_PORT, workers=API_WORKERS)
+    else:
+        if API_WORKERS > 1:
+            print("[Init] API_WORKERS > 1은 RELAY_BUS_URL 설정 필요 — 단일 워커로 실행")
+        uvicorn.run(app, host=API_HOST, port=API_PORT)
@@ -0,0 +1,362 @@
+"""릴레이 라우팅 버스 — 다중 프로세스/노드 릴레이의 채널 pub/sub 전송 계층
+
+URL로 구현 선택 (config.RELAY_BUS_URL):
+    memory://[name]                  프로세스 내 (테스트, 단일 프로세스 다중 노드 시뮬레이션)
+    unix:///run/wellcom-relay.sock   로컬 소켓 브로커 (같은 머신의 uvicorn 워커 간)
+    redis://host:6379/0              Redis 호환 pub/sub (Redis/Valkey/KeyDB — 다중 머신)
+
+로컬 소켓 브로커는 별도 프로세스로 실행:
+    python relay_bus.py --socket /run/wellcom-relay.sock
+
+메시지는 (channel: str, data: bytes). 노드는 시작 시 고정 채널 목록을 구독하고
+(relay_cluster: presence + 자기 노드 수신함) 연결이 끊기면 재접속 후 재구독한다.
+"""
+import asyncio
+import os
+import struct
+from typing import Callable, Iterable, Optional
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import ConnectionError as RedisConnectionError
+    from redis.exceptions import TimeoutError as RedisTimeoutError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# 로컬 소켓 프레임: [4B 길이][1B op][2B 채널 길이][채널][데이터] (길이 = op 이후 전체)
+_FRAME = struct.Struct(">IBH")
+_OP_SUB = 1
+_OP_PUB = 2
+_OP_MSG = 3
+
+BROKER_MAX_BUFFER = 64 * 1024 * 1024    # 브로커 → 클라이언트 송신 버퍼 상한 (초과 시 드롭)
+RECONNECT_DELAY_MAX = 10                # 재접속 백오프 상한 (초)
+
+
+class RelayBus:
+    """채널 pub/sub 인터페이스
+
+    handler(channel, data)는 이벤트 루프에서 동기 호출 — 내부에서 await하지 말 것
+    (SendQueue enqueue만 수행).
+    """
+
+    def __init__(self):
+        self._handler: Optional[Callable[[str, bytes], None]] = None
+        self._channels: tuple = ()
+        # 통계
+        self.published = 0
+        self.published_bytes = 0
+        self.received = 0
+        self.errors = 0
+
+    async def start(self, channels: Iterable[str], handler: Callable[[str, bytes], None]):
+        self._channels = tuple(channels)
+        self._handler = handler
+        await self._connect()
+
+    async def publish(self, channel: str, data: bytes):
+        """발행 — 전송 계층이 밀리면 대기 (상위 SendQueue가 드롭 정책 적용)"""
+        await self._publish(channel, data)
+        self.published += 1
+        self.published_bytes += len(data)
+
+    async def close(self):
+        pass
+
+    def _dispatch(self, channel: str, data: bytes):
+        self.received += 1
+        try:
+            self._handler(channel, data)
+        except Exception as e:
+            self.errors += 1
+            print(f"[RelayBus] 메시지 처리 오류 ({channel}): {type(e).__name__}: {e}")
+
+    async def _connect(self):
+        raise NotImplementedError
+
+    async def _publish(self, channel: str, data: bytes):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {
+            "type": type(self).__name__,
+            "published": self.published,
+            "published_bytes": self.published_bytes,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+# ───────── 프로세스 내 ─────────
+
+_MEMORY_HUBS: dict = {}     # name → {MemoryBus: channels}
+
+
+class MemoryBus(RelayBus):
+    """프로세스 내 버스 — 같은 이름의 버스 인스턴스끼리 전달 (노드 여러 개 시뮬레이션)"""
+
+    def __init__(self, name: str = "default"):
+        super().__init__()
+        self._hub = _MEMORY_HUBS.setdefault(name, {})
+
+    async def _connect(self):
+        self._hub[self] = set(self._channels)
+
+    async def _publish(self, channel: str, data: bytes):
+        loop = asyncio.get_running_loop()
+        for bus, channels in list(self._hub.items()):
+            if channel in channels:
+                # 수신 측 처리는 다음 루프 턴에 (발행 측 재진입 방지)
+                loop.call_soon(bus._dispatch, channel, data)
+        await asyncio.sleep(0)
+
+    async def close(self):
+        self._hub.pop(self, None)
+
+
+# ───────── 로컬 소켓 브로커 ─────────
+
+def _pack_frame(op: int, channel: str, data: bytes = b"") -> bytes:
+    """프레임 헤더 + 채널 (데이터는 복사 없이 별도 write)"""
+    ch = channel.encode("utf-8")
+    return _FRAME.pack(1 + 2 + len(ch) + len(data), op, len(ch)) + ch
+
+
+async def _read_frame(reader: asyncio.StreamReader):
+    """→ (op, channel, data), EOF면 IncompleteReadError"""
+    size, op, ch_len = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    body = await reader.readexactly(size - 3)
+    return op, body[:ch_len].decode("utf-8"), body[ch_len:]
+
+
+class SocketBus(RelayBus):
+    """로컬 소켓 브로커 클라이언트 (재접속 시 자동 재구독)"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self._path = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._write_lock = asyncio.Lock()
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.reconnects = 0
+
+    async def _connect(self):
+        await self._open()
+        self._task = asyncio.create_task(self._read_loop())
+
+    async def _open(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self._path)
+        for channel in self._channels:
+            self._writer.write(_pack_frame(_OP_SUB, channel))
+        await self._writer.drain()
+        self._connected.set()
+
+    async def _publish(self, channel: str, data: bytes):
+        await self._connected.wait()
+        async with self._write_lock:
+            try:
+                self._writer.write(_pack_frame(_OP_PUB, channel, data))
+                self._writer.write(data)
+                await self._writer.drain()
+            except (ConnectionError, OSError):
+                # 끊긴 소켓 — 읽기 루프가 재접속할 때까지 이후 발행은 대기 (이 메시지는 호출 측이 드롭)
+                self._connected.clear()
+                self.errors += 1
+                raise
+
+    async def _read_loop(self):
+        delay = 1
+        while True:
+            try:
+                while True:
+                    op, channel, data = await _read_frame(self._reader)
+                    if op == _OP_MSG:
+                        self._dispatch(channel, data)
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                self._connected.clear()
+                print(f"[RelayBus] 브로커 연결 끊김: {type(e).__name__} — 재접속 시도")
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    await self._open()
+                    self.reconnects += 1
+                    delay = 1
+                    break
+                except OSError:
+                    delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+        if self._writer:
+            self._writer.close()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["reconnects"] = self.reconnects
+        return stats
+
+
+class RelayBroker:
+    """로컬 소켓 브로커 — 구독 채널별로 발행 메시지를 클라이언트에 중계
+
+    느린 클라이언트는 송신 버퍼가 BROKER_MAX_BUFFER를 넘으면 메시지를 드롭
+    (브로커 메모리 상한, 노드 측 SendQueue가 먼저 드롭하므로 정상 부하에서는 발생 안 함).
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._subs: dict = {}       # channel → {StreamWriter}
+        self.messages = 0
+        self.dropped = 0
+
+    async def serve_forever(self):
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+        server = await asyncio.start_unix_server(self._client, path=self._path)
+        print(f"[RelayBroker] 대기: {self._path}")
+        async with server:
+            await server.serve_forever()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        channels = set()
+        try:
+            while True:
+                op, channel, data = await _read_frame(reader)
+                if op == _OP_SUB:
+                    channels.add(channel)
+                    self._subs.setdefault(channel, set()).add(writer)
+                elif op == _OP_PUB:
+                    self._route(channel, data)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for channel in channels:
+                subs = self._subs.get(channel)
+                if subs is not None:
+                    subs.discard(writer)
+                    if not subs:
+                        del self._subs[channel]
+            writer.close()
+
+    def _route(self, channel: str, data: bytes):
+        self.messages += 1
+        subs = self._subs.get(channel)
+        if not subs:
+            return
+        header = _pack_frame(_OP_MSG, channel, data)
+        for writer in subs:
+            if writer.transport.get_write_buffer_size() > BROKER_MAX_BUFFER:
+                self.dropped += 1
+                continue
+            writer.write(header)
+            writer.write(data)
+
+
+# ───────── Redis 호환 ─────────
+
+class RedisBus(RelayBus):
+    """Redis 호환 pub/sub (redis-py asyncio — 재접속 시 자동 재구독)"""
+
+    def __init__(self, url: str):
+        super().__init__()
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis 패키지 미설치 — pip install redis")
+        self._url = url
+        self._redis = None
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+        self.reconnects = 0
+
+    async def _connect(self):
+        self._redis = aioredis.from_url(self._url)
+        await self._subscribe()
+        self._task = asyncio.create_task(self._listen())
+
+    async def _subscribe(self):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(*self._channels)
+        except BaseException:
+            await pubsub.close()
+            raise
+        self._pubsub = pubsub
+
+    async def _publish(self, channel: str, data: bytes):
+        try:
+            await self._redis.publish(channel, data)
+        except (RedisConnectionError, RedisTimeoutError, OSError):
+            # 끊긴 연결은 풀에서 폐기됨 — 새 연결로 1회 재시도 (실패 시 호출 측이 드롭)
+            self.errors += 1
+            await self._redis.publish(channel, data)
+
+    async def _listen(self):
+        delay = 1
+        while True:
+            try:
+                async for msg in self._pubsub.listen():
+                    if msg and msg.get("type") == "message":
+                        channel = msg["channel"]
+                        if isinstance(channel, bytes):
+                            channel = channel.decode("utf-8")
+                        self._dispatch(channel, msg["data"])
+                print("[RelayBus] Redis 구독 종료 — 재접속 시도")
+            except asyncio.CancelledError:
+                return
+            except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+                print(f"[RelayBus] Redis 연결 끊김: {type(e).__name__} — 재접속 시도")
+            try:
+                await self._pubsub.close()
+            except Exception:
+                pass
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    await self._subscribe()
+                    self.reconnects += 1
+                    delay = 1
+                    break
+                except (RedisConnectionError, RedisTimeoutError, OSError):
+                    delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.close()
+        if self._redis is not None:
+            await self._redis.close()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["reconnects"] = self.reconnects
+        return stats
+
+
+def create_bus(url: str) -> RelayBus:
+    """URL → 버스 구현 (memory:// | unix:// | redis:// | rediss://)"""
+    scheme, _, rest = url.partition("://")
+    if scheme == "memory":
+        return MemoryBus(rest or "default")
+    if scheme == "unix":
+        return SocketBus(rest)
+    if scheme in ("redis", "rediss"):
+        return RedisBus(url)
+    raise ValueError(f"지원하지 않는 릴레이 버스: {url}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="WellcomSOFT 릴레이 로컬 소켓 브로커")
+    parser.add_argument("--socket", default="/run/wellcom-relay.sock")
+    args = parser.parse_args()
+    try:
+        asyncio.run(RelayBroker(args.socket).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,396 @@
+"""다중 프로세스/노드 릴레이 — relay_bus 위의 노드 간 라우팅
+
+각 노드(uvicorn 워커 또는 서버)는 자신에게 접속한 에이전트/매니저만 직접 보유하고,
+다른 노드의 에이전트는 presence 방송으로 디렉터리(소유자/접속 정보)만 유지한다.
+
+- 채널: relay:presence (전 노드 방송), relay:node:<node_id> (노드 수신함)
+- 에이전트 → 원격 매니저: 에이전트 노드는 원격 노드를 '매니저 1개'로 취급
+    JSON   — 해당 소유자(또는 관리자) 매니저가 있는 노드에만 1회 전달
+    바이너리 — 노드 프록시(RelayPeer)가 RelaySubscriptions 구독자로 등록되어
+               구독한 노드에만 1회 전달
+  수신 노드는 로컬 에이전트와 같은 경로로 자기 매니저들에게 팬아웃한다.
+- 매니저 → 원격 에이전트: 매니저 노드가 권한/구독을 처리한 뒤 에이전트 노드로
+  전달하고, 에이전트 노드는 송신 노드 프록시를 구독자로 등록 (stop_* 생략 규칙 동일)
+- 노드 프록시 송신은 SendQueue 재사용 → 느린 노드/버스에도 같은 드롭 정책
+- heartbeat(전체 스냅샷)로 신규 노드 동기화, 응답 없는 노드는 만료 처리
+
+버스 메시지: [1B op][32B 송신 node_id][32B agent_id][payload]
+"""
+import asyncio
+import json
+import time
+from typing import Callable, Optional
+
+from relay_queue import SendQueue
+
+PRESENCE_CHANNEL = "relay:presence"
+NODE_CHANNEL = "relay:node:{}"
+
+HEARTBEAT_INTERVAL = 5.0    # 노드 스냅샷 방송 주기 (초)
+PEER_TIMEOUT = 15.0         # heartbeat 없는 노드 만료 (초)
+PEER_QUEUE_FRAMES = 256     # 노드 프록시 큐 (여러 에이전트 프레임 집계 → 매니저 큐보다 크게)
+PEER_QUEUE_BYTES = 32 * 1024 * 1024
+
+ID_LEN = 32
+
+# 노드 간 메시지
+OP_AGENT_TEXT = 1       # 에이전트 JSON → 원격 노드 매니저
+OP_AGENT_FRAME = 2      # 에이전트 바이너리 → 원격 노드 구독 매니저
+OP_MANAGER_TEXT = 3     # 매니저 JSON → 원격 노드 에이전트 (payload = type\n JSON)
+OP_MANAGER_BYTES = 4    # 매니저 바이너리 → 원격 노드 에이전트
+OP_AGENT_UP = 5         # 에이전트 접속 (payload = {"owner", "real_ip", "ws_port"})
+OP_AGENT_DOWN = 6       # 에이전트 해제
+OP_HEARTBEAT = 7        # 노드 스냅샷 (payload = {"agents", "owners", "admin"})
+OP_BYE = 8              # 노드 종료
+
+_PREFIX_LEN = 1 + ID_LEN + ID_LEN
+
+
+def _pad(value: str) -> bytes:
+    return value.encode("utf-8")[:ID_LEN].ljust(ID_LEN, b"\x00")
+
+
+def _unpad(data) -> str:
+    return bytes(data).rstrip(b"\x00").decode("utf-8", errors="replace")
+
+
+class _BusChannel:
+    """SendQueue용 WebSocket 어댑터 — 전송을 버스 채널 발행으로 대체
+
+    WebSocket과 달리 발행 실패는 상대 종료가 아니라 일시적 버스 장애이므로
+    예외를 SendQueue로 올리지 않는다 (큐가 닫히면 heartbeat/노드 간 전달이 영구 중단).
+    해당 메시지만 드롭하고 계속 — 재접속은 버스 구현이 처리.
+    """
+
+    def __init__(self, bus, channel: str):
+        self._bus = bus
+        self._channel = channel
+        self._failing = False
+        self.errors = 0
+
+    async def send_bytes(self, data: bytes):
+        try:
+            await self._bus.publish(self._channel, data)
+        except Exception as e:
+            self.errors += 1
+            if not self._failing:
+                self._failing = True
+                print(f"[Cluster] 버스 발행 실패 ({self._channel}): {type(e).__name__}: {e} "
+                      f"— 메시지 드롭, 복구 시까지 로그 생략")
+            return
+        if self._failing:
+            self._failing = False
+            print(f"[Cluster] 버스 발행 복구 ({self._channel}, 드롭 누적 {self.errors})")
+
+    async def send_text(self, text: str):
+        await self.send_bytes(text.encode("utf-8"))
+
+
+def _bus_queue(bus, channel: str, name: str, **kwargs) -> SendQueue:
+    return SendQueue(_BusChannel(bus, channel), name, **kwargs)
+
+
+class RelayPeer:
+    """원격 노드 프록시 — 에이전트 노드 입장에서 '매니저 1개' (구독자 핸들)
+
+    send_frame()은 SendQueue와 같은 시그니처 → RelaySubscriptions 대상에 그대로 포함.
+    """
+
+    def __init__(self, cluster: "RelayCluster", node_id: str,
+                 on_gap: Optional[Callable[[str], None]] = None):
+        self.node_id = node_id
+        self._origin = cluster.origin
+        self._bus = cluster.bus
+        self._on_gap = on_gap
+        self._queue = self._new_queue()
+        self.envelope = True
+        self.agents: dict = {}      # agent_id → {"owner", "real_ip", "ws_port"}
+        self.owners: set = set()    # 매니저가 접속한 소유자
+        self.admin = False          # 관리자 매니저 접속 여부
+        self.last_seen = time.monotonic()
+
+    def _new_queue(self) -> SendQueue:
+        return _bus_queue(self._bus, NODE_CHANNEL.format(self.node_id), f"node:{self.node_id}",
+                          max_frames=PEER_QUEUE_FRAMES, max_bytes=PEER_QUEUE_BYTES,
+                          on_gap=self._on_gap)
+
+    def start(self):
+        self._queue.start()
+
+    def ensure_open(self):
+        """송신 큐가 닫혔으면 새 큐로 교체 (노드 상태는 유지)"""
+        if self._queue.closed:
+            print(f"[Cluster] 노드 송신 큐 재시작: {self.node_id}")
+            self._queue = self._new_queue()
+            self._queue.start()
+
+    async def close(self):
+        await self._queue.close()
+
+    def sees(self, owner: str) -> bool:
+        """이 노드에 해당 소유자 에이전트를 볼 매니저가 있는지"""
+        return self.admin or owner in self.owners
+
+    def send_frame(self, fwd: bytes, agent_id: str, header: int):
+        """fwd = 32B agent_id + 에이전트 바이너리 (종류별 드롭 정책은 SendQueue)"""
+        self._queue.send_frame(bytes((OP_AGENT_FRAME,)) + self._origin + fwd, agent_id, header)
+
+    def send(self, op: int, agent_id: str, payload: bytes = b""):
+        """제어성 메시지 — 드롭 없음"""
+        self._queue.send_bytes(bytes((op,)) + self._origin + _pad(agent_id) + payload)
+
+    async def wait_writable(self):
+        await self._queue.wait_writable()
+
+    def stats(self) -> dict:
+        stats = self._queue.stats()
+        stats.update(agents=len(self.agents), owners=len(self.owners), admin=self.admin,
+                     publish_errors=self._queue.ws.errors)
+        return stats
+
+
+class RelayCluster:
+    """노드 간 라우팅 + 원격 에이전트 디렉터리
+
+    main.py의 로컬 릴레이 상태는 콜백으로 갱신한다 (원격 에이전트도 로컬과 같은 경로):
+        on_agent_up(agent_id, owner, info)   원격 에이전트 접속 → 테넌트/정보 등록 + 알림
+        on_agent_down(agent_id)               원격 에이전트 해제
+        on_agent_text(agent_id, text)         원격 에이전트 JSON → 로컬 매니저 팬아웃
+        on_agent_frame(agent_id, fwd)         원격 에이전트 바이너리 → 로컬 구독 매니저
+        on_manager_text(peer, agent_id, msg_type, text)  원격 매니저 → 로컬 에이전트
+        on_manager_bytes(agent_id, data)      원격 매니저 바이너리 → 로컬 에이전트
+        on_peer_down(peer)                    노드 만료 → 구독 정리 (stop_* 대리 전송)
+        on_gap(agent_id)                      노드 프록시 델타 드롭 → 키프레임 요청
+    """
+
+    def __init__(self, bus, node_id: str, *, on_agent_up, on_agent_down,
+                 on_agent_text, on_agent_frame, on_manager_text, on_manager_bytes,
+                 on_peer_down, on_gap=None):
+        self.bus = bus
+        self.node_id = node_id
+        self.origin = _pad(node_id)
+        self._on_agent_up = on_agent_up
+        self._on_agent_down = on_agent_down
+        self._on_agent_text = on_agent_text
+        self._on_agent_frame = on_agent_frame
+        self._on_manager_text = on_manager_text
+        self._on_manager_bytes = on_manager_bytes
+        self._on_peer_down = on_peer_down
+        self._on_gap = on_gap
+
+        self._peers: dict = {}          # node_id → RelayPeer
+        self._remote_agents: dict = {}  # agent_id → RelayPeer (에이전트 보유 노드)
+        self._local_agents: dict = {}   # agent_id → {"owner", "real_ip", "ws_port"}
+        self._owners: set = set()       # 로컬 매니저 소유자 (heartbeat 방송)
+        self._admin = False
+        self._presence = _bus_queue(bus, PRESENCE_CHANNEL, "presence")
+        self._task: Optional[asyncio.Task] = None
+
+    # ──────────── 수명 ────────────
+
+    async def start(self):
+        await self.bus.start((PRESENCE_CHANNEL, NODE_CHANNEL.format(self.node_id)),
+                             self._on_bus_message)
+        self._presence.start()
+        self._task = asyncio.create_task(self._heartbeat_loop())
+        print(f"[Cluster] 노드 시작: {self.node_id} ({type(self.bus).__name__})")
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+        try:
+            await self.bus.publish(PRESENCE_CHANNEL, self._message(OP_BYE, ""))
+        except Exception:
+            pass
+        await self._presence.close()
+        for peer in list(self._peers.values()):
+            await peer.close()
+        await self.bus.close()
+
+    # ──────────── 로컬 상태 → 방송 ────────────
+
+    def agent_up(self, agent_id: str, owner: str, info: dict):
+        entry = {"owner": owner, "real_ip": info.get("real_ip", ""),
+                 "ws_port": info.get("ws_port", 21350)}
+        self._local_agents[agent_id] = entry
+        self._broadcast(OP_AGENT_UP, agent_id, entry)
+
+    def agent_down(self, agent_id: str):
+        if self._local_agents.pop(agent_id, None) is not None:
+            self._broadcast(OP_AGENT_DOWN, agent_id)
+
+    def managers_changed(self, owners: set, admin: bool):
+        """로컬 매니저 구성 변경 → 바뀐 경우에만 즉시 스냅샷 방송"""
+        if owners != self._owners or admin != self._admin:
+            self._owners = set(owners)
+            self._admin = admin
+            self._broadcast_snapshot()
+
+    # ──────────── 로컬 → 원격 전달 ────────────
+
+    def is_remote(self, agent_id: str) -> bool:
+        return agent_id in self._remote_agents
+
+    def forward_agent_text(self, agent_id: str, owner: str, text: str):
+        """로컬 에이전트 JSON → 해당 소유자 매니저가 있는 노드에 1회씩"""
+        payload = None
+        for peer in self._peers.values():
+            if peer.sees(owner):
+                if payload is None:
+                    payload = text.encode("utf-8")
+                peer.send(OP_AGENT_TEXT, agent_id, payload)
+
+    def forward_agent_bytes(self, agent_id: str, owner: str, fwd: bytes):
+        """구독 종류가 없는 에이전트 바이너리 → 해당 소유자 매니저가 있는 노드 (드롭 없음)"""
+        for peer in self._peers.values():
+            if peer.sees(owner):
+                peer.send(OP_AGENT_FRAME, agent_id, fwd[ID_LEN:])
+
+    def send_to_agent(self, agent_id: str, msg_type: str, text: str) -> bool:
+        """원격 에이전트에 제어 메시지 (에이전트 노드가 구독 갱신에 msg_type 사용)"""
+        peer = self._remote_agents.get(agent_id)
+        if peer is None:
+            return False
+        peer.send(OP_MANAGER_TEXT, agent_id, f"{msg_type}\n{text}".encode("utf-8"))
+        return True
+
+    async def send_bytes_to_agent(self, agent_id: str, data: bytes) -> bool:
+        """원격 에이전트에 바이너리 (파일 전송 등 — 노드 큐 백프레셔)"""
+        peer = self._remote_agents.get(agent_id)
+        if peer is None:
+            return False
+        peer.send(OP_MANAGER_BYTES, agent_id, data)
+        await peer.wait_writable()
+        return True
+
+    # ──────────── 버스 수신 ────────────
+
+    def _on_bus_message(self, channel: str, data: bytes):
+        if len(data) < _PREFIX_LEN:
+            return
+        op = data[0]
+        origin = _unpad(data[1:1 + ID_LEN])
+        if origin == self.node_id:
+            return
+        agent_id = _unpad(data[1 + ID_LEN:_PREFIX_LEN])
+
+        if op == OP_AGENT_FRAME:
+            self._on_agent_frame(agent_id, data[1 + ID_LEN:])
+        elif op == OP_AGENT_TEXT:
+            self._on_agent_text(agent_id, data[_PREFIX_LEN:].decode("utf-8"))
+        elif op == OP_MANAGER_TEXT:
+            peer = self._peer(origin)
+            if agent_id in self._local_agents:
+                msg_type, _, text = data[_PREFIX_LEN:].decode("utf-8").partition("\n")
+                self._on_manager_text(peer, agent_id, msg_type, text)
+        elif op == OP_MANAGER_BYTES:
+            if agent_id in self._local_agents:
+                self._on_manager_bytes(agent_id, data[_PREFIX_LEN:])
+        elif op == OP_AGENT_UP:
+            peer = self._peer(origin)
+            self._remote_up(peer, agent_id, json.loads(data[_PREFIX_LEN:]))
+        elif op == OP_AGENT_DOWN:
+            peer = self._peers.get(origin)
+            if peer is not None:
+                self._remote_down(peer, agent_id)
+        elif op == OP_HEARTBEAT:
+            known = origin in self._peers
+            self._apply_snapshot(self._peer(origin), json.loads(data[_PREFIX_LEN:]))
+            if not known:
+                # 신규 노드 — 내 스냅샷도 즉시 전달
+                self._broadcast_snapshot()
+        elif op == OP_BYE:
+            peer = self._peers.get(origin)
+            if peer is not None:
+                asyncio.ensure_future(self._drop_peer(peer, "종료"))
+
+    def _peer(self, node_id: str) -> RelayPeer:
+        peer = self._peers.get(node_id)
+        if peer is None:
+            peer = RelayPeer(self, node_id, on_gap=self._on_gap)
+            peer.start()
+            self._peers[node_id] = peer
+            print(f"[Cluster] 노드 합류: {node_id}")
+        else:
+            peer.ensure_open()
+        peer.last_seen = time.monotonic()
+        return peer
+
+    def _remote_up(self, peer: RelayPeer, agent_id: str, entry: dict):
+        if agent_id in self._local_agents:
+            return      # 로컬 연결 우선
+        prev = self._remote_agents.get(agent_id)
+        if prev is not None and prev is not peer:
+            prev.agents.pop(agent_id, None)
+        peer.agents[agent_id] = entry
+        self._remote_agents[agent_id] = peer
+        self._on_agent_up(agent_id, entry.get("owner", ""), entry)
+
+    def _remote_down(self, peer: RelayPeer, agent_id: str):
+        if peer.agents.pop(agent_id, None) is None:
+            return
+        if self._remote_agents.get(agent_id) is peer:
+            del self._remote_agents[agent_id]
+            self._on_agent_down(agent_id)
+
+    def _apply_snapshot(self, peer: RelayPeer, snapshot: dict):
+        peer.owners = set(snapshot.get("owners", ()))
+        peer.admin = bool(snapshot.get("admin"))
+        agents = snapshot.get("agents", {})
+        for agent_id in [a for a in peer.agents if a not in agents]:
+            self._remote_down(peer, agent_id)
+        for agent_id, entry in agents.items():
+            if peer.agents.get(agent_id) != entry:
+                self._remote_up(peer, agent_id, entry)
+
+    async def _drop_peer(self, peer: RelayPeer, reason: str):
+        if self._peers.get(peer.node_id) is not peer:
+            return
+        del self._peers[peer.node_id]
+        for agent_id in list(peer.agents):
+            self._remote_down(peer, agent_id)
+        self._on_peer_down(peer)
+        await peer.close()
+        print(f"[Cluster] 노드 이탈: {peer.node_id} ({reason})")
+
+    # ──────────── 방송 ────────────
+
+    def _message(self, op: int, agent_id: str, payload: bytes = b"") -> bytes:
+        return bytes((op,)) + self.origin + _pad(agent_id) + payload
+
+    def _broadcast(self, op: int, agent_id: str, body: Optional[dict] = None):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        if self._presence.closed:
+            print("[Cluster] presence 송신 큐 재시작")
+            self._presence = _bus_queue(self.bus, PRESENCE_CHANNEL, "presence")
+            self._presence.start()
+        self._presence.send_bytes(self._message(op, agent_id, payload))
+
+    def _broadcast_snapshot(self):
+        self._broadcast(OP_HEARTBEAT, "", {
+            "agents": self._local_agents,
+            "owners": sorted(self._owners),
+            "admin": self._admin,
+        })
+
+    async def _heartbeat_loop(self):
+        try:
+            while True:
+                self._broadcast_snapshot()
+                await asyncio.sleep(HEARTBEAT_INTERVAL)
+                now = time.monotonic()
+                for peer in list(self._peers.values()):
+                    if now - peer.last_seen > PEER_TIMEOUT:
+                        await self._drop_peer(peer, "heartbeat 만료")
+        except asyncio.CancelledError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "node_id": self.node_id,
+            "bus": self.bus.stats(),
+            "local_agents": len(self._local_agents),
+            "remote_agents": len(self._remote_agents),
+            "presence_publish_errors": self._presence.ws.errors,
+            "peers": [p.stats() for p in self._peers.values()],
+        }
@@ -0,0 +1,254 @@
+"""릴레이 라우팅 상태 — 소유자(테넌트) 인덱스 + 매니저별 구독 (agent_id × 스트림 종류)
+
+RelayTenants: JWT sub(소유자) 기준으로 에이전트/매니저를 묶어 에이전트 트래픽을
+같은 소유자의 매니저(+관리자)에게만 전달하고, 다른 소유자 에이전트 제어를 차단.
+
+RelaySubscriptions:
+에이전트 → 매니저 바이너리 프레임을 모든 매니저에게 브로드캐스트하는 대신
+해당 에이전트의 해당 스트림을 요청한 매니저에게만 전달한다.
+구독은 매니저 → 에이전트 제어 메시지(start_stream 등)에서 자동 도출.
+
+릴레이 에이전트는 매니저를 구분하지 않으므로(manager_id='relay') 스트림은
+에이전트당 1개를 공유한다. 다른 매니저가 아직 시청 중이면 stop_* 메시지를
+에이전트에 전달하지 않고, 마지막 구독자가 나가면 릴레이가 stop_*을 대신 보낸다.
+
+텍스트 envelope: 제어 메시지 라우팅 정보를 접두어로 분리 → JSON 원문 그대로 전달.
+"""
+from collections import defaultdict
+
+# 스트림 종류
+KIND_THUMBNAIL = "thumbnail"
+KIND_STREAM = "stream"
+KIND_AUDIO = "audio"
+
+# 바이너리 헤더 (에이전트 프로토콜) → 스트림 종류
+HEADER_KINDS = {
+    0x01: KIND_THUMBNAIL,   # 썸네일
+    0x02: KIND_STREAM,      # MJPEG
+    0x03: KIND_STREAM,      # H.264 키프레임
+    0x04: KIND_STREAM,      # H.264 델타
+    0x05: KIND_AUDIO,       # 오디오
+    0x06: KIND_STREAM,      # MJPEG 패치
+}
+
+# 매니저 제어 메시지 → 구독 변경
+SUBSCRIBE_MESSAGES = {
+    "start_stream": KIND_STREAM,
+    "start_thumbnail_push": KIND_THUMBNAIL,
+    "start_audio": KIND_AUDIO,
+}
+UNSUBSCRIBE_MESSAGES = {
+    "stop_stream": KIND_STREAM,
+    "stop_thumbnail_push": KIND_THUMBNAIL,
+    "stop_audio": KIND_AUDIO,
+}
+ONESHOT_MESSAGES = {
+    "request_thumbnail": KIND_THUMBNAIL,   # 다음 썸네일 1회만 전달
+}
+STOP_MESSAGE = {kind: msg_type for msg_type, kind in UNSUBSCRIBE_MESSAGES.items()}
+
+
+def frame_kind(data: bytes):
+    """에이전트 바이너리 프레임 → 스트림 종류 (알 수 없으면 None)"""
+    return HEADER_KINDS.get(data[0]) if data else None
+
+
+# ───────── 텍스트 envelope ─────────
+# 바이너리의 32B agent_id 접두어처럼 텍스트 제어 메시지의 라우팅 정보를
+# JSON 밖으로 분리: "@<agent_id>\t<type>\n<JSON 원문>"
+# 릴레이는 JSON을 파싱/재직렬화하지 않고 원문을 그대로 전달한다.
+# (JSON 텍스트는 '{'로 시작하므로 '@'로 구분, 매니저가 접속 시 ?envelope=1로 협상)
+ENVELOPE_MARK = "@"
+
+
+def pack_envelope(agent_id: str, payload: str, msg_type: str = "") -> str:
+    return f"{ENVELOPE_MARK}{agent_id}\t{msg_type}\n{payload}"
+
+
+def unpack_envelope(text: str):
+    """envelope → (agent_id, msg_type, payload), envelope가 아니면 None"""
+    if not text.startswith(ENVELOPE_MARK):
+        return None
+    head, sep, payload = text.partition("\n")
+    if not sep:
+        return None
+    agent_id, _, msg_type = head[1:].partition("\t")
+    return agent_id, msg_type, payload
+
+
+class RelaySubscriptions:
+    """(agent_id, 스트림 종류) → 구독 매니저 WebSocket 집합"""
+
+    def __init__(self):
+        self._subs: dict = defaultdict(set)     # (agent_id, kind) → {ws}
+        self._once: dict = defaultdict(set)     # (agent_id, kind) → {ws} (1회 전달)
+        self._by_manager: dict = defaultdict(set)  # ws → {(agent_id, kind)}
+
+    def apply_control(self, ws, agent_id: str, msg_type: str) -> bool:
+        """매니저 → 에이전트 제어 메시지로 구독 갱신
+
+        Returns:
+            True = 에이전트에 전달, False = 전달 생략 (다른 매니저가 아직 시청 중인 stop_*)
+        """
+        kind = SUBSCRIBE_MESSAGES.get(msg_type)
+        if kind:
+            self.subscribe(ws, agent_id, kind)
+            return True
+        kind = ONESHOT_MESSAGES.get(msg_type)
+        if kind:
+            self._once[(agent_id, kind)].add(ws)
+            return True
+        kind = UNSUBSCRIBE_MESSAGES.get(msg_type)
+        if kind:
+            return not self.unsubscribe(ws, agent_id, kind)
+        return True
+
+    def subscribe(self, ws, agent_id: str, kind: str):
+        self._subs[(agent_id, kind)].add(ws)
+        self._by_manager[ws].add((agent_id, kind))
+
+    def unsubscribe(self, ws, agent_id: str, kind: str) -> bool:
+        """구독 해제 — 남은 구독자가 있으면 True"""
+        key = (agent_id, kind)
+        subs = self._subs.get(key)
+        if subs is not None:
+            subs.discard(ws)
+            if not subs:
+                del self._subs[key]
+        keys = self._by_manager.get(ws)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_manager[ws]
+        return bool(self._subs.get(key))
+
+    def targets(self, agent_id: str, kind: str) -> list:
+        """프레임 수신 대상 매니저 (1회 구독은 소비)"""
+        key = (agent_id, kind)
+        subs = self._subs.get(key, ())
+        once = self._once.pop(key, None)
+        if once:
+            return list(once.union(subs))
+        return list(subs)
+
+    def drop_manager(self, ws) -> list:
+        """매니저 해제 — 구독자가 0이 된 (agent_id, kind) 목록 반환 (stop 대리 전송용)"""
+        orphaned = []
+        for agent_id, kind in list(self._by_manager.pop(ws, ())):
+            key = (agent_id, kind)
+            subs = self._subs.get(key)
+            if subs is None:
+                continue
+            subs.discard(ws)
+            if not subs:
+                del self._subs[key]
+                orphaned.append(key)
+        for key in [k for k, s in self._once.items() if ws in s]:
+            self._once[key].discard(ws)
+            if not self._once[key]:
+                del self._once[key]
+        return orphaned
+
+    def drop_agent(self, agent_id: str):
+        """에이전트 해제 — 해당 에이전트 구독 전부 제거"""
+        for key in [k for k in self._subs if k[0] == agent_id]:
+            for ws in self._subs.pop(key):
+                keys = self._by_manager.get(ws)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._by_manager[ws]
+        for key in [k for k in self._once if k[0] == agent_id]:
+            del self._once[key]
+
+    def stats(self) -> dict:
+        return {
+            "subscriptions": sum(len(s) for s in self._subs.values()),
+            "watched_streams": len(self._subs),
+        }
+
+
+def token_owner(payload: dict) -> str:
+    """JWT payload → 소유자 키 (sub는 int/str 모두 가능 → str 통일)"""
+    owner = payload.get("user_id") or payload.get("sub")
+    return str(owner) if owner is not None else ""
+
+
+class RelayTenants:
+    """소유자(owner_id = JWT sub) → {에이전트, 매니저} 인덱스
+
+    에이전트 트래픽은 같은 소유자의 매니저와 관리자(role=admin) 매니저에게만
+    전달한다. 팬아웃 루프가 전체 매니저 대신 소유자 매니저만 순회.
+    """
+
+    def __init__(self):
+        self._agents: dict = defaultdict(set)     # owner → {agent_id}
+        self._managers: dict = defaultdict(set)   # owner → {ws}
+        self._admins: set = set()                 # 전체 열람 매니저 ws
+        self._agent_owner: dict = {}              # agent_id → owner
+        self._manager_owner: dict = {}            # ws → owner
+
+    def add_agent(self, agent_id: str, owner: str):
+        prev = self._agent_owner.get(agent_id)
+        if prev is not None and prev != owner:
+            self._discard(self._agents, prev, agent_id)
+        self._agent_owner[agent_id] = owner
+        self._agents[owner].add(agent_id)
+
+    def remove_agent(self, agent_id: str):
+        owner = self._agent_owner.pop(agent_id, None)
+        if owner is not None:
+            self._discard(self._agents, owner, agent_id)
+
+    def add_manager(self, ws, owner: str, is_admin: bool = False):
+        self._manager_owner[ws] = owner
+        self._managers[owner].add(ws)
+        if is_admin:
+            self._admins.add(ws)
+
+    def remove_manager(self, ws):
+        owner = self._manager_owner.pop(ws, None)
+        if owner is not None:
+            self._discard(self._managers, owner, ws)
+        self._admins.discard(ws)
+
+    def agent_owner(self, agent_id: str):
+        return self._agent_owner.get(agent_id)
+
+    def managers_for_agent(self, agent_id: str) -> list:
+        """에이전트 트래픽 수신 대상 (소유자 매니저 + 관리자)"""
+        owner = self._agent_owner.get(agent_id)
+        managers = self._managers.get(owner, ()) if owner is not None else ()
+        if not self._admins:
+            return list(managers)
+        return list(self._admins.union(managers))
+
+    def agents_for_manager(self, ws) -> list:
+        """매니저가 볼 수 있는 에이전트 (관리자는 전체)"""
+        if ws in self._admins:
+            return list(self._agent_owner)
+        return list(self._agents.get(self._manager_owner.get(ws), ()))
+
+    def manager_scope(self):
+        """→ (매니저가 접속한 소유자 집합, 관리자 매니저 존재 여부) — 다른 노드에 방송"""
+        return set(self._managers), bool(self._admins)
+
+    def can_access(self, ws, agent_id: str) -> bool:
+        if ws in self._admins:
+            return True
+        owner = self._manager_owner.get(ws)
+        return owner is not None and self._agent_owner.get(agent_id) == owner
+
+    @staticmethod
+    def _discard(index: dict, owner: str, item):
+        items = index.get(owner)
+        if items is not None:
+            items.discard(item)
+            if not items:
+                del index[owner]
+
+    def stats(self) -> dict:
+        return {
+            "tenants": len(set(self._agents) | set(self._managers)),
+            "admins": len(self._admins),
+        }
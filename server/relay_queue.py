@@ -0,0 +1,211 @@
+"""릴레이 연결별 송신 큐 — 느린 매니저가 에이전트 수신 루프를 막지 않도록
+
+기존에는 에이전트 수신 루프 안에서 매니저마다 send를 순차 await하여
+매니저 1개가 느리면 해당 에이전트 소켓과 다른 모든 매니저가 함께 멈췄다.
+
+- 연결마다 제한된 큐 + 전용 writer 태스크 (enqueue는 await 없음)
+- 큐 포화 시 프레임 종류별 드롭 정책:
+    제어 JSON / 알 수 없는 바이너리 → 드롭 없음
+    키프레임 (H.264 0x03, MJPEG 전체 0x02) → 유지, 대기 중인 이전 스트림 프레임을 대체
+    델타 (H.264 0x04, MJPEG 패치 0x06) → 드롭, 다음 키프레임까지 후속 델타도 드롭
+        (디코딩 불가 프레임 전송 방지) + on_gap 콜백으로 키프레임 요청
+    썸네일 0x01 → 에이전트별 최신 1개만 유지
+    오디오 0x05 → 포화 시 드롭
+- 연결별 통계: 큐 깊이/최대 깊이/전송/종류별 드롭
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Optional
+
+RELAY_QUEUE_FRAMES = 64                 # 큐 최대 프레임 수 (드롭 기준)
+RELAY_QUEUE_BYTES = 8 * 1024 * 1024     # 큐 최대 바이트 (드롭/백프레셔 기준)
+
+# 프레임 분류
+CLASS_CONTROL = "control"
+CLASS_KEY = "key"
+CLASS_DELTA = "delta"
+CLASS_THUMBNAIL = "thumbnail"
+CLASS_AUDIO = "audio"
+
+FRAME_CLASSES = {
+    0x01: CLASS_THUMBNAIL,
+    0x02: CLASS_KEY,        # MJPEG 전체 프레임
+    0x03: CLASS_KEY,        # H.264 키프레임
+    0x04: CLASS_DELTA,      # H.264 델타
+    0x05: CLASS_AUDIO,
+    0x06: CLASS_DELTA,      # MJPEG 패치 (마지막 전체 프레임 기준)
+}
+_STREAM_CLASSES = (CLASS_KEY, CLASS_DELTA)
+
+
+class SendQueue:
+    """연결 1개의 송신 큐 + writer 태스크
+
+    Args:
+        ws: FastAPI WebSocket
+        name: 통계/로그용 이름 (agent_id 또는 manager 식별자)
+        max_frames / max_bytes: 드롭 정책 적용 기준
+        on_gap: 델타 드롭으로 스트림이 끊긴 에이전트 통지 (agent_id) → 키프레임 요청용
+    """
+
+    def __init__(self, ws, name: str, max_frames: int = RELAY_QUEUE_FRAMES,
+                 max_bytes: int = RELAY_QUEUE_BYTES,
+                 on_gap: Optional[Callable[[str], None]] = None):
+        self.ws = ws
+        self.name = name
+        self._max_frames = max_frames
+        self._max_bytes = max_bytes
+        self._on_gap = on_gap
+        self._queue: deque = deque()    # [class, agent_id, payload(str | bytes)]
+        self._bytes = 0
+        self._gaps: set = set()         # 키프레임 대기 중인 agent_id
+        self._event = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.envelope = False           # 텍스트 envelope 협상 여부 (relay_hub.pack_envelope)
+
+        # 통계
+        self.connected_at = time.time()
+        self.sent = 0
+        self.sent_bytes = 0
+        self.max_depth = 0
+        self.dropped: dict = {}         # class → 드롭 수
+
+    # ──────────── 수명 ────────────
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        self.closed = True
+        self._queue.clear()
+        self._bytes = 0
+        self._writable.set()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    # ──────────── enqueue (await 없음) ────────────
+
+    def send_text(self, text: str):
+        """제어 JSON — 드롭 없음"""
+        self._push(CLASS_CONTROL, None, text)
+
+    def send_bytes(self, data: bytes):
+        """제어성 바이너리 (파일/클립보드 등) — 드롭 없음, 대량 전송은 wait_writable()로 조절"""
+        self._push(CLASS_CONTROL, None, data)
+
+    def send_frame(self, data: bytes, agent_id: str, header: int):
+        """에이전트 바이너리 프레임 — 종류별 드롭 정책 적용
+
+        Args:
+            data: 전송 바이트 (릴레이 agent_id 접두어 포함 가능)
+            header: 프레임 헤더 (0x01~0x06)
+        """
+        cls = FRAME_CLASSES.get(header, CLASS_CONTROL)
+        if cls == CLASS_KEY:
+            # 대기 중인 이전 스트림 프레임은 키프레임으로 대체됨
+            self._purge(agent_id, _STREAM_CLASSES)
+            self._gaps.discard(agent_id)
+        elif cls == CLASS_DELTA:
+            if agent_id in self._gaps:
+                self._count_drop(cls)
+                return
+            if self._full():
+                self._count_drop(cls)
+                self._gaps.add(agent_id)
+                if self._on_gap:
+                    self._on_gap(agent_id)
+                return
+        elif cls == CLASS_THUMBNAIL:
+            self._purge(agent_id, (CLASS_THUMBNAIL,))
+        elif cls == CLASS_AUDIO:
+            if self._full():
+                self._count_drop(cls)
+                return
+        self._push(cls, agent_id, data)
+
+    async def wait_writable(self):
+        """바이트 상한 이하가 될 때까지 대기 (드롭 불가 대량 전송의 백프레셔)"""
+        while not self.closed and self._bytes > self._max_bytes:
+            self._writable.clear()
+            await self._writable.wait()
+
+    # ──────────── 내부 ────────────
+
+    def _full(self) -> bool:
+        return len(self._queue) >= self._max_frames or self._bytes >= self._max_bytes
+
+    def _push(self, cls: str, agent_id, payload):
+        if self.closed:
+            return
+        self._queue.append((cls, agent_id, payload))
+        self._bytes += len(payload)
+        if len(self._queue) > self.max_depth:
+            self.max_depth = len(self._queue)
+        self._event.set()
+
+    def _purge(self, agent_id: str, classes: tuple):
+        """대기 중인 같은 에이전트의 해당 종류 프레임 제거 (최신 프레임으로 대체)"""
+        if not self._queue:
+            return
+        kept = deque()
+        for item in self._queue:
+            if item[1] == agent_id and item[0] in classes:
+                self._bytes -= len(item[2])
+                self._count_drop(item[0])
+            else:
+                kept.append(item)
+        self._queue = kept
+
+    def _count_drop(self, cls: str):
+        self.dropped[cls] = self.dropped.get(cls, 0) + 1
+
+    async def _run(self):
+        """writer 태스크 — 큐 순서대로 전송, 전송 실패 시 연결 종료 처리"""
+        try:
+            while True:
+                while not self._queue:
+                    self._event.clear()
+                    await self._event.wait()
+                cls, agent_id, payload = self._queue.popleft()
+                self._bytes -= len(payload)
+                if self._bytes <= self._max_bytes:
+                    self._writable.set()
+                if isinstance(payload, str):
+                    await self.ws.send_text(payload)
+                else:
+                    await self.ws.send_bytes(payload)
+                self.sent += 1
+                self.sent_bytes += len(payload)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # 상대 연결 종료 — 수신 루프가 정리
+            self.closed = True
+            self._queue.clear()
+            self._bytes = 0
+            self._writable.set()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "depth": len(self._queue),
+            "queued_bytes": self._bytes,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "sent_bytes": self.sent_bytes,
+            "dropped": dict(self.dropped),
+            "waiting_keyframe": sorted(self._gaps),
+            "uptime": round(time.time() - self.connected_at),
+        }
@@ -0,0 +1,115 @@
+"""릴레이 클러스터 — 버스 발행 실패 후에도 heartbeat/노드 간 전달이 계속되는지
+
+실행: python -m pytest server/tests
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import relay_cluster  # noqa: E402
+from relay_bus import MemoryBus  # noqa: E402
+from relay_cluster import NODE_CHANNEL, PRESENCE_CHANNEL, RelayCluster  # noqa: E402
+
+
+class FlakyBus(MemoryBus):
+    """채널별 처음 fail_first번 발행은 실패 (Redis 순간 끊김/브로커 소켓 드롭 재현)"""
+
+    def __init__(self, name: str, fail_first: int = 1):
+        super().__init__(name)
+        self._fail_left: dict = {}
+        self._fail_first = fail_first
+
+    async def _publish(self, channel: str, data: bytes):
+        left = self._fail_left.setdefault(channel, self._fail_first)
+        if left > 0:
+            self._fail_left[channel] = left - 1
+            raise ConnectionError("bus down")
+        await super()._publish(channel, data)
+
+
+def _cluster(bus, node_id: str, received: list) -> RelayCluster:
+    noop = lambda *a: None  # noqa: E731
+    return RelayCluster(
+        bus, node_id,
+        on_agent_up=noop, on_agent_down=noop,
+        on_agent_text=lambda agent_id, text: received.append((agent_id, text)),
+        on_agent_frame=noop, on_manager_text=noop, on_manager_bytes=noop,
+        on_peer_down=noop,
+    )
+
+
+async def _wait_for(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+def test_publish_failure_does_not_stop_cluster(monkeypatch):
+    monkeypatch.setattr(relay_cluster, "HEARTBEAT_INTERVAL", 0.05)
+
+    async def scenario():
+        received_a, received_b = [], []
+        a = _cluster(FlakyBus("flaky-test", fail_first=1), "node-a", received_a)
+        b = _cluster(MemoryBus("flaky-test"), "node-b", received_b)
+        await a.start()
+        await b.start()
+        try:
+            # 첫 presence 발행 실패 → 이후 heartbeat로 B가 A를 발견
+            assert await _wait_for(lambda: "node-a" in b._peers)
+            assert not a._presence.closed
+            assert a.stats()["presence_publish_errors"] == 1
+
+            # B 매니저 접속 → A가 B를 소유자 o1 노드로 인식
+            b.managers_changed({"o1"}, False)
+            assert await _wait_for(lambda: "node-b" in a._peers and a._peers["node-b"].sees("o1"))
+
+            # A → B 노드 채널 첫 발행 실패 (메시지 1건 드롭) — 큐는 유지되고 다음 메시지 전달
+            a.forward_agent_text("agent-1", "o1", '{"type": "first"}')
+            a.forward_agent_text("agent-1", "o1", '{"type": "second"}')
+            assert await _wait_for(lambda: received_b)
+            peer = a._peers["node-b"]
+            assert not peer._queue.closed
+            assert peer.stats()["publish_errors"] == 1
+            assert received_b == [("agent-1", '{"type": "second"}')]
+
+            # heartbeat는 계속 — B가 A를 만료시키지 않음
+            seen = b._peers["node-a"].last_seen
+            assert await _wait_for(lambda: b._peers["node-a"].last_seen > seen)
+        finally:
+            await a.close()
+            await b.close()
+
+    asyncio.run(scenario())
+
+
+def test_closed_queues_are_rebuilt():
+    async def scenario():
+        bus = MemoryBus("rebuild-test")
+        received = []
+        node = _cluster(bus, "node-a", received)
+        await node.start()
+        try:
+            listener = MemoryBus("rebuild-test")
+            got = []
+            await listener.start((PRESENCE_CHANNEL, NODE_CHANNEL.format("node-b")),
+                                 lambda channel, data: got.append(channel))
+
+            await node._presence.close()
+            node.agent_up("agent-1", "o1", {})
+            assert await _wait_for(lambda: PRESENCE_CHANNEL in got)
+
+            peer = node._peer("node-b")
+            await peer._queue.close()
+            node._peer("node-b")        # 다음 수신 시 재시작
+            peer.send(relay_cluster.OP_AGENT_TEXT, "agent-1", b"{}")
+            assert await _wait_for(lambda: NODE_CHANNEL.format("node-b") in got)
+            await listener.close()
+        finally:
+            await node.close()
+
+    asyncio.run(scenario())
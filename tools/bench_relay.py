@@ -0,0 +1,559 @@
+"""
+서버 릴레이 처리량/지연 벤치마크 — 가상 에이전트 K개 + 가상 매니저 M개
+
+사용법:
+    python tools/bench_relay.py                                  # 로컬 서버 자동 실행, 기본 부하
+    python tools/bench_relay.py --agents 50 --managers 10 --profile h264 --fps 20
+    python tools/bench_relay.py --profile mixed --duration 30 --json result.json
+    python tools/bench_relay.py --nodes 2 --bus unix:///tmp/wellcom-bench.sock   # 다중 노드
+    python tools/bench_relay.py --url ws://127.0.0.1:4797 --secret <JWT_SECRET>  # 실행 중 서버
+
+로컬 실행 시 server/main.py 앱을 별도 프로세스(uvicorn)로 띄우고 DB 테이블
+초기화(startup_init)를 생략, 매니저 접속 시 사용자 조회(get_user_by_token)는
+토큰 클레임으로 대체한다 — 그 외 릴레이 경로는 DB를 쓰지 않는다.
+(--url로 실행 중인 서버를 측정할 때는 토큰 sub(id=1) 사용자가 DB에 있어야 함)
+--nodes N이면 노드마다 서버 프로세스를 띄워 같은 버스(RELAY_BUS_URL)로 묶고
+에이전트/매니저를 노드에 번갈아 배정한다 (unix:// 버스는 브로커도 자동 실행).
+
+가상 에이전트는 start_stream/start_thumbnail_push를 받으면 프로필 크기의
+바이너리 프레임을 지정 FPS로 보내고(전송 시각 포함), ping에는 pong으로 응답한다.
+가상 매니저는 담당 에이전트를 시청하며 프레임 지연과 제어 왕복 시간을 측정한다.
+
+측정 항목 (워밍업 이후 구간):
+    프레임 지연 (에이전트 → 릴레이 → 매니저) p50/p90/p99/max — 프레임 종류별
+    제어 왕복 (매니저 → 에이전트 → 매니저, ping/pong)
+    송신/수신 FPS, 드롭률 (시청자 수 × 송신 대비 미수신)
+    서버 CPU (코어 %, 연결당), RSS 시작/최대/종료 (메모리 증가)
+--json으로 결과를 저장해 최적화 전후 회귀 비교에 사용한다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SERVER_DIR = PROJECT_ROOT / "server"
+
+AGENT_ID_LEN = 32
+# [1B 헤더][4B 에이전트 번호][8B 전송 시각 ns] + 채움
+STAMP = struct.Struct(">BIQ")
+
+HEADER_THUMBNAIL = 0x01
+HEADER_STREAM = 0x02
+HEADER_H264_KEYFRAME = 0x03
+HEADER_H264_DELTA = 0x04
+FRAME_NAMES = {
+    HEADER_THUMBNAIL: "thumbnail",
+    HEADER_STREAM: "mjpeg",
+    HEADER_H264_KEYFRAME: "h264-key",
+    HEADER_H264_DELTA: "h264-delta",
+}
+
+# 프로필별 프레임 크기 (bytes) — 1080p 실측 평균 근사
+PROFILES = {
+    "thumbnail": {"thumbnail": 18_000},
+    "mjpeg": {"mjpeg": 90_000},
+    "h264": {"key": 60_000, "delta": 9_000, "gop": 2.0},   # gop = 키프레임 간격 (초)
+    "mixed": {"thumbnail": 18_000, "key": 60_000, "delta": 9_000, "gop": 2.0},
+}
+
+# 서버 프로세스 (DB 초기화 생략, 릴레이만)
+_SERVER_BOOTSTRAP = """
+import sys
+sys.path.insert(0, {server_dir!r})
+import uvicorn
+import main
+main.app.router.on_startup.remove(main.startup_init)
+if hasattr(main, "get_user_by_token"):
+    def _bench_user(token):
+        payload = main.decode_token(token)
+        return {{"id": payload["sub"], "username": payload.get("username", ""),
+                "role": payload.get("role", "user"), "is_active": True}}
+    main.get_user_by_token = _bench_user
+uvicorn.run(main.app, host="127.0.0.1", port={port}, log_level="warning", ws_max_size=64 * 1024 * 1024)
+"""
+
+
+# ==================== 통계 ====================
+
+def _percentiles(samples: list) -> dict:
+    if not samples:
+        return {"n": 0}
+    s = sorted(samples)
+    pick = lambda q: s[min(len(s) - 1, int(q * len(s)))]
+    return {
+        "n": len(s),
+        "p50": round(pick(0.50), 2),
+        "p90": round(pick(0.90), 2),
+        "p99": round(pick(0.99), 2),
+        "max": round(s[-1], 2),
+    }
+
+
+class Stats:
+    """측정 구간 누적 (워밍업 종료 시 reset)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.sent = {}              # 프레임 종류 → 송신 수
+        self.expected = {}          # 프레임 종류 → 시청자 수 × 송신
+        self.received = {}          # 프레임 종류 → 수신 수
+        self.latency = {}           # 프레임 종류 → [ms]
+        self.rtt = []               # 제어 왕복 [ms]
+        self.sent_bytes = 0
+        self.received_bytes = 0
+
+    def on_sent(self, header: int, size: int, watchers: int):
+        name = FRAME_NAMES[header]
+        self.sent[name] = self.sent.get(name, 0) + 1
+        self.expected[name] = self.expected.get(name, 0) + watchers
+        self.sent_bytes += size
+
+    def on_received(self, header: int, size: int, sent_ns: int):
+        name = FRAME_NAMES.get(header)
+        if name is None:
+            return
+        self.received[name] = self.received.get(name, 0) + 1
+        self.latency.setdefault(name, []).append((time.perf_counter_ns() - sent_ns) / 1e6)
+        self.received_bytes += size
+
+
+# ==================== 가상 에이전트 ====================
+
+class SyntheticAgent:
+    """릴레이 에이전트 흉내 — 구독 요청에 따라 프레임 송신"""
+
+    def __init__(self, index: int, url: str, token: str, args, stats: Stats):
+        self.index = index
+        self.agent_id = f"bench-agent-{index:04d}"
+        self._url = f"{url}/ws/agent?token={token}"
+        self._args = args
+        self._stats = stats
+        self._ws = None
+        self._stream_task = None
+        self._thumb_task = None
+        self._force_key = True
+        self.watchers = {"stream": 0, "thumbnail": 0}   # 시청 매니저 수 (드롭률 계산용)
+
+    async def run(self, ready: asyncio.Event):
+        async with websockets.connect(self._url, max_size=None, ping_interval=None) as ws:
+            self._ws = ws
+            await ws.send(json.dumps({"type": "auth", "agent_id": self.agent_id}))
+            await ws.recv()     # relay_ok
+            ready.set()
+            try:
+                async for message in ws:
+                    if isinstance(message, str):
+                        self._on_control(json.loads(message))
+            finally:
+                for task in (self._stream_task, self._thumb_task):
+                    if task:
+                        task.cancel()
+
+    def _on_control(self, msg: dict):
+        msg_type = msg.get("type")
+        if msg_type == "start_stream":
+            self.watchers["stream"] += 1
+            self._force_key = True
+            if self._stream_task is None:
+                self._stream_task = asyncio.ensure_future(self._stream_loop())
+        elif msg_type == "stop_stream":
+            self.watchers["stream"] = 0
+            if self._stream_task:
+                self._stream_task.cancel()
+                self._stream_task = None
+        elif msg_type == "start_thumbnail_push":
+            self.watchers["thumbnail"] += 1
+            if self._thumb_task is None:
+                self._thumb_task = asyncio.ensure_future(
+                    self._thumbnail_loop(float(msg.get("interval", 1.0))))
+        elif msg_type == "stop_thumbnail_push":
+            self.watchers["thumbnail"] = 0
+            if self._thumb_task:
+                self._thumb_task.cancel()
+                self._thumb_task = None
+        elif msg_type == "request_keyframe":
+            self._force_key = True
+        elif msg_type == "ping":
+            asyncio.ensure_future(self._ws.send(json.dumps({"type": "pong", "t": msg.get("t")})))
+
+    def _frame(self, header: int, size: int) -> bytes:
+        stamp = STAMP.pack(header, self.index, time.perf_counter_ns())
+        return stamp + bytes(max(0, size - STAMP.size))
+
+    async def _send(self, header: int, size: int, watchers: int):
+        await self._ws.send(self._frame(header, size))
+        self._stats.on_sent(header, size, watchers)
+
+    async def _stream_loop(self):
+        profile = PROFILES[self._args.profile]
+        interval = 1.0 / self._args.fps
+        gop = max(1, int(profile.get("gop", 0) * self._args.fps))
+        n = 0
+        # 에이전트끼리 송신 시점 분산
+        await asyncio.sleep(random.random() * interval)
+        next_at = time.perf_counter()
+        while True:
+            if "mjpeg" in profile:
+                await self._send(HEADER_STREAM, profile["mjpeg"], self.watchers["stream"])
+            elif "key" in profile:
+                if self._force_key or n % gop == 0:
+                    self._force_key = False
+                    await self._send(HEADER_H264_KEYFRAME, profile["key"], self.watchers["stream"])
+                else:
+                    await self._send(HEADER_H264_DELTA, profile["delta"], self.watchers["stream"])
+            n += 1
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+    async def _thumbnail_loop(self, interval: float):
+        size = PROFILES[self._args.profile].get("thumbnail", PROFILES["thumbnail"]["thumbnail"])
+        await asyncio.sleep(random.random() * interval)
+        while True:
+            await self._send(HEADER_THUMBNAIL, size, self.watchers["thumbnail"])
+            await asyncio.sleep(interval)
+
+
+# ==================== 가상 매니저 ====================
+
+class SyntheticManager:
+    """릴레이 매니저 흉내 — 담당 에이전트 시청 + 제어 왕복 측정"""
+
+    def __init__(self, index: int, url: str, token: str, agents: list, args, stats: Stats):
+        self.index = index
+        envelope = "" if args.legacy else "&envelope=1"
+        self._url = f"{url}/ws/manager?token={token}{envelope}"
+        self._agents = agents
+        self._args = args
+        self._stats = stats
+        self._envelope = False
+        self._seen: set = set()
+        self._ws = None
+
+    def _control(self, agent_id: str, msg: dict) -> str:
+        if self._envelope:
+            return f"@{agent_id}\t{msg['type']}\n{json.dumps(msg)}"
+        msg["target_agent"] = agent_id
+        return json.dumps(msg)
+
+    async def run(self, ready: asyncio.Event):
+        async with websockets.connect(self._url, max_size=None, ping_interval=None) as ws:
+            self._ws = ws
+            ping_task = None
+            try:
+                async for message in ws:
+                    if isinstance(message, bytes):
+                        if len(message) > AGENT_ID_LEN + STAMP.size:
+                            header, _, sent_ns = STAMP.unpack_from(message, AGENT_ID_LEN)
+                            self._stats.on_received(header, len(message), sent_ns)
+                        continue
+                    msg = self._parse(message)
+                    msg_type = msg.get("type")
+                    if msg_type == "relay_ok":
+                        self._envelope = bool(msg.get("envelope"))
+                    elif msg_type == "agent_connected":
+                        self._seen.add(msg.get("source_agent"))
+                        if ping_task is None and all(a in self._seen for a in self._agents):
+                            await self._subscribe()
+                            ready.set()
+                            ping_task = asyncio.ensure_future(self._ping_loop())
+                    elif msg_type == "pong":
+                        t = msg.get("t")
+                        if t:
+                            self._stats.rtt.append((time.perf_counter_ns() - t) / 1e6)
+            finally:
+                if ping_task:
+                    ping_task.cancel()
+
+    @staticmethod
+    def _parse(text: str) -> dict:
+        if text.startswith("@"):
+            head, _, text = text.partition("\n")
+            msg = json.loads(text)
+            msg["source_agent"] = head[1:].partition("\t")[0]
+            return msg
+        return json.loads(text)
+
+    async def _subscribe(self):
+        for agent_id in self._agents:
+            if self._args.profile != "thumbnail":
+                await self._ws.send(self._control(agent_id, {
+                    "type": "start_stream", "fps": self._args.fps, "codec": self._args.profile}))
+            if self._args.profile in ("thumbnail", "mixed"):
+                await self._ws.send(self._control(agent_id, {
+                    "type": "start_thumbnail_push", "interval": self._args.thumb_interval}))
+
+    async def _ping_loop(self):
+        while True:
+            await asyncio.sleep(self._args.ping_interval)
+            agent_id = random.choice(self._agents)
+            await self._ws.send(self._control(agent_id, {
+                "type": "ping", "t": time.perf_counter_ns()}))
+
+
+# ==================== 서버 프로세스 ====================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_servers(args) -> tuple:
+    """로컬 서버 (노드 수만큼) + 필요 시 버스 브로커 → (프로세스 목록, URL 목록)"""
+    procs, urls = [], []
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    if args.nodes > 1:
+        env["RELAY_BUS_URL"] = args.bus
+        if args.bus.startswith("unix://"):
+            procs.append(subprocess.Popen(
+                [sys.executable, str(SERVER_DIR / "relay_bus.py"), "--socket", args.bus[7:]],
+                cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL))
+            time.sleep(0.5)
+    for n in range(args.nodes):
+        port = _free_port()
+        node_env = dict(env, RELAY_NODE_ID=f"bench-node-{n}")
+        code = _SERVER_BOOTSTRAP.format(server_dir=str(SERVER_DIR), port=port)
+        # 연결별 접속/해제 로그는 생략 (오류는 stderr로 표시)
+        procs.append(subprocess.Popen([sys.executable, "-c", code], cwd=SERVER_DIR, env=node_env,
+                                      stdout=subprocess.DEVNULL))
+        urls.append(f"ws://127.0.0.1:{port}")
+    return procs, urls
+
+
+async def _wait_listening(url: str, timeout: float = 15.0):
+    host, port = url[5:].split(":")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, int(port))
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"서버 시작 대기 시간 초과: {url}")
+
+
+def _make_token(secret: str) -> str:
+    """벤치마크용 JWT (릴레이는 서명만 검증 — DB 조회 없음)"""
+    sys.path.insert(0, str(SERVER_DIR))
+    if secret:
+        os.environ["JWT_SECRET"] = secret
+    from auth import create_token
+    return create_token(1, "bench", "user")
+
+
+class _ServerProbe:
+    """서버 프로세스 CPU/RSS 샘플링 (psutil 미설치 시 생략)"""
+
+    def __init__(self, pids: list):
+        self._procs = [psutil.Process(pid) for pid in pids] if PSUTIL_AVAILABLE else []
+        self.rss_mb = []
+        self._cpu0 = 0.0
+        self._t0 = 0.0
+
+    def _cpu(self) -> float:
+        total = 0.0
+        for p in self._procs:
+            t = p.cpu_times()
+            total += t.user + t.system
+        return total
+
+    def sample(self):
+        if self._procs:
+            self.rss_mb.append(sum(p.memory_info().rss for p in self._procs) / 1e6)
+
+    def mark(self):
+        self._cpu0 = self._cpu() if self._procs else 0.0
+        self._t0 = time.perf_counter()
+        self.rss_mb = []
+        self.sample()
+
+    def report(self, connections: int) -> dict:
+        if not self._procs:
+            return {"note": "psutil 미설치 — CPU/메모리 측정 생략"}
+        elapsed = time.perf_counter() - self._t0
+        cpu_pct = (self._cpu() - self._cpu0) / elapsed * 100
+        return {
+            "cpu_pct": round(cpu_pct, 1),
+            "cpu_pct_per_connection": round(cpu_pct / max(1, connections), 3),
+            "rss_start_mb": round(self.rss_mb[0], 1),
+            "rss_peak_mb": round(max(self.rss_mb), 1),
+            "rss_end_mb": round(self.rss_mb[-1], 1),
+            "rss_growth_mb": round(self.rss_mb[-1] - self.rss_mb[0], 1),
+        }
+
+
+# ==================== 실행 ====================
+
+async def run_bench(args) -> dict:
+    procs, urls = [], [args.url] if args.url else []
+    if not args.url:
+        procs, urls = _start_servers(args)
+    server_pids = [p.pid for p in procs[-args.nodes:]] if procs else []
+    try:
+        for url in urls:
+            await _wait_listening(url)
+        if args.nodes > 1:
+            await asyncio.sleep(1.5)    # 노드 간 heartbeat 동기화
+        token = _make_token(args.secret)
+        stats = Stats()
+        tasks = []
+
+        # 에이전트 → 노드 번갈아 배정
+        agents = [SyntheticAgent(i, urls[i % len(urls)], token, args, stats)
+                  for i in range(args.agents)]
+        ready = [asyncio.Event() for _ in agents]
+        for agent, ev in zip(agents, ready):
+            tasks.append(asyncio.ensure_future(agent.run(ev)))
+        await asyncio.wait_for(asyncio.gather(*(e.wait() for e in ready)), 30)
+
+        # 매니저 → 담당 에이전트 (라운드 로빈, --watch 지정 시 매니저당 N개)
+        ids = [a.agent_id for a in agents]
+        managers = []
+        for m in range(args.managers):
+            if args.watch:
+                assigned = [ids[(m * args.watch + k) % len(ids)] for k in range(args.watch)]
+            else:
+                assigned = ids[m::args.managers]
+            if assigned:
+                managers.append(SyntheticManager(m, urls[(m + 1) % len(urls)], token,
+                                                 assigned, args, stats))
+        ready = [asyncio.Event() for _ in managers]
+        for manager, ev in zip(managers, ready):
+            tasks.append(asyncio.ensure_future(manager.run(ev)))
+        await asyncio.wait_for(asyncio.gather(*(e.wait() for e in ready)), 30)
+
+        probe = _ServerProbe(server_pids)
+        print(f"워밍업 {args.warmup:.0f}초...")
+        await asyncio.sleep(args.warmup)
+        stats.reset()
+        probe.mark()
+        print(f"측정 {args.duration:.0f}초...")
+        for _ in range(int(args.duration)):
+            await asyncio.sleep(1.0)
+            probe.sample()
+        elapsed = time.perf_counter() - stats.started
+        server = probe.report(args.agents + len(managers))
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            try:
+                p.wait(5)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+    frames = {}
+    for name in sorted(set(stats.sent) | set(stats.received)):
+        expected = stats.expected.get(name, 0)
+        received = stats.received.get(name, 0)
+        frames[name] = {
+            "sent_fps": round(stats.sent.get(name, 0) / elapsed, 1),
+            "recv_fps": round(received / elapsed, 1),
+            "drop_pct": round(max(0, expected - received) / expected * 100, 2) if expected else 0.0,
+            "latency_ms": _percentiles(stats.latency.get(name, [])),
+        }
+    return {
+        "config": {k: v for k, v in vars(args).items() if k not in ("secret", "json")},
+        "elapsed_s": round(elapsed, 1),
+        "frames": frames,
+        "control_rtt_ms": _percentiles(stats.rtt),
+        "control_rps": round(len(stats.rtt) / elapsed, 1),    # 왕복/초 (릴레이 제어 메시지 2건씩)
+        "throughput_mbps": {
+            "in": round(stats.sent_bytes * 8 / elapsed / 1e6, 1),
+            "out": round(stats.received_bytes * 8 / elapsed / 1e6, 1),
+        },
+        "server": server,
+    }
+
+
+def _print_report(result: dict):
+    cfg = result["config"]
+    print(f"\n에이전트 {cfg['agents']} / 매니저 {cfg['managers']} / 노드 {cfg['nodes']}, "
+          f"프로필 {cfg['profile']} @ {cfg['fps']}fps, {result['elapsed_s']}초")
+    print(f"{'프레임':<12}{'송신fps':>9}{'수신fps':>9}{'드롭%':>8}"
+          f"{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}  (ms)")
+    for name, f in result["frames"].items():
+        lat = f["latency_ms"]
+        print(f"{name:<12}{f['sent_fps']:>9}{f['recv_fps']:>9}{f['drop_pct']:>8}"
+              f"{lat.get('p50', '-'):>8}{lat.get('p90', '-'):>8}"
+              f"{lat.get('p99', '-'):>8}{lat.get('max', '-'):>8}")
+    rtt = result["control_rtt_ms"]
+    print(f"{'제어 RTT':<12}{'':>26}{rtt.get('p50', '-'):>8}{rtt.get('p90', '-'):>8}"
+          f"{rtt.get('p99', '-'):>8}{rtt.get('max', '-'):>8}  ({result['control_rps']}/s)")
+    tp = result["throughput_mbps"]
+    print(f"처리량: 수신 {tp['in']} Mbps → 전달 {tp['out']} Mbps")
+    server = result["server"]
+    if "cpu_pct" in server:
+        print(f"서버 CPU {server['cpu_pct']}% (연결당 {server['cpu_pct_per_connection']}%), "
+              f"RSS {server['rss_start_mb']} → {server['rss_end_mb']} MB "
+              f"(최대 {server['rss_peak_mb']}, 증가 {server['rss_growth_mb']})")
+    else:
+        print(server.get("note", ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 릴레이 처리량/지연 벤치마크")
+    parser.add_argument("--agents", type=int, default=10, help="가상 에이전트 수 (기본 10)")
+    parser.add_argument("--managers", type=int, default=2, help="가상 매니저 수 (기본 2)")
+    parser.add_argument("--watch", type=int, default=0,
+                        help="매니저당 시청 에이전트 수 (기본 0 = 에이전트를 매니저에 분배)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="h264",
+                        help="프레임 프로필 (기본 h264)")
+    parser.add_argument("--fps", type=float, default=15, help="스트림 FPS (기본 15)")
+    parser.add_argument("--thumb-interval", type=float, default=1.0, help="썸네일 주기 초 (기본 1)")
+    parser.add_argument("--ping-interval", type=float, default=0.5,
+                        help="제어 RTT 측정 주기 초 (매니저별, 작게 하면 제어 메시지 부하 측정)")
+    parser.add_argument("--duration", type=float, default=15, help="측정 시간 초 (기본 15)")
+    parser.add_argument("--warmup", type=float, default=3, help="워밍업 초 (기본 3)")
+    parser.add_argument("--legacy", action="store_true", help="envelope 미사용 (구버전 매니저)")
+    parser.add_argument("--nodes", type=int, default=1, help="로컬 서버 노드 수 (기본 1)")
+    parser.add_argument("--bus", default="unix:///tmp/wellcom-bench.sock",
+                        help="다중 노드 버스 URL (기본 로컬 소켓 브로커 자동 실행)")
+    parser.add_argument("--url", default="", help="실행 중인 서버 ws:// URL (지정 시 자동 실행 안 함)")
+    parser.add_argument("--secret", default="", help="--url 서버의 JWT_SECRET")
+    parser.add_argument("--json", default="", help="결과 JSON 저장 경로 (회귀 비교용)")
+    args = parser.parse_args()
+
+    if not WEBSOCKETS_AVAILABLE:
+        sys.exit("websockets 미설치 — pip install websockets")
+    if args.url:
+        args.nodes = 1
+
+    result = asyncio.run(run_bench(args))
+    _print_report(result)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+썸네일 파이프라인 벤치마크 — 기존(LANCZOS) vs 고속(reduce + BILINEAR)
+
+사용법:
+    python tools/bench_thumbnail.py
+    python tools/bench_thumbnail.py --width 320 --repeat 50
+
+mss 없이 임의 BGRA 버퍼로 1080p / 1440p / 4K 캡처를 흉내내어
+BGRA → RGB 변환 + 축소 + JPEG 인코딩 전체 시간을 비교한다.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+# agent/ 모듈 경로 (에이전트는 flat import 구조)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "agent"))
+
+from screen_capture import ScreenCapture  # noqa: E402
+
+RESOLUTIONS = [
+    ("1080p", 1920, 1080),
+    ("1440p", 2560, 1440),
+    ("4K", 3840, 2160),
+]
+
+
+def legacy_thumbnail(bgra: bytes, size: tuple, max_width: int, quality: int) -> bytes:
+    """v3.x 기존 경로: 전체 크기 RGB → LANCZOS → JPEG"""
+    img = Image.frombytes('RGB', size, bgra, 'raw', 'BGRX')
+    ratio = max_width / img.width
+    img = img.resize((max_width, int(img.height * ratio)), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, format='JPEG', quality=quality)
+    return buf.getvalue()
+
+
+def fast_thumbnail(bgra: bytes, size: tuple, max_width: int, quality: int) -> bytes:
+    """현재 경로: ScreenCapture.encode_thumbnail (reduce + BILINEAR)"""
+    img = Image.frombytes('RGB', size, bgra, 'raw', 'BGRX')
+    return ScreenCapture.encode_thumbnail(img, max_width, quality)
+
+
+def _measure(fn, repeat: int, *args) -> float:
+    fn(*args)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="썸네일 파이프라인 벤치마크")
+    parser.add_argument("--width", type=int, default=480, help="썸네일 너비 (기본 480)")
+    parser.add_argument("--quality", type=int, default=50, help="JPEG 품질 (기본 50)")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수 (기본 20)")
+    args = parser.parse_args()
+
+    print(f"썸네일 {args.width}px, Q={args.quality}, 반복 {args.repeat}회")
+    print(f"{'해상도':<8}{'기존(ms)':>10}{'고속(ms)':>10}{'배율':>8}")
+    for name, w, h in RESOLUTIONS:
+        bgra = os.urandom(w * h * 4)
+        legacy_ms = _measure(legacy_thumbnail, args.repeat, bgra, (w, h), args.width, args.quality)
+        fast_ms = _measure(fast_thumbnail, args.repeat, bgra, (w, h), args.width, args.quality)
+        print(f"{name:<8}{legacy_ms:>10.1f}{fast_ms:>10.1f}{legacy_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ v2.0.9: 시각적 연결 상태 + 세밀한 디버그 로그 + FPS 계측 개선
 
 import logging
 import os
+import struct
 import time
 from typing import Optional
 
@@ -16,7 +17,7 @@ from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QFileDialog, QInputDialog,
     QMessageBox, QApplication, QStatusBar, QLabel,
 )
-from PyQt6.QtCore import Qt, QByteArray, pyqtSignal, QTimer, QPoint
+from PyQt6.QtCore import Qt, QByteArray, pyqtSignal, QTimer, QPoint, QRect
 from PyQt6.QtGui import (
     QPainter, QPixmap, QKeyEvent, QMouseEvent, QWheelEvent, QFont, QColor,
     QPen, QPolygon,
@@ -26,7 +27,9 @@ from config import settings
 from core.pc_device import PCDevice
 from core.agent_server import AgentServer
 from core.multi_control import MultiControlManager
-from core.h264_decoder import H264Decoder, HEADER_H264_KEYFRAME, HEADER_H264_DELTA
+from core.h264_decoder import (
+    H264Decoder, H264DecodeWorker, HEADER_H264_KEYFRAME, HEADER_H264_DELTA,
+)
 from ui.side_menu import SideMenu
 
 logger = logging.getLogger(__name__)
@@ -57,16 +60,33 @@ class RemoteScreenWidget(QWidget):
 
     v2.0.1: Fit/Stretch 화면 비율 토글 지원
     v2.2.0: 로컬 커서 오버레이 (LinkIO처럼 즉시 반응)
+
+    스케일링 (screen.render_scaling):
+      fast   — 원본 픽스맵 유지, 그릴 때 대상 사각형으로 스케일 (프레임마다 사본 생성 없음)
+               스트리밍 중에는 빠른 변환, 프레임이 IDLE_SMOOTH_DELAY_MS 이상 멈추면
+               부드러운 스케일 캐시를 1회 만들어 사용 (커서 오버레이 repaint는 캐시 재사용)
+      smooth — 프레임마다 부드러운 스케일 (이전 방식, 화질 우선)
     """
 
     # 화면 비율 모드
     MODE_FIT = 'fit'          # 비율 유지 (레터박스)
     MODE_STRETCH = 'stretch'  # 창에 맞춤 (비율 무시)
 
+    # 스케일링 모드
+    SCALING_FAST = 'fast'
+    SCALING_SMOOTH = 'smooth'
+    IDLE_SMOOTH_DELAY_MS = 300   # 이 시간 동안 새 프레임 없으면 정지로 보고 부드러운 스케일
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._pixmap = QPixmap()
-        self._scaled_pixmap = QPixmap()  # 스케일 캐시
+        self._scaled_pixmap = QPixmap()  # 부드러운 스케일 캐시 (정지 화면/smooth 모드)
+        self._target_rect = QRect()      # 원격 화면을 그릴 위젯 내 사각형
+        self._scaling = settings.get('screen.render_scaling', self.SCALING_FAST)
+        self._idle_timer = QTimer(self)  # 실행 중 = 스트리밍 중 (빠른 변환)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(self.IDLE_SMOOTH_DELAY_MS)
+        self._idle_timer.timeout.connect(self.update)
         self._scale = 1.0
         self._scale_x = 1.0   # Stretch 모드용 X 스케일
         self._scale_y = 1.0   # Stretch 모드용 Y 스케일
@@ -98,23 +118,61 @@ class RemoteScreenWidget(QWidget):
         """화면 비율 모드 변경"""
         if mode in (self.MODE_FIT, self.MODE_STRETCH):
             self._aspect_mode = mode
-            self._rebuild_scaled()
+            self._update_geometry()
             self.update()
 
     def update_frame(self, jpeg_data: bytes):
         """JPEG 프레임 업데이트"""
         self._pixmap.loadFromData(QByteArray(jpeg_data))
-        self._rebuild_scaled()
-        self.update()
+        self._frame_changed()
+
+    def apply_patch(self, payload: bytes) -> bool:
+        """MJPEG 변경 영역 패치 합성 — 마지막 프레임 위에 변경 사각형만 덮어쓰기
+
+        페이로드: [2B w][2B h][2B count] + count × ([2B x][2B y][4B len][jpeg])
+
+        Returns:
+            False — 기준 프레임 없음/해상도 불일치/손상 (전체 프레임 재요청 필요)
+        """
+        if self._pixmap.isNull() or len(payload) < 6:
+            return False
+        frame_w, frame_h, count = struct.unpack_from('>HHH', payload, 0)
+        if (frame_w, frame_h) != (self._pixmap.width(), self._pixmap.height()):
+            return False
+
+        painter = QPainter(self._pixmap)
+        tile = QPixmap()
+        offset = 6
+        try:
+            for _ in range(count):
+                if offset + 8 > len(payload):
+                    return False
+                x, y, length = struct.unpack_from('>HHI', payload, offset)
+                offset += 8
+                if not tile.loadFromData(QByteArray(payload[offset:offset + length])):
+                    return False
+                offset += length
+                painter.drawPixmap(x, y, tile)
+        finally:
+            painter.end()
+
+        self._frame_changed()
+        return True
 
     def update_frame_qimage(self, qimage):
         """QImage 프레임 업데이트 (H.264 디코더용, v2.0.2)"""
         self._pixmap = QPixmap.fromImage(qimage)
-        self._rebuild_scaled()
+        self._frame_changed()
+
+    def _frame_changed(self):
+        """새 프레임 — 그릴 사각형 갱신 + 스케일 캐시 무효화 (스케일은 paintEvent에서)"""
+        self._update_geometry()     # 해상도 변경 대비 (산술만, 픽스맵 생성 없음)
+        self._idle_timer.start()
         self.update()
 
-    def _rebuild_scaled(self):
-        """스케일된 이미지 캐시 재생성"""
+    def _update_geometry(self):
+        """그릴 사각형/좌표 변환 스케일 계산 (스케일 캐시 무효화)"""
+        self._scaled_pixmap = QPixmap()
         if self._pixmap.isNull():
             return
         pw, ph = self._pixmap.width(), self._pixmap.height()
@@ -129,11 +187,7 @@ class RemoteScreenWidget(QWidget):
             self._scale = min(self._scale_x, self._scale_y)  # 참고용
             self._offset_x = 0
             self._offset_y = 0
-            self._scaled_pixmap = self._pixmap.scaled(
-                ww, wh,
-                Qt.AspectRatioMode.IgnoreAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
+            self._target_rect = QRect(0, 0, ww, wh)
         else:
             # Fit: 비율 유지 (레터박스)
             self._scale = min(ww / pw, wh / ph)
@@ -143,32 +197,38 @@ class RemoteScreenWidget(QWidget):
             self._offset_y = (wh - scaled_h) // 2
             self._scale_x = self._scale
             self._scale_y = self._scale
-            self._scaled_pixmap = self._pixmap.scaled(
-                ww, wh,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
+            self._target_rect = QRect(self._offset_x, self._offset_y, scaled_w, scaled_h)
 
         self._last_widget_size = (ww, wh)
 
     def map_to_remote(self, local_x: int, local_y: int, screen_w: int, screen_h: int):
-        """로컬 좌표 → 원격 좌표"""
+        """로컬 좌표 → 원격 좌표
+
+        스트림은 적응형 배율(예: 릴레이 0.75)로 축소되어 올 수 있으므로
+        위젯 → 프레임 픽셀 변환 후 프레임 크기 대비 원격 화면 크기로 다시 환산.
+        """
         if self._pixmap.isNull():
             return 0, 0
+        pw, ph = self._pixmap.width(), self._pixmap.height()
+        if screen_w <= 0 or screen_h <= 0:
+            screen_w, screen_h = pw, ph     # 원격 해상도 미확인 — 프레임 크기 기준
 
         if self._aspect_mode == self.MODE_STRETCH:
             # Stretch: 독립 스케일
             if self._scale_x == 0 or self._scale_y == 0:
                 return 0, 0
-            rx = int(local_x / self._scale_x)
-            ry = int(local_y / self._scale_y)
+            fx = local_x / self._scale_x
+            fy = local_y / self._scale_y
         else:
             # Fit: 오프셋 + 단일 스케일
             if self._scale == 0:
                 return 0, 0
-            rx = int((local_x - self._offset_x) / self._scale)
-            ry = int((local_y - self._offset_y) / self._scale)
+            fx = (local_x - self._offset_x) / self._scale
+            fy = (local_y - self._offset_y) / self._scale
 
+        # 프레임 픽셀 → 원격 화면 픽셀 (축소 스트림 보정)
+        rx = int(fx * screen_w / pw)
+        ry = int(fy * screen_h / ph)
         return max(0, min(rx, screen_w - 1)), max(0, min(ry, screen_h - 1))
 
     def set_overlay_text(self, text: str, color: str = '#FFD600'):
@@ -190,10 +250,21 @@ class RemoteScreenWidget(QWidget):
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.fillRect(self.rect(), Qt.GlobalColor.black)
-        if not self._scaled_pixmap.isNull():
-            x = (self.width() - self._scaled_pixmap.width()) // 2
-            y = (self.height() - self._scaled_pixmap.height()) // 2
-            painter.drawPixmap(x, y, self._scaled_pixmap)
+        if not self._pixmap.isNull() and not self._target_rect.isEmpty():
+            target = self._target_rect
+            if target.size() == self._pixmap.size():
+                painter.drawPixmap(target.topLeft(), self._pixmap)
+            elif self._scaling == self.SCALING_SMOOTH or not self._idle_timer.isActive():
+                if self._scaled_pixmap.isNull():
+                    self._scaled_pixmap = self._pixmap.scaled(
+                        target.size(),
+                        Qt.AspectRatioMode.IgnoreAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation,
+                    )
+                painter.drawPixmap(target.topLeft(), self._scaled_pixmap)
+            else:
+                # 스트리밍 중 — 원본에서 바로 빠른 변환 (SmoothPixmapTransform 힌트 없음)
+                painter.drawPixmap(target, self._pixmap)
 
         # v2.2.0: 로컬 커서 오버레이 — 원격 응답 기다리지 않고 즉시 표시
         if self._local_cursor_visible and self._local_cursor_pos:
@@ -244,7 +315,7 @@ class RemoteScreenWidget(QWidget):
     def resizeEvent(self, event):
         new_size = (self.width(), self.height())
         if new_size != self._last_widget_size:
-            self._rebuild_scaled()
+            self._update_geometry()
         super().resizeEvent(event)
 
 
@@ -278,18 +349,22 @@ class DesktopWidget(QMainWindow):
         self._fps_frame_count = 0    # FPS 계측용 (1초마다 리셋)
         self._total_frame_count = 0  # 누적 프레임 수 (리셋 안 함)
         self._current_fps = 0
+        self._fps_drop_count = 0     # GUI 지연으로 건너뛴 프레임 (1초마다 리셋)
+        self._total_drop_count = 0
+        self._h264_drops_seen = 0    # 현재 H.264 워커 드롭 누적 중 반영분
         self._current_quality = settings.get('screen.stream_quality', 80)
         self._current_target_fps = settings.get('screen.stream_fps', 30)
         self._is_stretch = False   # 화면 비율 모드
         self._stream_start_time = time.time()
         self._first_frame_time = 0.0
+        self._last_full_frame_request = 0.0  # MJPEG 패치 기준 프레임 재요청 쓰로틀
 
         # 연결 상태 추적 (시각 피드백용)
         self._conn_state = 'connecting'  # connecting → waiting → streaming → disconnected
         self._stream_requested = False
 
-        # v2.0.2 — H.264 디코더
-        self._h264_decoder: Optional[H264Decoder] = None
+        # v2.0.2 — H.264 디코더 (디코딩/RGB 변환은 워커 스레드, GUI는 그리기만)
+        self._h264_worker: Optional[H264DecodeWorker] = None
         self._stream_codec = 'mjpeg'  # 실제 사용 코덱 ('mjpeg' 또는 'h264')
 
         # 파일 드래그&드롭 지원
@@ -387,7 +462,6 @@ class DesktopWidget(QMainWindow):
         # 오디오 스트리밍
         self._audio_enabled = False
         self._audio_stream = None
-        self._server.audio_received.connect(self._on_audio_received)
 
         if settings.get('desktop_widget.side_menu', True):
             layout.addWidget(self._side_menu)
@@ -421,6 +495,7 @@ class DesktopWidget(QMainWindow):
         sb.setFixedHeight(26)
 
         label_style = f"color: {sb_fg}; padding: 0 6px; font-size: 11px;"
+        self._sb_fg = sb_fg
 
         # 연결 상태 인디케이터 (● 원형)
         self._conn_indicator = QLabel("● 연결 중")
@@ -440,6 +515,11 @@ class DesktopWidget(QMainWindow):
         self._fps_label.setToolTip("현재 수신 프레임레이트")
         sb.addPermanentWidget(self._fps_label)
 
+        self._drop_label = QLabel("드롭 0")
+        self._drop_label.setStyleSheet(label_style)
+        self._drop_label.setToolTip("화면 처리가 밀려 건너뛴 프레임 (초당)")
+        sb.addPermanentWidget(self._drop_label)
+
         self._quality_label = QLabel(f"Q:{self._current_quality}")
         self._quality_label.setStyleSheet(label_style)
         self._quality_label.setToolTip("스트리밍 화질 (1-100)")
@@ -481,8 +561,11 @@ class DesktopWidget(QMainWindow):
         )
 
     def _connect_signals(self):
-        self._server.screen_frame_received.connect(self._on_frame_received)
-        self._server.h264_frame_received.connect(self._on_h264_frame)
+        # 프레임은 이 에이전트 전용 시그널로만 수신 (다른 에이전트 프레임 슬롯 호출 없음)
+        self._frames = self._server.agent_frames(self._pc.agent_id)
+        self._frames.screen_ready.connect(self._on_screen_ready)
+        self._frames.h264_frame_received.connect(self._on_h264_frame)
+        self._frames.audio_received.connect(self._on_audio_received)
         self._server.stream_started.connect(self._on_stream_started)
         self._server.agent_disconnected.connect(self._on_agent_disconnected)
         self._server.connection_mode_changed.connect(self._on_connection_mode_changed)
@@ -513,9 +596,19 @@ class DesktopWidget(QMainWindow):
 
     # ==================== 프레임 수신 ====================
 
-    def _on_frame_received(self, agent_id: str, jpeg_data: bytes):
-        if agent_id != self._pc.agent_id:
-            return
+    def _on_screen_ready(self):
+        """MJPEG 우편함 처리 — 최신 전체 프레임(+이후 패치)만 디코딩, 밀린 프레임은 건너뜀"""
+        pending, dropped = self._frames.take_screen()
+        if dropped:
+            self._fps_drop_count += dropped
+            self._total_drop_count += dropped
+        for is_patch, data in pending:
+            if is_patch:
+                self._on_patch_received(data)
+            else:
+                self._on_frame_received(data)
+
+    def _on_frame_received(self, jpeg_data: bytes):
         self._screen.update_frame(jpeg_data)
         self._fps_frame_count += 1
         self._total_frame_count += 1
@@ -542,6 +635,19 @@ class DesktopWidget(QMainWindow):
             if not pix.isNull():
                 self._res_label.setText(f"{pix.width()} x {pix.height()}")
 
+    def _on_patch_received(self, payload: bytes):
+        """MJPEG 변경 영역 패치 수신 — 화면 합성"""
+        if not self._screen.apply_patch(payload):
+            # 기준 프레임 없음/불일치 — 전체 프레임 재요청 (1초 쓰로틀)
+            now = time.time()
+            if now - self._last_full_frame_request > 1.0:
+                self._last_full_frame_request = now
+                self._server.request_keyframe(self._pc.agent_id)
+                logger.debug(f"[{self._pc.name}] 패치 합성 불가 — 전체 프레임 재요청")
+            return
+        self._fps_frame_count += 1
+        self._total_frame_count += 1
+
     # ==================== 코덱 협상 (v2.0.2) ====================
 
     def _on_stream_started(self, agent_id: str, info: dict):
@@ -567,10 +673,14 @@ class DesktopWidget(QMainWindow):
         self._screen.set_overlay_text('⏳ 프레임 수신 대기...')
         self._update_conn_state('waiting')
 
+        self._close_h264_worker()
         if codec == 'h264':
-            # H.264 디코더 초기화
-            self._h264_decoder = H264Decoder()
-            if self._h264_decoder.is_available:
+            # H.264 디코딩 워커 시작
+            self._h264_worker = H264DecodeWorker(self._pc.name)
+            self._h264_drops_seen = 0
+            if self._h264_worker.is_available:
+                self._h264_worker.frame_ready.connect(self._on_h264_image)
+                self._h264_worker.keyframe_needed.connect(self._on_h264_keyframe_needed)
                 logger.info(
                     f"[{self._pc.name}] H.264 디코더 활성화 (인코더: {encoder})"
                 )
@@ -579,7 +689,7 @@ class DesktopWidget(QMainWindow):
                 logger.warning(
                     f"[{self._pc.name}] H.264 디코더 불가 — MJPEG으로 재시작"
                 )
-                self._h264_decoder = None
+                self._close_h264_worker()
                 self._stream_codec = 'mjpeg'
                 self._codec_label.setText("MJPEG")
                 self._screen.set_overlay_text('🔄 MJPEG 전환 중...')
@@ -587,7 +697,6 @@ class DesktopWidget(QMainWindow):
                 self._server.stop_streaming(self._pc.agent_id)
                 QTimer.singleShot(200, self._restart_as_mjpeg)
         else:
-            self._h264_decoder = None
             logger.info(f"[{self._pc.name}] MJPEG 스트리밍 대기 — 프레임 수신 대기")
             self._codec_label.setText("MJPEG")
 
@@ -652,9 +761,7 @@ class DesktopWidget(QMainWindow):
 
         logger.info(f"[{self._pc.name}] 연결 모드 변경: {mode} — 스트림 재시작")
         # 기존 H.264 디코더 리셋
-        if self._h264_decoder:
-            self._h264_decoder.close()
-            self._h264_decoder = None
+        self._close_h264_worker()
         self._total_frame_count = 0
         self._fps_frame_count = 0
         self._stream_start_time = time.time()
@@ -679,35 +786,53 @@ class DesktopWidget(QMainWindow):
 
     # ==================== H.264 프레임 수신 (v2.0.2) ====================
 
-    def _on_h264_frame(self, agent_id: str, header: int, raw_data: bytes):
-        """H.264 프레임 수신 → 디코딩 → QImage 렌더링"""
-        if agent_id != self._pc.agent_id:
-            return
+    def _on_h264_frame(self, header: int, raw_data: bytes):
+        """H.264 프레임 수신 → 디코딩 워커에 전달 (GUI 스레드는 enqueue만)"""
+        if self._h264_worker:
+            self._h264_worker.submit(header, raw_data)
 
-        if not self._h264_decoder:
+    def _on_h264_image(self):
+        """디코딩 워커 → 최신 QImage 렌더링 (밀린 프레임은 워커에서 이미 드롭)"""
+        if not self._h264_worker:
+            return
+        qimage = self._h264_worker.take()
+        if qimage is None:
             return
 
-        qimage = self._h264_decoder.decode_frame(header, raw_data)
-        if qimage:
-            self._screen.update_frame_qimage(qimage)
-            self._fps_frame_count += 1
-            self._total_frame_count += 1
+        self._screen.update_frame_qimage(qimage)
+        self._fps_frame_count += 1
+        self._total_frame_count += 1
 
-            if self._total_frame_count == 1:
-                self._first_frame_time = time.time()
-                elapsed = self._first_frame_time - self._stream_start_time
-                logger.info(
-                    f"[{self._pc.name}] ★ H.264 첫 프레임 수신! 대기시간={elapsed:.2f}초"
-                )
-                self._screen.set_overlay_text('')
-                self._update_conn_state('streaming')
+        if self._total_frame_count == 1:
+            self._first_frame_time = time.time()
+            elapsed = self._first_frame_time - self._stream_start_time
+            logger.info(
+                f"[{self._pc.name}] ★ H.264 첫 프레임 수신! 대기시간={elapsed:.2f}초"
+            )
+            self._screen.set_overlay_text('')
+            self._update_conn_state('streaming')
 
-            # 해상도 표시 갱신 (30프레임마다)
-            if self._total_frame_count <= 1 or self._total_frame_count % 30 == 0:
-                self._res_label.setText(f"{qimage.width()} x {qimage.height()}")
-        elif self._h264_decoder.waiting_for_keyframe:
-            # 키프레임 대기 중 — 에이전트에 요청
-            self._server.request_keyframe(self._pc.agent_id)
+        # 해상도 표시 갱신 (30프레임마다)
+        if self._total_frame_count <= 1 or self._total_frame_count % 30 == 0:
+            self._res_label.setText(f"{qimage.width()} x {qimage.height()}")
+
+    def _on_h264_keyframe_needed(self):
+        """키프레임 대기 중 — 에이전트에 요청 (워커에서 1초 쓰로틀)"""
+        self._server.request_keyframe(self._pc.agent_id)
+
+    def _close_h264_worker(self):
+        if self._h264_worker:
+            worker, self._h264_worker = self._h264_worker, None
+            try:
+                worker.frame_ready.disconnect(self._on_h264_image)
+                worker.keyframe_needed.disconnect(self._on_h264_keyframe_needed)
+            except TypeError:
+                pass
+            worker.close()
+            logger.info(
+                f"[{self._pc.name}] H.264 디코딩 워커 종료 — 디코딩 {worker.frames_decoded}, "
+                f"드롭 입력 {worker.dropped_input} / 출력 {worker.dropped_output}"
+            )
 
     # ==================== FPS 표시 ====================
 
@@ -730,6 +855,22 @@ class DesktopWidget(QMainWindow):
             f"color: {fps_color}; padding: 0 6px; font-size: 11px; font-weight: bold;"
         )
 
+        # 드롭 프레임: MJPEG 우편함 건너뜀 + H.264 워커 드롭 (입력/변환 생략)
+        if self._h264_worker:
+            h264_drops = self._h264_worker.dropped_input + self._h264_worker.dropped_output
+            self._fps_drop_count += h264_drops - self._h264_drops_seen
+            self._total_drop_count += h264_drops - self._h264_drops_seen
+            self._h264_drops_seen = h264_drops
+        drops, self._fps_drop_count = self._fps_drop_count, 0
+        self._drop_label.setText(f"드롭 {drops}")
+        self._drop_label.setStyleSheet(
+            f"color: {'#FFA726' if drops else self._sb_fg}; "
+            f"padding: 0 6px; font-size: 11px;"
+        )
+        self._drop_label.setToolTip(
+            f"화면 처리가 밀려 건너뛴 프레임 (초당) — 누적 {self._total_drop_count}"
+        )
+
         # 스트림 요청 후 5초 이상 프레임이 없으면 경고
         if (self._conn_state == 'waiting' and self._total_frame_count == 0
                 and time.time() - self._stream_start_time > 5):
@@ -885,9 +1026,9 @@ class DesktopWidget(QMainWindow):
             self._server.start_audio_stream(self._pc.agent_id)
             self._show_overlay_notification("오디오 ON")
 
-    def _on_audio_received(self, agent_id: str, pcm_data: bytes):
+    def _on_audio_received(self, pcm_data: bytes):
         """오디오 PCM 데이터 수신 → 재생"""
-        if agent_id != self._pc.agent_id or not self._audio_enabled:
+        if not self._audio_enabled:
             return
         if self._audio_stream:
             try:
@@ -1221,14 +1362,13 @@ class DesktopWidget(QMainWindow):
             self._audio_stream = None
 
         # H.264 디코더 정리 (v2.0.2)
-        if self._h264_decoder:
-            self._h264_decoder.close()
-            self._h264_decoder = None
+        self._close_h264_worker()
 
         # 시그널 해제
         for sig, slot in [
-            (self._server.screen_frame_received, self._on_frame_received),
-            (self._server.h264_frame_received, self._on_h264_frame),
+            (self._frames.screen_ready, self._on_screen_ready),
+            (self._frames.h264_frame_received, self._on_h264_frame),
+            (self._frames.audio_received, self._on_audio_received),
             (self._server.stream_started, self._on_stream_started),
             (self._server.agent_disconnected, self._on_agent_disconnected),
             (self._server.connection_mode_changed, self._on_connection_mode_changed),
@@ -1241,7 +1381,7 @@ class DesktopWidget(QMainWindow):
 
         logger.info(
             f"[{self._pc.name}] 뷰어 닫힘 — 총 프레임: {self._total_frame_count}, "
-            f"마지막 FPS: {self._current_fps}"
+            f"마지막 FPS: {self._current_fps}, 드롭: {self._total_drop_count}"
         )
 
         self.closed.emit(self._pc.name)
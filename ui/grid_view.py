@@ -15,12 +15,13 @@ from PyQt6.QtWidgets import (
     QCheckBox, QSpinBox, QComboBox,
 )
 from PyQt6.QtCore import Qt, QTimer, QByteArray, pyqtSignal, QSize
-from PyQt6.QtGui import QPixmap, QColor, QPalette, QMouseEvent, QFont, QPainter
+from PyQt6.QtGui import QPixmap, QImage, QColor, QPalette, QMouseEvent, QFont, QPainter
 
 from config import settings
 from core.pc_manager import PCManager
 from core.agent_server import AgentServer
 from core.pc_device import PCStatus
+from core.thumbnail_decoder import ThumbnailDecoder
 
 try:
     from version import __version__ as MANAGER_VERSION
@@ -79,9 +80,11 @@ class PCThumbnailWidget(QFrame):
     update_requested = pyqtSignal(str)
 
     def __init__(self, pc_name: str, memo: str = '', parent=None, *,
-                 show_name=True, show_memo=True, font_size=9):
+                 show_name=True, show_memo=True, font_size=9, decoder=None):
         super().__init__(parent)
         self.pc_name = pc_name
+        self._decoder: ThumbnailDecoder = decoder   # None이면 GUI 스레드에서 직접 디코딩
+        self._jpeg: bytes = None                    # 마지막 썸네일 원본
         self._is_online = False
         self._is_selected = False
         self._status = PCStatus.OFFLINE
@@ -258,15 +261,35 @@ class PCThumbnailWidget(QFrame):
     # ── 썸네일 갱신 ──
 
     def update_thumbnail(self, jpeg_data: bytes):
-        pixmap = QPixmap()
-        pixmap.loadFromData(QByteArray(jpeg_data))
-        if not pixmap.isNull():
-            scaled = pixmap.scaled(
-                self.image_label.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-            self.image_label.setPixmap(scaled)
+        self._jpeg = jpeg_data
+        self._show_thumbnail()
+
+    def set_thumbnail_image(self, image: QImage):
+        """디코더가 셀 크기로 스케일한 이미지 표시 (GUI 스레드)"""
+        self.image_label.setPixmap(QPixmap.fromImage(image))
+
+    def _show_thumbnail(self):
+        """현재 이미지 영역 크기로 표시 — 캐시 적중 시 즉시, 아니면 디코더에 요청"""
+        if self._jpeg is None:
+            return
+        size = self.image_label.size()
+        if self._decoder is None:
+            pixmap = QPixmap()
+            pixmap.loadFromData(QByteArray(self._jpeg))
+            if not pixmap.isNull():
+                self.image_label.setPixmap(pixmap.scaled(
+                    size,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                ))
+            return
+        if not self.isVisible():
+            return      # 배치 전 크기로 디코딩하지 않음 — showEvent/resizeEvent에서 처리
+        image = self._decoder.cached(self.pc_name, self._jpeg, size)
+        if image is not None:
+            self.set_thumbnail_image(image)
+        else:
+            self._decoder.request(self.pc_name, self._jpeg, size)
 
     # ── 상태 ──
 
@@ -525,15 +548,13 @@ class PCThumbnailWidget(QFrame):
             self.right_clicked.emit(self.pc_name, event.globalPosition().toPoint())
             event.accept()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._show_thumbnail()
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        pm = self.image_label.pixmap()
-        if pm and not pm.isNull():
-            self.image_label.setPixmap(pm.scaled(
-                self.image_label.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            ))
+        self._show_thumbnail()
 
 
 class PlaceholderSlotWidget(QFrame):
@@ -567,6 +588,9 @@ class GridView(QWidget):
         self.agent_server = agent_server
         self._group_filter = group_filter  # None=전체, "그룹명"=해당 그룹만
         self._thumbnails: Dict[str, PCThumbnailWidget] = {}
+        self._thumbnail_subs: list = []     # [(AgentFrameSignals, PCThumbnailWidget)]
+        self._thumb_decoder = ThumbnailDecoder(self)
+        self._thumb_decoder.decoded.connect(self._on_thumbnail_decoded)
         self._placeholders: list = []
         self._selected_pcs: set = set()
         self._push_agents: set = set()
@@ -721,7 +745,6 @@ class GridView(QWidget):
         self.pc_manager.signals.device_added.connect(lambda _: self.rebuild_grid())
         self.pc_manager.signals.device_removed.connect(lambda _: self.rebuild_grid())
         self.pc_manager.signals.device_status_changed.connect(self._on_status_changed)
-        self.agent_server.thumbnail_received.connect(self._on_thumbnail_received)
         self.agent_server.agent_connected.connect(self._on_agent_connected)
         self.agent_server.agent_disconnected.connect(self._on_agent_disconnected)
         self.agent_server.connection_mode_changed.connect(self._on_connection_mode_changed)
@@ -762,7 +785,24 @@ class GridView(QWidget):
 
         return image_height + info_height + 9  # margins + spacing
 
+    def shutdown(self):
+        """탭 제거/종료 전 정리 (deleteLater 전에 호출) — 갱신 중지, 구독 해제, 디코더 풀 종료"""
+        self._refresh_timer.stop()
+        self._disconnect_thumbnails()
+        self._thumb_decoder.close()
+
+    def _disconnect_thumbnails(self):
+        for frames, thumb in self._thumbnail_subs:
+            try:
+                frames.thumbnail_received.disconnect(thumb.update_thumbnail)
+            except TypeError:
+                pass
+        self._thumbnail_subs.clear()
+
     def rebuild_grid(self):
+        # 셀별 썸네일 구독 해제 (그리드에 있는 에이전트만 구독 — 다른 그룹/필터 제외분 미수신)
+        self._disconnect_thumbnails()
+
         for widget in self._thumbnails.values():
             self._grid.removeWidget(widget)
             widget.deleteLater()
@@ -805,6 +845,7 @@ class GridView(QWidget):
                 show_name=opts['show_name'],
                 show_memo=opts['show_memo'],
                 font_size=opts['font_size'],
+                decoder=self._thumb_decoder,
             )
             thumb.setFixedHeight(cell_height)
             thumb.set_status(pc.status)
@@ -826,6 +867,10 @@ class GridView(QWidget):
 
             if pc.last_thumbnail:
                 thumb.update_thumbnail(pc.last_thumbnail)
+            if pc.agent_id:
+                frames = self.agent_server.agent_frames(pc.agent_id)
+                frames.thumbnail_received.connect(thumb.update_thumbnail)
+                self._thumbnail_subs.append((frames, thumb))
 
             self._grid.addWidget(thumb, row, col)
             self._thumbnails[pc.name] = thumb
@@ -846,6 +891,8 @@ class GridView(QWidget):
             self._grid.addWidget(ph, row, col)
             self._placeholders.append(ph)
 
+        self._thumb_decoder.retain(self._thumbnails)
+
         # ── 좌측 상단 정렬: 열 균등 분배 + 하단 여백 stretch ──
         for c in range(columns):
             self._grid.setColumnStretch(c, 1)
@@ -855,6 +902,11 @@ class GridView(QWidget):
             self._grid.setRowStretch(r, 0)
         self._grid.setRowStretch(last_row + 1, 1)
 
+    def _on_thumbnail_decoded(self, pc_name: str, image: QImage):
+        thumb = self._thumbnails.get(pc_name)
+        if thumb:
+            thumb.set_thumbnail_image(image)
+
     # ==================== 설정 변경 핸들러 ====================
 
     def _on_columns_changed(self, value: int):
@@ -887,13 +939,6 @@ class GridView(QWidget):
                 agent_version = '0.0.0'
             thumb.update_version(agent_version, MANAGER_VERSION)
 
-    def _on_thumbnail_received(self, agent_id: str, jpeg_data: bytes):
-        pc = self.pc_manager.get_pc_by_agent_id(agent_id)
-        if pc:
-            thumb = self._thumbnails.get(pc.name)
-            if thumb:
-                thumb.update_thumbnail(jpeg_data)
-
     def _on_agent_connected(self, agent_id: str, agent_ip: str):
         """에이전트 연결 시 push 모드 시작 + 버전 갱신"""
         push_interval = settings.get('screen.thumbnail_interval', 1000) / 1000.0
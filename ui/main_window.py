@@ -363,6 +363,8 @@ class MainWindow(QMainWindow):
         while self.tab_widget.count() > 2:
             w = self.tab_widget.widget(2)
             self.tab_widget.removeTab(2)
+            if isinstance(w, GridView):
+                w.shutdown()
             w.deleteLater()
         self._group_tabs.clear()
 
@@ -987,5 +989,9 @@ class MainWindow(QMainWindow):
         for dw in list(self._desktop_widgets.values()):
             dw.close()
 
+        self.grid_view.shutdown()
+        for gv in self._group_tabs.values():
+            gv.shutdown()
+
         self._tray_icon.hide()
         event.accept()